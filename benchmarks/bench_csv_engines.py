@@ -0,0 +1,64 @@
+# benchmarks/bench_csv_engines.py
+# CSV解析引擎基准：比较 pandas 与 pyarrow 解析同一文件的耗时
+# 用法: python -m benchmarks.bench_csv_engines [文件大小MB，默认1024] [已有CSV文件路径]
+
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from src.core.data_io import csv_loader
+from src.core.data_io.sniffer import sniff_csv
+
+def make_file(path, size_mb):
+    """生成混合类型的CSV文件：字符串、浮点、整数、日期各一列"""
+    rng = np.random.default_rng(0)
+    target = size_mb * 1024 * 1024
+    block_rows = 500_000
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        header = True
+        while f.tell() < target:
+            block = pd.DataFrame({
+                "名称": rng.choice(np.array(["alpha", "beta", "gamma", "delta"]), block_rows),
+                "数值": rng.random(block_rows),
+                "计数": rng.integers(0, 1_000_000, block_rows),
+                "日期": pd.to_datetime(rng.integers(0, 10 * 365 * 24 * 3600, block_rows), unit="s").strftime("%Y-%m-%d"),
+            })
+            block.to_csv(f, index=False, header=header)
+            header = False
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+def main():
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 1024
+    path = sys.argv[2] if len(sys.argv) > 2 else None
+    cleanup = path is None
+    if path is None:
+        path = os.path.join(tempfile.gettempdir(), f"vplotter_bench_{size_mb}mb.csv")
+        print(f"生成测试文件 {path} ...")
+        make_file(path, size_mb)
+    
+    try:
+        fmt = sniff_csv(path)
+        print(f"文件大小: {os.path.getsize(path) / 1024 / 1024:.0f} MB, CPU核数: {os.cpu_count()}")
+        if not csv_loader.pyarrow_available():
+            print("未安装pyarrow，仅测试pandas")
+        print(f"{'引擎':>8} {'耗时(s)':>10} {'行数':>12} {'加速比':>7}")
+        baseline = None
+        for engine in ("pandas", "pyarrow"):
+            if engine == "pyarrow" and not csv_loader.pyarrow_available():
+                continue
+            elapsed, df = timed(lambda: csv_loader.read_csv(path, fmt, engine))
+            baseline = baseline or elapsed
+            print(f"{engine:>8} {elapsed:>10.2f} {len(df):>12} {baseline / elapsed:>7.2f}")
+            del df
+    finally:
+        if cleanup:
+            os.remove(path)
+
+if __name__ == "__main__":
+    main()
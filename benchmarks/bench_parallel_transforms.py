@@ -0,0 +1,53 @@
+# benchmarks/bench_parallel_transforms.py
+# 多进程列变换的扩展性基准：比较串行与不同工作进程数下的耗时
+# 用法: python -m benchmarks.bench_parallel_transforms [行数]
+
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+import numpy as np
+import pandas as pd
+from src.utils.parallel import to_fixed_width_strings, parallel_to_datetime, parallel_regex_replace
+
+def make_data(rows):
+    """生成日期字符串列和日志文本列"""
+    rng = np.random.default_rng(0)
+    seconds = rng.integers(0, 10 * 365 * 24 * 3600, rows)
+    dates = pd.Series(pd.to_datetime(seconds, unit='s').strftime('%Y-%m-%d %H:%M:%S'), dtype=object)
+    words = np.array(['sensor', 'error', 'ok', 'timeout', 'Sensor', 'value'], dtype=object)
+    texts = pd.Series(words[rng.integers(0, len(words), rows)] + '_' + rng.integers(0, 1000, rows).astype(str), dtype=object)
+    return dates, texts
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    dates, texts = make_data(rows)
+    date_values = to_fixed_width_strings(dates)
+    text_values = to_fixed_width_strings(texts)
+    regex = re.compile('sensor', re.IGNORECASE)
+
+    print(f"行数: {rows}")
+    serial_dt = timed(lambda: pd.to_datetime(dates, errors='coerce'))
+    serial_re = timed(lambda: texts.str.replace(regex, 'probe', regex=True))
+    print(f"{'进程数':>6} {'to_datetime(s)':>15} {'加速比':>7} {'正则替换(s)':>12} {'加速比':>7}")
+    print(f"{'串行':>6} {serial_dt:>15.2f} {1.0:>7.2f} {serial_re:>12.2f} {1.0:>7.2f}")
+
+    workers = 1
+    while workers <= (os.cpu_count() or 1):
+        with ProcessPoolExecutor(workers, mp_context=get_context('spawn')) as executor:
+            # 预热：启动工作进程并导入pandas
+            list(executor.map(abs, range(workers)))
+            dt = timed(lambda: parallel_to_datetime(date_values, executor=executor))
+            rr = timed(lambda: parallel_regex_replace(text_values, 'sensor', 'probe', re.IGNORECASE, executor=executor))
+        print(f"{workers:>6} {dt:>15.2f} {serial_dt / dt:>7.2f} {rr:>12.2f} {serial_re / rr:>7.2f}")
+        workers *= 2
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,360 @@
+# src/core/autosave.py
+# 自动保存：定时将有修改的数据表写入 ~/.vplotter/autosave/<uuid>/。
+# 每个数据表的保存记录由若干"代"组成，每代是一个基准加上按顺序应用的增量：
+# 基准为完整快照，或数据表未经结构变化时的来源文件（无需写入）；
+# 增量只包含上次保存之后变化的列，少量单元格的修改只保存这些单元格。
+# 增量累计过大、行列结构变化或来源文件被修改时开始新的一代，保留最近 backup_count 代作为备份。
+
+import json
+import os
+import pickle
+import shutil
+import time
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Callable
+import numpy as np
+import pandas as pd
+from PyQt6.QtCore import QObject, QTimer
+from src.core.data_container import DataContainer, concat_frames
+from src.core.column_store import owner_alive
+from src.core.data_io import csv_loader, excel_loader, json_loader, columnar_io, compression, csv_schema, sniffer, sqlite_io
+from src.core.data_io.table_writer import atomic_output
+from src.core.job_runner import get_job_manager
+
+META_NAME = "meta.json"
+
+# 一代中的最大增量数，超出后写入新的完整快照
+MAX_DELTAS = 50
+
+# 增量累计超过基准大小的该比例时写入新的完整快照
+DELTA_RATIO = 0.5
+
+# 正常退出后保留的自动保存记录的天数
+RETENTION_DAYS = 7
+
+def autosave_root() -> Path:
+    return Path.home() / ".vplotter" / "autosave"
+
+# ---------------- 写入 ----------------
+
+def _write_meta(directory: Path, meta: Dict[str, Any]):
+    meta["updated"] = time.time()
+    with atomic_output(str(directory / META_NAME)) as temp_path:
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False, default=str)
+
+def _write_pickle(path: Path, payload) -> int:
+    with atomic_output(str(path)) as temp_path:
+        with open(temp_path, "wb") as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return os.path.getsize(path)
+
+def origin_unchanged(origin: Optional[Dict[str, Any]]) -> bool:
+    """来源文件自读取后未被修改"""
+    if not origin:
+        return False
+    try:
+        stat = os.stat(origin["path"])
+    except OSError:
+        return False
+    return stat.st_size == origin["size"] and stat.st_mtime == origin["mtime"]
+
+def write_base(directory: Path, snapshot: DataContainer) -> Dict[str, Any]:
+    """写入完整快照作为新一代的基准"""
+    name = f"{snapshot.version:08d}.base.pkl"
+    size = _write_pickle(directory / name, snapshot.dataframe)
+    return {"base": {"file": name}, "base_bytes": size, "deltas": [], "delta_bytes": 0}
+
+def write_delta(directory: Path, snapshot: DataContainer, changes: Dict[str, Optional[np.ndarray]]) -> Dict[str, Any]:
+    """写入增量：整列变化保存整列，部分单元格变化只保存这些单元格"""
+    df = snapshot.dataframe
+    columns = {}
+    for name, rows in changes.items():
+        if name not in df.columns:
+            continue
+        values = df[name]
+        if rows is None or len(rows) * 2 > len(values):
+            columns[name] = {"rows": None, "values": values.to_numpy()}
+        else:
+            columns[name] = {"rows": np.asarray(rows, dtype=np.int64), "values": values.iloc[rows].to_numpy()}
+    name = f"{snapshot.version:08d}.delta.pkl"
+    size = _write_pickle(directory / name, {"version": snapshot.version, "columns": columns})
+    return {"file": name, "bytes": size}
+
+def _remove_generation(directory: Path, generation: Dict[str, Any]):
+    files = [delta["file"] for delta in generation["deltas"]]
+    if "file" in generation["base"]:
+        files.append(generation["base"]["file"])
+    for name in files:
+        try:
+            os.remove(directory / name)
+        except OSError:
+            pass
+
+def save(snapshot: DataContainer, changes: Optional[Dict[str, Optional[np.ndarray]]],
+         meta: Optional[Dict[str, Any]], keep: int) -> Dict[str, Any]:
+    """
+    保存一个数据表（可在后台线程中运行），返回更新后的记录
+
+    changes 为上次保存后的修改（None 表示需要完整快照），meta 为上次保存的记录，keep 为保留的代数
+    """
+    directory = autosave_root() / snapshot.uuid
+    directory.mkdir(parents=True, exist_ok=True)
+    if meta is None:
+        meta = {"generations": []}
+    generations = meta["generations"]
+    current = generations[-1] if generations else None
+
+    usable = current is not None and changes is not None and (
+        "origin" not in current["base"] or origin_unchanged(current["base"]["origin"])
+    )
+    if usable and len(current["deltas"]) < MAX_DELTAS and \
+            current["delta_bytes"] <= current["base_bytes"] * DELTA_RATIO:
+        delta = write_delta(directory, snapshot, changes)
+        current["deltas"].append(delta)
+        current["delta_bytes"] += delta["bytes"]
+    else:
+        generations.append(write_base(directory, snapshot))
+        # 删除超出保留数量的旧代
+        while len(generations) > max(keep, 1):
+            _remove_generation(directory, generations.pop(0))
+
+    meta.update({
+        "uuid": snapshot.uuid,
+        "name": snapshot.name,
+        "source": snapshot.source,
+        "data_type": snapshot.data_type,
+        "data_unit": snapshot.data_unit,
+        "metadata": snapshot.metadata,
+        "version": snapshot.version,
+        "pid": os.getpid(),
+        "clean": False
+    })
+    _write_meta(directory, meta)
+    return meta
+
+def origin_generation(origin: Dict[str, Any]) -> Dict[str, Any]:
+    """以来源文件为基准的一代（基准无需写入）"""
+    return {"base": {"origin": origin}, "base_bytes": origin["size"], "deltas": [], "delta_bytes": 0}
+
+# ---------------- 恢复 ----------------
+
+def read_origin(origin: Dict[str, Any]) -> pd.DataFrame:
+    """按读取选项重新读取来源文件"""
+    if not origin_unchanged(origin):
+        raise ValueError(f"来源文件已被修改或删除: {origin['path']}")
+    path = origin["path"]
+    extension = compression.data_extension(path)
+    if extension == ".csv":
+        return read_csv_origin(path, origin)
+    if extension in (".xlsx", ".xls"):
+        return excel_loader.read_excel(path, origin.get("sheet"))
+    if extension in (".json", ".ndjson", ".jsonl"):
+        return json_loader.read_json(path)
+    if columnar_io.file_format(path):
+        return columnar_io.read_columnar(path, origin.get("columns"))
+    if extension in sqlite_io.SQLITE_EXTENSIONS and origin.get("query"):
+        return sqlite_io.read_query(path, origin["query"])
+    raise ValueError(f"不支持的来源文件类型: {path}")
+
+def read_csv_origin(path: str, origin: Dict[str, Any]) -> pd.DataFrame:
+    """
+    按读取时实际使用的解析方式（引擎、编码、导入结构、流式分块）重新读取CSV，
+    得到与读取时相同的列类型，增量才能应用在相同的基准上
+    """
+    fmt = sniffer.sniff_csv(path)
+    if origin.get("schema") is not None:
+        # 按单次指定（未保存）的导入结构读取的文件
+        fmt.schema = csv_schema.CsvSchema.from_dict(origin["schema"])
+    options = origin.get("csv")
+    if options is None:
+        return csv_loader.read_csv(path, fmt)
+    fmt.encoding = options["encoding"]
+    fmt.schema = csv_schema.CsvSchema.from_dict(options["schema"]) if options.get("schema") else None
+    engine = options.get("engine")
+    if engine == "parallel":
+        return csv_loader.read_csv_parallel(path, fmt)
+    if engine == "chunks":
+        # 与流式导入一致：各块分别推断类型后按顺序拼接
+        chunks = [chunk for chunk, _, _ in csv_loader.iter_csv_chunks(path, options["chunk_rows"], fmt)]
+        return concat_frames(chunks) if chunks else pd.DataFrame()
+    return csv_loader.read_csv(path, fmt, engine or "auto")
+
+def apply_delta(df: pd.DataFrame, delta: Dict[str, Any]):
+    for name, change in delta["columns"].items():
+        values = change["values"]
+        if change["rows"] is None:
+            df[name] = values
+            continue
+        column = df[name].to_numpy(copy=True)
+        if column.dtype != values.dtype:
+            column = column.astype(object)
+        column[change["rows"]] = values
+        df[name] = column
+
+def restore(directory: Path) -> DataContainer:
+    """从自动保存记录恢复数据表：从最新一代开始尝试，基准不可用时退回更早的一代"""
+    with open(directory / META_NAME, "r", encoding="utf-8") as f:
+        meta = json.load(f)
+    errors = []
+    for generation in reversed(meta["generations"]):
+        try:
+            base = generation["base"]
+            if "origin" in base:
+                df = read_origin(base["origin"])
+            else:
+                df = pd.read_pickle(directory / base["file"])
+            for delta in generation["deltas"]:
+                with open(directory / delta["file"], "rb") as f:
+                    apply_delta(df, pickle.load(f))
+        except Exception as e:
+            errors.append(str(e))
+            continue
+        container = DataContainer(meta.get("data_type", "data"), data_unit=meta.get("data_unit", ""))
+        container.name = f"{meta.get('name', '数据组')} (已恢复)"
+        container.source = meta.get("source", "新建")
+        container.metadata = meta.get("metadata", {})
+        container.set_dataframe(df)
+        return container
+    raise ValueError("; ".join(errors) or "没有可恢复的数据")
+
+def list_recoverable() -> List[Dict[str, Any]]:
+    """上次未正常退出时留下的自动保存记录（记录所属的进程已结束且未标记为正常结束）"""
+    root = autosave_root()
+    if not root.exists():
+        return []
+    entries = []
+    for directory in root.iterdir():
+        try:
+            with open(directory / META_NAME, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            continue
+        pid = meta.get("pid")
+        if meta.get("clean") or not pid or pid == os.getpid() or owner_alive(pid):
+            continue
+        meta["directory"] = str(directory)
+        entries.append(meta)
+    return sorted(entries, key=lambda meta: meta.get("updated", 0), reverse=True)
+
+def mark_clean(directory: Path):
+    """标记记录为正常结束（保留为备份，过期后删除）"""
+    try:
+        with open(directory / META_NAME, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        meta["clean"] = True
+        _write_meta(directory, meta)
+    except (OSError, ValueError):
+        pass
+
+def cleanup_expired():
+    """删除正常结束超过保留天数的记录和不完整的目录"""
+    root = autosave_root()
+    if not root.exists():
+        return
+    now = time.time()
+    for directory in root.iterdir():
+        try:
+            with open(directory / META_NAME, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            meta = None
+        if meta is None or (meta.get("clean") and now - meta.get("updated", 0) > RETENTION_DAYS * 86400):
+            shutil.rmtree(directory, ignore_errors=True)
+
+# ---------------- 定时保存 ----------------
+
+class AutosaveManager(QObject):
+    """
+    按设置的间隔自动保存有修改的数据表
+
+    containers_provider 返回当前打开的数据容器；超出内存的数据表和尚未读取的数据表不保存
+    """
+    def __init__(self, containers_provider: Callable[[], List[DataContainer]], parent=None):
+        super().__init__(parent)
+        self.containers_provider = containers_provider
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.autosave)
+        self.keep = 3
+        self.saving = False
+        # uuid -> {"container", "saved_version", "meta"}
+        self.states: Dict[str, Dict[str, Any]] = {}
+
+    def apply_settings(self, preferences: Dict[str, Any]):
+        """应用 user_preferences 中的自动保存设置"""
+        self.keep = preferences.get("backup_count", 3) if preferences.get("backup_enabled", True) else 1
+        if preferences.get("auto_save", False):
+            self.timer.start(max(1, int(preferences.get("auto_save_interval", 5))) * 60 * 1000)
+        else:
+            self.timer.stop()
+
+    def track(self, container: DataContainer):
+        """开始跟踪数据表：以当前状态为已保存状态"""
+        if container.uuid not in self.states:
+            self.states[container.uuid] = {"container": container, "saved_version": container.version, "meta": None}
+
+    def _use_origin(self, state: Dict[str, Any]):
+        """尚未保存过的数据表在读取来源文件后以来源文件为基准（如流式导入结束后）"""
+        origin = state["container"].origin
+        if state["meta"] is None and origin_unchanged(origin) and origin["version"] >= state["saved_version"]:
+            state["saved_version"] = origin["version"]
+            state["meta"] = {"generations": [origin_generation(origin)]}
+
+    def autosave(self):
+        """保存一个有修改的数据表；上一次保存未结束时跳过"""
+        if self.saving:
+            return
+        containers = self.containers_provider()
+        open_uuids = {container.uuid for container in containers}
+        # 已关闭的数据表的记录标记为正常结束
+        for uuid in [uuid for uuid in self.states if uuid not in open_uuids]:
+            state = self.states.pop(uuid)
+            if state["meta"] and state["meta"].get("version") is not None:
+                mark_clean(autosave_root() / uuid)
+        for container in containers:
+            self.track(container)
+        self.save_next()
+
+    def save_next(self):
+        """依次在后台保存有修改的数据表"""
+        for uuid, state in self.states.items():
+            container = state["container"]
+            self._use_origin(state)
+            if container.version == state["saved_version"] or not container.is_loaded() or container.is_out_of_core():
+                continue
+            changes = container.changes_since(state["saved_version"])
+            snapshot = container.snapshot()
+            if snapshot.dataframe is None:
+                continue
+            self.saving = True
+
+            def on_finished(meta, state=state, version=snapshot.version):
+                self.saving = False
+                state["meta"] = meta
+                state["saved_version"] = version
+                state["container"].trim_changes(version)
+                self.save_next()
+
+            def on_stopped(*_):
+                self.saving = False
+
+            get_job_manager().submit(
+                f"自动保存 {container.name}",
+                self.write_snapshot, snapshot, changes, state["meta"], self.keep,
+                on_finished=on_finished,
+                on_failed=on_stopped,
+                on_cancelled=on_stopped
+            )
+            return
+
+    def write_snapshot(self, job, snapshot, changes, meta, keep):
+        """在后台线程中写入自动保存记录"""
+        job.report_progress(-1, "正在自动保存...")
+        return save(snapshot, changes, json.loads(json.dumps(meta, default=str)) if meta else None, keep)
+
+    def finish_session(self):
+        """程序正常退出：停止定时器并标记全部记录为正常结束"""
+        self.timer.stop()
+        for uuid, state in self.states.items():
+            if state["meta"] and state["meta"].get("version") is not None:
+                mark_clean(autosave_root() / uuid)
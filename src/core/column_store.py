@@ -0,0 +1,325 @@
+# src/core/column_store.py
+# 超出内存的数据表的列存储：每列保存为缓存目录中的 .npy 文件，读取时以内存映射方式打开，
+# 只有实际访问的页面才会被操作系统读入内存。
+# 整数列按 int64 存储，浮点列按 float64 存储；其余列按字符串存储为 偏移量(.npy) + UTF-8字节(.npy) + 缺失值掩码(.npy)。
+# 列的存储类型由第一块决定并记录在清单中，之后的块中整数列出现缺失值或小数时改写为浮点列，
+# 数值列出现无法转换为数值的内容时改写为字符串列。
+# 数据只追加写入，写入完成后只读。
+
+import json
+import os
+import shutil
+import struct
+import time
+import uuid
+from pathlib import Path
+from typing import Optional, List, Dict, Iterator
+import numpy as np
+import pandas as pd
+
+MANIFEST_NAME = "store.json"
+OWNER_NAME = "owner.pid"
+
+# 无法确认创建进程状态时，超过该天数的存储视为遗留缓存
+STALE_DAYS = 7
+
+# 分块处理时每块的行数
+CHUNK_ROWS = 1_000_000
+
+# .npy 文件头的固定长度：写入时行数未知，先写入占位文件头，完成后原位改写
+NPY_HEADER_BYTES = 128
+
+# 列的存储类型
+INTEGER = "int64"
+NUMERIC = "float64"
+STRING = "str"
+NUMERIC_KINDS = (INTEGER, NUMERIC)
+
+def store_root() -> Path:
+    return Path.home() / ".vplotter" / "column_store"
+
+def _npy_header(dtype: np.dtype, length: int) -> bytes:
+    """生成固定长度的 .npy（1.0版）文件头"""
+    header = repr({"descr": np.lib.format.dtype_to_descr(np.dtype(dtype)), "fortran_order": False, "shape": (length,)})
+    body = header.ljust(NPY_HEADER_BYTES - 10 - 1) + "\n"
+    return b"\x93NUMPY\x01\x00" + struct.pack("<H", len(body)) + body.encode("latin1")
+
+class _NpyAppender:
+    """只追加写入的一维 .npy 文件"""
+    def __init__(self, path: Path, dtype):
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        self.length = 0
+        self.file = open(path, "wb")
+        self.file.write(_npy_header(self.dtype, 0))
+
+    def append(self, values: np.ndarray):
+        values = np.ascontiguousarray(values, dtype=self.dtype)
+        self.file.write(values.tobytes())
+        self.length += len(values)
+
+    def close(self):
+        self.file.seek(0)
+        self.file.write(_npy_header(self.dtype, self.length))
+        self.file.close()
+
+def encode_strings(values: np.ndarray):
+    """将一块字符串值编码为 (各值的UTF-8长度, 拼接后的字节, 缺失值掩码)"""
+    mask = pd.isna(values)
+    encoded = [b"" if missing else str(value).encode("utf-8") for value, missing in zip(values, mask)]
+    lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+    return lengths, b"".join(encoded), np.asarray(mask, dtype=bool)
+
+def numbers_to_strings(values: np.ndarray, integral: bool) -> np.ndarray:
+    """将数值列的值格式化为对象数组（整数列不带小数点），NaN 为 None"""
+    if values.dtype.kind in "iu":
+        return values.astype(str).astype(object)
+    result = np.full(len(values), None, dtype=object)
+    valid = ~np.isnan(values)
+    numbers = values[valid].astype(np.int64) if integral else values[valid]
+    result[valid] = numbers.astype(str)
+    return result
+
+class ColumnStoreWriter:
+    """
+    按块追加写入列存储，列由第一块决定；之后的块出现缺失值或小数时整数列改为浮点列，
+    出现文本时数值列改为字符串列
+    """
+    def __init__(self, directory: Optional[Path] = None):
+        self.directory = Path(directory) if directory else store_root() / uuid.uuid4().hex
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # 记录创建进程，供清理遗留缓存时判断
+        (self.directory / OWNER_NAME).write_text(str(os.getpid()))
+        self.columns: List[Dict] = []
+        self.files: List[Dict[str, _NpyAppender]] = []
+        self.string_offsets: List[int] = []
+        self.integral: List[bool] = []  # 浮点列目前为止是否都是整数（改写为字符串列时不带小数点）
+        self.rows = 0
+
+    def _init_columns(self, df: pd.DataFrame):
+        for i, name in enumerate(df.columns):
+            dtype = df.iloc[:, i].dtype
+            if dtype.kind == "i" or (dtype.kind == "u" and dtype.itemsize < 8):
+                kind = INTEGER
+            elif dtype.kind in "uf":
+                # 超出 int64 范围的 uint64 只能按浮点保存
+                kind = NUMERIC
+            else:
+                kind = STRING
+            self.columns.append({"name": str(name), "kind": kind})
+            self.files.append(self._open_strings(i) if kind == STRING else self._open_numeric(i, kind))
+            self.string_offsets.append(0)
+            self.integral.append(dtype.kind in "iu")
+
+    def _open_numeric(self, i: int, kind: str) -> Dict[str, _NpyAppender]:
+        return {"values": _NpyAppender(self.directory / f"{i}.npy", kind)}
+
+    def _open_strings(self, i: int) -> Dict[str, _NpyAppender]:
+        files = {
+            "offsets": _NpyAppender(self.directory / f"{i}.offsets.npy", np.int64),
+            "data": _NpyAppender(self.directory / f"{i}.data.npy", np.uint8),
+            "mask": _NpyAppender(self.directory / f"{i}.mask.npy", np.bool_),
+        }
+        files["offsets"].append(np.zeros(1, dtype=np.int64))
+        return files
+
+    def _append_strings(self, i: int, values: np.ndarray):
+        files = self.files[i]
+        lengths, data, mask = encode_strings(values)
+        files["offsets"].append(self.string_offsets[i] + np.cumsum(lengths))
+        files["data"].append(np.frombuffer(data, dtype=np.uint8))
+        files["mask"].append(mask)
+        self.string_offsets[i] += len(data)
+
+    def _rewrite(self, i: int, kind: str, convert):
+        """将已写入的数值列按块转换后改写为 kind 类型的列"""
+        appender = self.files[i]["values"]
+        appender.close()
+        temp_path = appender.path.with_suffix(".old")
+        os.replace(appender.path, temp_path)
+        self.files[i] = self._open_strings(i) if kind == STRING else self._open_numeric(i, kind)
+        self.columns[i]["kind"] = kind
+        if appender.length:
+            written = np.load(temp_path, mmap_mode="r")
+            for start in range(0, appender.length, CHUNK_ROWS):
+                values = convert(np.asarray(written[start:start + CHUNK_ROWS]))
+                if kind == STRING:
+                    self._append_strings(i, values)
+                else:
+                    self.files[i]["values"].append(values)
+            del written
+        temp_path.unlink()
+
+    def _promote_to_float(self, i: int):
+        """整数列出现缺失值或小数时改写为浮点列（每列至多一次）"""
+        self._rewrite(i, NUMERIC, lambda values: values.astype(np.float64))
+
+    def _promote_to_string(self, i: int):
+        """将已写入的数值列按块改写为字符串列（每列至多一次），整数按原值格式化"""
+        self._rewrite(i, STRING, lambda values: numbers_to_strings(values, self.integral[i]))
+
+    def _append_numbers(self, i: int, numbers: pd.Series):
+        """追加一块已转换为数值的值，整数列遇到缺失值、小数或超出 int64 范围的值时先改为浮点列"""
+        kind = numbers.dtype.kind
+        exact = kind in "iu" and not numbers.isna().any() and \
+            (kind == "i" or numbers.empty or numbers.max() <= np.iinfo(np.int64).max)
+        if exact:
+            integers = numbers.to_numpy(dtype=np.int64)
+        else:
+            values = numbers.to_numpy(dtype=np.float64, na_value=np.nan)
+        if self.columns[i]["kind"] == INTEGER:
+            if not exact and not np.isnan(values).any() and (values == np.floor(values)).all() \
+                    and (not len(values) or np.abs(values).max() < 2.0 ** 63):
+                # 浮点形式的整数（如 "3.0"）仍按整数保存
+                integers, exact = values.astype(np.int64), True
+            if exact:
+                self.files[i]["values"].append(integers)
+                return
+            self._promote_to_float(i)
+        self.integral[i] = self.integral[i] and kind in "iu"
+        self.files[i]["values"].append(integers.astype(np.float64) if exact else values)
+
+    def append(self, df: pd.DataFrame):
+        """追加一块数据，列按位置对应；数值列出现无法转换为数值的内容时改为字符串列，不丢失内容"""
+        if not self.columns:
+            self._init_columns(df)
+        if df.shape[1] != len(self.columns):
+            raise ValueError(f"列数不一致：应为 {len(self.columns)} 列，实际为 {df.shape[1]} 列")
+        for i, column in enumerate(self.columns):
+            values = df.iloc[:, i]
+            if column["kind"] in NUMERIC_KINDS:
+                numbers = pd.to_numeric(values, errors="coerce")
+                if values.dtype.kind in "iuf" or not (numbers.isna() & values.notna()).any():
+                    self._append_numbers(i, numbers)
+                    continue
+                self._promote_to_string(i)
+            self._append_strings(i, values.to_numpy(dtype=object))
+        self.rows += len(df)
+
+    def finish(self) -> "ColumnStore":
+        """写入清单并关闭文件，返回只读的列存储"""
+        for files in self.files:
+            for appender in files.values():
+                appender.close()
+        manifest = {"rows": self.rows, "columns": self.columns}
+        with open(self.directory / MANIFEST_NAME, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False)
+        return ColumnStore(self.directory)
+
+    def abort(self):
+        """放弃写入并删除已写入的文件"""
+        for files in self.files:
+            for appender in files.values():
+                appender.file.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+class ColumnStore:
+    """只读的内存映射列存储"""
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        with open(self.directory / MANIFEST_NAME, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        self.rows: int = manifest["rows"]
+        self.columns: List[Dict] = manifest["columns"]
+        self.headers: List[str] = [column["name"] for column in self.columns]
+        self._maps: Dict[str, np.ndarray] = {}
+
+    def _map(self, name: str) -> np.ndarray:
+        array = self._maps.get(name)
+        if array is None:
+            array = np.load(self.directory / name, mmap_mode="r")
+            self._maps[name] = array
+        return array
+
+    def kind(self, column: int) -> str:
+        return self.columns[column]["kind"]
+
+    def values(self, column: int) -> np.ndarray:
+        """数值列（int64 或 float64）的内存映射数组（只读）"""
+        if self.kind(column) not in NUMERIC_KINDS:
+            raise ValueError(f"列 {self.headers[column]} 不是数值列")
+        return self._map(f"{column}.npy")
+
+    def read_column(self, column: int, start: int, stop: int, step: int = 1) -> np.ndarray:
+        """读取一列的 [start, stop) 行，字符串列解码为对象数组"""
+        if start >= min(stop, self.rows):
+            return np.empty(0, dtype=object if self.kind(column) == STRING else self.kind(column))
+        if self.kind(column) in NUMERIC_KINDS:
+            return np.array(self.values(column)[start:stop:step])
+        offsets = self._map(f"{column}.offsets.npy")
+        data = self._map(f"{column}.data.npy")
+        mask = self._map(f"{column}.mask.npy")
+        rows = range(start, min(stop, self.rows), step)
+        result = np.empty(len(rows), dtype=object)
+        if step == 1 and len(rows):
+            # 连续的行一次读出字节块后切分
+            base = int(offsets[start])
+            block = data[base:int(offsets[rows[-1] + 1])].tobytes()
+            bounds = np.asarray(offsets[start:rows[-1] + 2]) - base
+            for i in range(len(rows)):
+                result[i] = block[bounds[i]:bounds[i + 1]].decode("utf-8")
+        else:
+            for i, row in enumerate(rows):
+                result[i] = data[int(offsets[row]):int(offsets[row + 1])].tobytes().decode("utf-8")
+        result[np.asarray(mask[start:stop:step], dtype=bool)] = None
+        return result
+
+    def read(self, start: int, stop: int, columns: Optional[List[int]] = None, step: int = 1) -> pd.DataFrame:
+        """读取 [start, stop) 行（按 step 间隔），返回DataFrame"""
+        stop = min(stop, self.rows)
+        columns = range(len(self.columns)) if columns is None else columns
+        return pd.DataFrame(
+            {self.headers[i]: self.read_column(i, start, stop, step) for i in columns},
+            columns=[self.headers[i] for i in columns]
+        )
+
+    def iter_chunks(self, chunk_rows: int = CHUNK_ROWS, columns: Optional[List[int]] = None) -> Iterator[pd.DataFrame]:
+        """按块读取全部行"""
+        for start in range(0, self.rows, chunk_rows):
+            yield self.read(start, start + chunk_rows, columns)
+
+    def sample(self, max_rows: int, columns: Optional[List[int]] = None) -> pd.DataFrame:
+        """等间隔抽样至多 max_rows 行（如用于绘图）"""
+        step = max(1, -(-self.rows // max_rows))
+        return self.read(0, self.rows, columns, step)
+
+    def close(self):
+        """释放内存映射"""
+        self._maps.clear()
+
+    def remove(self):
+        """删除存储目录"""
+        self.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+def owner_alive(pid: int) -> bool:
+    """进程是否仍在运行（仅在POSIX系统上可以确认，其他系统视为运行中）"""
+    if os.name != "posix":
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+    return True
+
+def cleanup_stale_stores():
+    """删除创建进程已退出的列存储（如程序异常退出后遗留的缓存）"""
+    root = store_root()
+    if not root.exists():
+        return
+    now = time.time()
+    for directory in root.iterdir():
+        try:
+            pid = int((directory / OWNER_NAME).read_text())
+        except (OSError, ValueError):
+            pid = None
+        if pid == os.getpid():
+            continue
+        try:
+            stale = now - directory.stat().st_mtime > STALE_DAYS * 86400
+        except OSError:
+            continue
+        if pid is None or stale or not owner_alive(pid):
+            shutil.rmtree(directory, ignore_errors=True)
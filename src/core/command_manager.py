@@ -1,7 +1,11 @@
 # src/core/core_manager.py
 
+import zlib
+import numpy as np
+import pandas as pd
 from PyQt6.QtCore import QObject, pyqtSignal
 from PyQt6.QtCore import Qt
+from src.core.signals import edit_signals
 
 class Command:
     """命令基类"""
@@ -11,15 +15,22 @@ class Command:
         raise NotImplementedError()
     
 class CommandManager(QObject):
-    """命令管理器"""
+    """命令管理器，每个表格标签页拥有各自的实例"""
     command_executed = pyqtSignal()  # 命令执行信号
     command_undone = pyqtSignal()    # 命令撤销信号
     command_redone = pyqtSignal()    # 命令重做信号
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, parent=None):
+        super().__init__(parent)
         self.undo_stack = []        # 撤销栈
         self.redo_stack = []        # 重做栈
+        # 撤销历史变化时通知编辑菜单刷新
+        self.command_executed.connect(self._notify_history_changed)
+        self.command_undone.connect(self._notify_history_changed)
+        self.command_redone.connect(self._notify_history_changed)
+
+    def _notify_history_changed(self):
+        edit_signals.history_changed.emit(self)
 
     def execute(self, command):
         """执行命令"""
@@ -28,6 +39,12 @@ class CommandManager(QObject):
         self.redo_stack.clear()
         self.command_executed.emit()
 
+    def clear(self):
+        """清空撤销/重做历史，释放命令持有的数据"""
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+        self._notify_history_changed()
+
     def undo(self):
         """撤销命令"""
         if not self.undo_stack:
@@ -142,3 +159,71 @@ class RemoveColumnCommand(Command):
         for row in range(self.model.rowCount()):
             index = self.model.index(row, self.col)
             self.model.setData(index, self.old_data[row], Qt.ItemDataRole.EditRole)
+
+
+class ColumnSnapshot:
+    """撤销记录中保存的单列数据，较大的数值列以zlib压缩保存"""
+    COMPRESS_MIN_BYTES = 1 << 20  # 小于1MB的列不压缩
+    COMPRESS_MAX_RATIO = 0.7      # 压缩率不理想时保留原列
+
+    def __init__(self, series: pd.Series, compress: bool = True):
+        self.name = series.name
+        self.index = series.index  # 索引对象不可变，直接共享引用
+        self.dtype = series.dtype
+        self.series = series
+        self.compressed = None
+        
+        # 只压缩普通numpy数值/布尔/日期类型
+        if compress and isinstance(self.dtype, np.dtype) and self.dtype.kind in 'biufcmM':
+            values = np.ascontiguousarray(series.to_numpy())
+            if values.nbytes >= self.COMPRESS_MIN_BYTES:
+                compressed = zlib.compress(memoryview(values).cast('B'), 1)
+                if len(compressed) < values.nbytes * self.COMPRESS_MAX_RATIO:
+                    self.compressed = compressed
+                    self.series = None
+
+    def restore(self) -> pd.Series:
+        """还原为Series"""
+        if self.compressed is None:
+            return self.series
+        values = np.frombuffer(zlib.decompress(self.compressed), dtype=self.dtype).copy()
+        return pd.Series(values, index=self.index, name=self.name)
+
+
+class ReplaceColumnsCommand(Command):
+    """批量替换数据容器中若干列的命令，只保存受影响的列"""
+    def __init__(self, container, new_columns):
+        super().__init__()
+        self.container = container
+        # 执行前保存待写入的新列，执行后保存被替换下来的旧列，撤销/重做时互相交换
+        # 新列马上就要写入，不必压缩
+        self.columns = {name: ColumnSnapshot(series, compress=False) for name, series in new_columns.items()}
+
+    def _swap(self):
+        columns = {name: snapshot.restore() for name, snapshot in self.columns.items()}
+        replaced = self.container.replace_columns(columns)
+        self.columns = {name: ColumnSnapshot(series) for name, series in replaced.items()}
+
+    def execute(self):
+        self._swap()
+
+    def undo(self):
+        self._swap()
+
+
+class ReorderRowsCommand(Command):
+    """重排行顺序的命令（如排序），只保存行的排列"""
+    def __init__(self, container, order):
+        super().__init__()
+        self.container = container
+        # 用能容纳行数的最小整数类型保存排列
+        dtype = np.int32 if len(order) < np.iinfo(np.int32).max else np.int64
+        self.order = np.asarray(order, dtype=dtype)
+
+    def execute(self):
+        self.container.apply_row_order(self.order)
+
+    def undo(self):
+        inverse = np.empty_like(self.order)
+        inverse[self.order] = np.arange(len(self.order), dtype=self.order.dtype)
+        self.container.apply_row_order(inverse)
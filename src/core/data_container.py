@@ -1,11 +1,90 @@
 # src/core/data_container.py
 
+import os
 import numpy as np
 import pandas as pd
+import re
+import threading
 import uuid
+import warnings
 from PyQt6.QtWidgets import QMessageBox
 from src.core.signals import container_signals, data_signals
-from typing import Optional, List, Dict, Any, Union
+from src.core.command_manager import ReplaceColumnsCommand, ReorderRowsCommand
+from src.core.column_store import ColumnStore, ColumnStoreWriter, INTEGER, NUMERIC, CHUNK_ROWS
+from src.utils.parallel import (
+    should_parallelize, to_fixed_width_strings,
+    parallel_to_datetime, parallel_isin, parallel_regex_replace
+)
+from typing import Optional, List, Dict, Any, Union, Tuple, Callable, Iterator
+
+# 批量操作时的特殊列选择项
+ALL_COLUMNS = "全部"
+ALL_NUMERIC_COLUMNS = "全部数值列"
+
+# 超出内存的数据表只读，修改类操作给出的提示
+OUT_OF_CORE_READ_ONLY = "超出内存的数据表为只读，请先过滤出较小的子集再修改"
+
+# 过滤结果不超过该行数时读入内存（可编辑），否则仍使用列存储
+FILTER_IN_MEMORY_MAX_ROWS = 1_000_000
+
+# 绘图时最多使用的行数，超出内存的数据表按等间隔抽样
+PLOT_MAX_ROWS = 1_000_000
+
+# 统计唯一值时最多收集的数量
+UNIQUE_VALUES_LIMIT = 100_000
+
+# 修改记录的最大条数，超出后按整体变化处理（下次自动保存写入完整快照）
+CHANGE_LOG_LIMIT = 1000
+
+# 中文类型名到实际类型的映射
+TYPE_MAP = {
+    '整数': 'int',
+    '浮点数': 'float',
+    '字符串': 'str',
+    '布尔值': 'bool',
+    '日期时间': 'datetime'
+}
+
+# 中文标准化方法名到实际方法的映射
+NORMALIZE_METHOD_MAP = {
+    '最小-最大缩放': 'min_max',
+    'Z-score标准化': 'z_score',
+    '小数定标标准化': 'decimal_scaling',
+    '对数变换': 'log'
+}
+
+def changed_rows(old: pd.Series, new: pd.Series) -> Optional[np.ndarray]:
+    """两列中值不同的行位置（均为缺失值视为相同）；长度不同或无法逐个比较时返回 None"""
+    if len(old) != len(new):
+        return None
+    old_values = old.to_numpy()
+    new_values = new.to_numpy()
+    try:
+        different = np.asarray(old_values != new_values, dtype=bool)
+    except (TypeError, ValueError):
+        return None
+    if different.shape != (len(old),):
+        return None
+    different &= ~(pd.isna(old_values) & pd.isna(new_values))
+    return np.flatnonzero(different)
+
+def concat_frames(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """按顺序拼接数据块，列按名称对齐；各块的分类列类别不同时先统一类别，避免退化为对象列"""
+    frames = [frame for frame in frames if frame is not None]
+    if len(frames) == 1:
+        return frames[0]
+    for name in frames[0].columns:
+        parts = [frame[name] for frame in frames if name in frame.columns]
+        if not all(isinstance(part.dtype, pd.CategoricalDtype) for part in parts):
+            continue
+        categories = parts[0].cat.categories
+        for part in parts[1:]:
+            if not part.cat.categories.equals(categories):
+                categories = categories.union(part.cat.categories, sort=False)
+        for frame in frames:
+            if name in frame.columns and not frame[name].cat.categories.equals(categories):
+                frame[name] = frame[name].cat.set_categories(categories)
+    return pd.concat(frames, ignore_index=True, copy=False)
 
 class DataContainer:
     def __init__(self, data_type="data", data_value=None, data_unit=""):
@@ -18,16 +97,200 @@ class DataContainer:
         self.metadata = {}  # 添加元数据存储
 
         # 使用DataFrame作为主要数据存储
+        # 流式导入追加的数据块先按块保存，读取 dataframe 时才一次性合并，避免每次追加都复制整表
+        self._pending_chunks: List[pd.DataFrame] = []
+        self._pending_lock = threading.Lock()
         self.dataframe: Optional[pd.DataFrame] = None
         self.row_count = 0
         self.column_count = 0
+        
+        # 延迟加载：数据尚未读取时为返回DataFrame的可调用对象（如项目文件中的数据块），读取后置为 None
+        self.lazy_loader: Optional[Callable[[], pd.DataFrame]] = None
+        
+        # 超出内存的数据表：数据保存在内存映射的列存储中，此时 dataframe 为 None
+        self.store: Optional[ColumnStore] = None
+        
+        # 版本号：每次修改数据加一；修改记录为 (版本, 列名, 变化的行位置或 None 表示整列)，
+        # 行列结构整体变化（如排序、追加行、增删列）时清空记录并记下版本
+        self.version = 0
+        self._structure_version = 0
+        self._trimmed_version = 0
+        self._change_log: List[Tuple[int, str, Optional[np.ndarray]]] = []
+        
+        # 数据的来源文件（路径、大小、修改时间、读取选项及读取后的版本），可据此重新读取读取时的数据
+        self.origin: Optional[Dict[str, Any]] = None
     
+    @property
+    def dataframe(self) -> Optional[pd.DataFrame]:
+        if self._pending_chunks:
+            self._merge_pending()
+        return self._dataframe
+    
+    @dataframe.setter
+    def dataframe(self, dataframe: Optional[pd.DataFrame]):
+        with self._pending_lock:
+            self._pending_chunks = []
+            self._dataframe = dataframe
+    
+    def _merge_pending(self):
+        """将追加的数据块合并到数据表中（一次拼接）"""
+        with self._pending_lock:
+            if self._pending_chunks:
+                self._dataframe = concat_frames([self._dataframe] + self._pending_chunks)
+                self._pending_chunks = []
+    
+    def is_loaded(self) -> bool:
+        """数据是否已读取（没有待读取的延迟数据）"""
+        return self.lazy_loader is None
+    
+    def mark_changed(self, columns: Optional[List[str]] = None, rows: Optional[Dict[str, Optional[np.ndarray]]] = None):
+        """记录一次修改：columns 为 None 表示行列结构整体变化；rows 为各列变化的行位置（缺省为整列）"""
+        self.version += 1
+        if columns is None or len(self._change_log) + len(columns) > CHANGE_LOG_LIMIT:
+            self._structure_version = self.version
+            self._change_log.clear()
+            return
+        for name in columns:
+            self._change_log.append((self.version, name, rows.get(name) if rows else None))
+    
+    def changes_since(self, version: int) -> Optional[Dict[str, Optional[np.ndarray]]]:
+        """
+        version 之后修改过的列 {列名: 变化的行位置（None 表示整列）}
+        
+        期间行列结构整体变化过或修改记录已被清理时返回 None
+        """
+        if version < max(self._structure_version, self._trimmed_version):
+            return None
+        changes: Dict[str, Optional[np.ndarray]] = {}
+        for entry_version, name, rows in self._change_log:
+            if entry_version <= version:
+                continue
+            if name not in changes:
+                changes[name] = rows
+            elif changes[name] is not None and rows is not None:
+                changes[name] = np.union1d(changes[name], rows)
+            else:
+                changes[name] = None
+        return changes
+    
+    def trim_changes(self, version: int):
+        """丢弃 version 及之前的修改记录（使用方已处理）"""
+        self._change_log = [entry for entry in self._change_log if entry[0] > version]
+        self._trimmed_version = max(self._trimmed_version, version)
+    
+    def set_origin(self, file_path: str, **options):
+        """
+        记录当前数据由文件读取，options 为读取选项（如工作表、列）
+
+        解析前已记录文件大小和修改时间时由 options 中的 size、mtime 给出，否则取当前的值
+        """
+        stat = os.stat(file_path)
+        self.origin = {
+            "path": os.path.abspath(file_path),
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+            "version": self.version,
+            **options
+        }
+    
+    def origin_options(self) -> Dict[str, Any]:
+        """来源文件的读取选项（不含路径、大小等文件信息），没有来源文件时为空"""
+        if self.origin is None:
+            return {}
+        return {key: value for key, value in self.origin.items() if key not in ("path", "size", "mtime", "version")}
+    
+    def is_out_of_core(self) -> bool:
+        """数据是否保存在列存储中（只读，按需分页读取）"""
+        return self.store is not None
+    
+    def set_dataframe(self, dataframe: pd.DataFrame):
+        """直接接管已解析好的DataFrame（不复制），用于文件加载"""
+        dataframe.columns = dataframe.columns.astype(str)
+        self.dataframe = dataframe
+        self.lazy_loader = None
+        self.store = None
+        self.update_stats()
+        self.mark_changed()
+    
+    def attach_store(self, store: ColumnStore):
+        """使用列存储作为数据（超出内存的数据表）"""
+        self.dataframe = None
+        self.lazy_loader = None
+        self.store = store
+        self.update_stats()
+        self.mark_changed()
+    
+    def release_store(self):
+        """删除列存储的缓存文件（数据表关闭时调用）"""
+        if self.store is not None:
+            self.store.remove()
+            self.store = None
+            self.update_stats()
+    
+    def get_rows(self, start: int, stop: int) -> pd.DataFrame:
+        """读取 [start, stop) 行，列存储只读取对应的页面；只涉及尚未合并的追加块时不合并整表"""
+        if self.store is not None:
+            return self.store.read(start, stop)
+        chunks = self._pending_chunks
+        if chunks and self._dataframe is not None and start >= len(self._dataframe):
+            parts = []
+            offset = len(self._dataframe)
+            for chunk in chunks:
+                if offset >= stop:
+                    break
+                if offset + len(chunk) > start:
+                    parts.append(chunk.iloc[max(start - offset, 0):stop - offset])
+                offset += len(chunk)
+            if parts:
+                return pd.concat(parts, ignore_index=True, copy=False)
+        if self.dataframe is None:
+            return pd.DataFrame()
+        return self.dataframe.iloc[start:stop]
+    
+    def iter_chunks(self, chunk_rows: int = CHUNK_ROWS, columns: Optional[List[int]] = None) -> Iterator[pd.DataFrame]:
+        """按块遍历全部行，columns 为要读取的列位置（None 表示全部）"""
+        if self.store is not None:
+            yield from self.store.iter_chunks(chunk_rows, columns)
+            return
+        if self.dataframe is None:
+            return
+        frame = self.dataframe if columns is None else self.dataframe.iloc[:, columns]
+        for start in range(0, len(frame), chunk_rows):
+            yield frame.iloc[start:start + chunk_rows]
+    
+    def get_plot_dataframe(self, max_rows: int = PLOT_MAX_ROWS) -> Optional[pd.DataFrame]:
+        """获取绘图用的数据，列存储按等间隔抽样至多 max_rows 行"""
+        if self.store is not None:
+            return self.store.sample(max_rows)
+        return self.dataframe
+
+    def append_rows(self, dataframe: pd.DataFrame):
+        """在末尾追加行（用于流式导入），列按名称对齐"""
+        if dataframe is None or dataframe.empty:
+            return
+        dataframe.columns = dataframe.columns.astype(str)
+        if self._dataframe is None:
+            self.set_dataframe(dataframe)
+            container_signals.container_updated.emit(self)
+            return
+        start = self.row_count
+        # 只保存数据块，读取 dataframe 时再合并，追加的总复制量与数据大小成正比
+        with self._pending_lock:
+            self._pending_chunks.append(dataframe)
+        self.row_count += len(dataframe)
+        self.mark_changed()
+        container_signals.rows_appended.emit(self, start, len(dataframe))
+
     def set_table_data(self, data, headers=None):
         """设置表格数据，支持多种输入格式"""
         if data is None:
             self._clear_data()
             return
-            
+        
+        # 数据被显式设置后不再读取延迟数据
+        self.lazy_loader = None
+        self.store = None
+        old_dataframe = self.dataframe
         try:
             # 处理不同的输入类型
             if isinstance(data, pd.DataFrame):
@@ -58,101 +321,137 @@ class DataContainer:
             
             # 更新统计信息
             self.update_stats()
+            self._mark_replaced(old_dataframe)
             
         except Exception as e:
             self._clear_data()
             raise ValueError(f"无法将数据转换为DataFrame: {e}")
     
-    def sort_data(self, column: str, ascending: bool = True) -> bool:
-        """对数据进行排序"""
-        if self.dataframe is None:
-            return False
-        
+    def set_cell(self, row: int, column: int, value):
+        """修改单个单元格（按位置），只记录该单元格的变化；值与列类型不兼容时先转换列类型"""
+        if self.store is not None:
+            raise ValueError(OUT_OF_CORE_READ_ONLY)
+        name = self.dataframe.columns[column]
+        # 在列的副本上修改后整列赋值：快照和撤销记录可能共享原列的数据，不能原位修改
+        series = self.dataframe.iloc[:, column].copy()
         try:
-            # 排序
-            self.dataframe = self.dataframe.sort_values(by=column, ascending=ascending)
-            self.update_stats()
-            return True
-        except Exception as e:
-            QMessageBox.warning(f"排序失败: {e}")
-            return False
+            with warnings.catch_warnings():
+                # pandas 对不兼容的值会隐式转换列类型并给出 FutureWarning，此时改为显式转换
+                warnings.simplefilter("error", FutureWarning)
+                series.iat[row] = value
+        except (TypeError, ValueError, FutureWarning):
+            numeric = isinstance(series.dtype, np.dtype) and series.dtype.kind in "iub"
+            series = series.astype(np.float64 if numeric and isinstance(value, float) else object)
+            series.iat[row] = value
+        self.dataframe.isetitem(column, series)
+        if self.dataframe.columns.is_unique:
+            self.mark_changed([name], {name: np.array([row])})
+        else:
+            self.mark_changed()
+    
+    def snapshot(self) -> "DataContainer":
+        """创建共享底层数据的快照，供后台任务只读访问"""
+        snap = DataContainer(self.data_type, self.data_value, self.data_unit)
+        snap.uuid = self.uuid
+        snap.source = self.source
+        snap.name = self.name
+        snap.metadata = dict(self.metadata)
+        snap.lazy_loader = self.lazy_loader
+        snap.store = self.store
+        snap.origin = self.origin
+        # 浅拷贝：不复制列数据，之后对原容器整列赋值不会影响快照
+        snap.dataframe = self.dataframe.copy(deep=False) if self.dataframe is not None else None
+        snap.update_stats()
+        snap.version = self.version
+        if not snap.is_loaded():
+            snap.row_count, snap.column_count = self.row_count, self.column_count
+        return snap
 
-    def clean_data(self, column: str, sensitive: bool = False, target: str = '0') -> bool:
-        """清洗异常值"""
+    def prepare_sort_order(self, column: str, ascending: bool = True) -> np.ndarray:
+        """计算排序后的行顺序（位置下标），不修改容器"""
+        if self.store is not None:
+            raise ValueError(OUT_OF_CORE_READ_ONLY)
         if self.dataframe is None:
-            QMessageBox.warning(None, "错误", "数据为空，无法清洗")
-            return False
-        
+            raise ValueError("数据为空，无法排序")
         if column not in self.dataframe.columns:
-            QMessageBox.warning(None, "错误", f"列 '{column}' 不存在")
+            raise ValueError(f"列 '{column}' 不存在")
+        # 稳定排序，缺失值放在最后，与 sort_values 的默认行为一致
+        return self.dataframe[column].reset_index(drop=True).sort_values(
+            ascending=ascending, kind='stable'
+        ).index.to_numpy()
+
+    def _mark_replaced(self, old_dataframe: Optional[pd.DataFrame]):
+        """整表被替换后记录修改：行列结构不变时只记录值发生变化的单元格"""
+        new_dataframe = self.dataframe
+        if (old_dataframe is None or new_dataframe is None
+                or len(old_dataframe) != len(new_dataframe)
+                or list(old_dataframe.columns) != list(new_dataframe.columns)
+                or not new_dataframe.columns.is_unique):
+            self.mark_changed()
+            return
+        rows = {}
+        for i, name in enumerate(new_dataframe.columns):
+            changed = changed_rows(old_dataframe.iloc[:, i], new_dataframe.iloc[:, i])
+            if changed is None or len(changed):
+                rows[name] = changed
+        self.mark_changed(list(rows), rows)
+    
+    def apply_row_order(self, order: np.ndarray):
+        """按位置下标重排所有行"""
+        if self.dataframe is None:
+            return
+        # 重排后重置索引，保持索引与行位置一致（按位置写回列、撤销时依赖这一点）
+        self.dataframe = self.dataframe.take(order).reset_index(drop=True)
+        self.update_stats()
+        self.mark_changed()
+        container_signals.container_updated.emit(self)
+
+    def _record(self, command, command_manager=None):
+        """执行命令；提供命令管理器时记入撤销历史"""
+        if command_manager is not None:
+            command_manager.execute(command)
+        else:
+            command.execute()
+
+    def sort_data(self, column: str, ascending: bool = True, command_manager=None) -> bool:
+        """对数据进行排序"""
+        if self.dataframe is None:
             return False
         
         try:
-            # 保存原始数据类型
-            origin_dtype = self.dataframe[column].dtype
-            
-            # 处理数值列和字符串列的不同情况
-            if pd.api.types.is_numeric_dtype(origin_dtype):
-                # 数值列处理
-                try:
-                    target_value = float(target)
-                except ValueError:
-                    QMessageBox.warning(None, "错误", f"对于数值列 '{column}'，替换值 '{target}' 不是有效的数字")
-                    return False
-                    
-                if sensitive:
-                    # 严格清洗：替换NaN和无限值
-                    self.dataframe[column] = self.dataframe[column].replace(
-                        [np.nan, np.inf, -np.inf], target_value
-                    )
-                else:
-                    # 宽松清洗：只替换NaN
-                    self.dataframe[column] = self.dataframe[column].fillna(target_value)
-            else:
-                # 字符串列处理
-                # 先将列转换为字符串
-                self.dataframe[column] = self.dataframe[column].astype(str)
-                
-                # 定义要替换的值列表
-                if sensitive:
-                    to_replace = ['', 'nan', 'None', 'null', 'NaN', 'NA', 'N/A']
-                else:
-                    to_replace = ['', 'None', 'null']
-                
-                # 执行替换
-                self.dataframe[column] = self.dataframe[column].replace(to_replace, target)
-                
-                # 尝试转换回原始数据类型（如果是其他非字符串类型）
-                try:
-                    self.dataframe[column] = self.dataframe[column].astype(origin_dtype)
-                except (ValueError, TypeError):
-                    # 如果转换失败，保持为字符串类型
-                    pass
-            
-            self.update_stats()
-            
-            # 发出数据修改信号
-            data_signals.data_modified.emit(
-                self.dataframe.to_numpy().copy(), 
-                self.get_table_headers().copy()
-            )
-            
-            return True
+            order = self.prepare_sort_order(column, ascending)
         except Exception as e:
-            QMessageBox.warning(None, "错误", f"清洗失败: {e}")
+            QMessageBox.warning(None, "错误", f"排序失败: {e}")
             return False
+        self._record(ReorderRowsCommand(self, order), command_manager)
+        return True
 
+    def clean_data(self, column: str, sensitive: bool = False, target: str = '0', command_manager=None) -> bool:
+        """清洗异常值"""
+        changes, errors = self.prepare_clean_columns(column, sensitive, target)
+        return self._apply_changes(changes, errors, "清洗失败", command_manager)
 
+    def _apply_changes(self, changes, errors, failure_title, command_manager=None) -> bool:
+        """写回 prepare_* 计算出的列变化，出错时提示"""
+        if errors:
+            QMessageBox.warning(None, "错误", f"{failure_title}: " + "; ".join(errors.values()))
+        if changes:
+            self._record(ReplaceColumnsCommand(self, changes), command_manager)
+        return not errors
 
     def _clear_data(self):
         """清除数据"""
         self.dataframe = None
         self.row_count = 0
         self.column_count = 0
+        self.mark_changed()
     
     def update_stats(self):
         """更新数据统计信息"""
-        if self.dataframe is not None:
+        if self.store is not None:
+            self.row_count = self.store.rows
+            self.column_count = len(self.store.headers)
+        elif self.dataframe is not None:
             self.row_count = len(self.dataframe)
             self.column_count = len(self.dataframe.columns)
         else:
@@ -171,12 +470,20 @@ class DataContainer:
     
     def get_table_headers(self) -> List[str]:
         """获取表格的列名"""
-        if self.dataframe is None:
+        if self.store is not None:
+            return list(self.store.headers)
+        # 追加的数据块与数据表的列相同，不必合并
+        if self._dataframe is None:
             return []
-        return list(self.dataframe.columns)
+        return list(self._dataframe.columns)
     
     def get_column_type(self, column_name: str) -> Optional[str]:
         """获取指定列的数据类型"""
+        if self.store is not None:
+            if str(column_name) not in self.store.headers:
+                return None
+            kind = self.store.kind(self.store.headers.index(str(column_name)))
+            return {INTEGER: "int", NUMERIC: "float"}.get(kind, "str")
         if self.dataframe is None:
             return None
         
@@ -205,39 +512,58 @@ class DataContainer:
             return str(dtype)
     
     def apply_filter(self, filter_condition: Dict[str, Any]) -> bool:
-        """应用过滤条件"""
+        """应用过滤条件，结果以新的数据容器打开"""
         if self.dataframe is None:
             return False
         
         try:
-            # 创建过滤掩码
-            mask = self.create_filter_mask(filter_condition)
+            filtered_container = self.prepare_filter(filter_condition)
             
-            # 应用过滤
-            filtered_data = self.dataframe[mask]
-            
-            # 创建一个新的DataContainer来存储过滤后的数据
-            filtered_container = DataContainer()
-            filtered_container.set_table_data(filtered_data)
-            filtered_container.name = f"{self.name} (已过滤)"
-            
-            # 发出信号通知过滤完成
-            container_signals.filter_applied.emit(self.uuid, filtered_container.uuid)
+            # 通知主窗口打开过滤后的数据
+            container_signals.container_ready.emit(filtered_container)
             
             return True
         except Exception as e:
-            QMessageBox.warning(f"过滤应用失败: {e}")
+            QMessageBox.warning(None, "错误", f"过滤应用失败: {e}")
             return False
     
-    def create_filter_mask(self, filter_condition: Dict[str, Any]) -> pd.Series:
-        """根据过滤条件创建布尔掩码"""
+    def prepare_filter(self, filter_condition: Dict[str, Any]) -> "DataContainer":
+        """计算过滤结果并放入新的数据容器，不修改当前容器"""
+        # 创建一个新的DataContainer来存储过滤后的数据
+        filtered_container = DataContainer(self.data_type, data_unit=self.data_unit)
+        filtered_container.name = f"{self.name} (已过滤)"
+        
+        if self.store is not None:
+            # 列存储逐块过滤，结果写入新的列存储；结果较小时读入内存
+            writer = ColumnStoreWriter()
+            try:
+                for chunk in self.store.iter_chunks():
+                    writer.append(chunk[self.create_filter_mask(filter_condition, chunk).to_numpy()])
+                store = writer.finish()
+            except BaseException:
+                writer.abort()
+                raise
+            if store.rows <= FILTER_IN_MEMORY_MAX_ROWS:
+                filtered_container.set_table_data(store.read(0, store.rows))
+                store.remove()
+            else:
+                filtered_container.attach_store(store)
+            return filtered_container
+        
+        # 创建过滤掩码
+        mask = self.create_filter_mask(filter_condition)
+        filtered_container.set_table_data(self.dataframe[mask])
+        return filtered_container
+    
+    def create_filter_mask(self, filter_condition: Dict[str, Any], frame: Optional[pd.DataFrame] = None) -> pd.Series:
+        """根据过滤条件创建布尔掩码，frame 为要过滤的数据（默认为整个数据表）"""
         column = filter_condition["column"]
         operator = filter_condition["operator"]
         value = filter_condition["value"]
         case_sensitive = filter_condition.get("case_sensitive", False)
         
         # 获取列数据
-        column_data = self.dataframe[column]
+        column_data = (self.dataframe if frame is None else frame)[column]
         
         # 对于数值比较，确保值的类型正确
         if operator in ["大于", "小于", "大于等于", "小于等于"]:
@@ -318,22 +644,35 @@ class DataContainer:
         
         self.dataframe[name] = data
         self.update_stats()
+        self.mark_changed()
     
     def remove_column(self, name: str):
         """移除列"""
         if self.dataframe is not None and name in self.dataframe.columns:
             self.dataframe.drop(columns=[name], inplace=True)
             self.update_stats()
+            self.mark_changed()
     
     def get_unique_values(self, column_name: str) -> List[Any]:
         """获取指定列的唯一值"""
-        if self.dataframe is None or column_name not in self.dataframe.columns:
+        if column_name not in self.get_table_headers():
             return []
+        if self.store is not None:
+            # 逐块收集，数量超过上限时停止
+            column = self.store.headers.index(column_name)
+            values = {}
+            for chunk in self.store.iter_chunks(columns=[column]):
+                values.update(dict.fromkeys(chunk.iloc[:, 0].dropna().unique().tolist()))
+                if len(values) >= UNIQUE_VALUES_LIMIT:
+                    break
+            return list(values)[:UNIQUE_VALUES_LIMIT]
         
         return self.dataframe[column_name].dropna().unique().tolist()
     
     def get_column_stats(self, column_name: str) -> Dict[str, Any]:
         """获取列的统计信息"""
+        if self.store is not None:
+            return self._get_store_column_stats(column_name)
         if self.dataframe is None or column_name not in self.dataframe.columns:
             return {}
         
@@ -358,26 +697,65 @@ class DataContainer:
         
         return stats
     
-    def to_dict(self) -> Dict[str, Any]:
-        """将数据转换为字典格式（用于序列化）"""
-        if self.dataframe is None:
-            return {
-                "data": None,
-                "headers": []
-            }
-        
-        return {
-            "data": self.dataframe.to_dict('list'),
-            "headers": list(self.dataframe.columns),
+    def _get_store_column_stats(self, column_name: str) -> Dict[str, Any]:
+        """逐块计算列存储中一列的统计信息（唯一值数量不做统计）"""
+        if column_name not in self.store.headers:
+            return {}
+        column = self.store.headers.index(column_name)
+        dtype = self.get_column_type(column_name)
+        count = 0
+        total = 0.0
+        squares = 0.0
+        minimum = maximum = None
+        for chunk in self.store.iter_chunks(columns=[column]):
+            column_data = chunk.iloc[:, 0]
+            count += int(column_data.count())
+            if dtype in ("int", "float") and column_data.count():
+                # 整数列按浮点累加，避免平方和溢出
+                values = column_data.to_numpy(dtype=np.float64)
+                total += float(np.nansum(values))
+                squares += float(np.nansum(values * values))
+                low, high = column_data.min(), column_data.max()
+                minimum = low if minimum is None else min(minimum, low)
+                maximum = high if maximum is None else max(maximum, high)
+        
+        stats = {
+            "dtype": dtype,
+            "count": count,
+            "null_count": self.store.rows - count,
+            "unique_count": None
+        }
+        if dtype in ("int", "float"):
+            mean = total / count if count else np.nan
+            # 样本标准差（与 pandas 一致，自由度为 n-1）
+            variance = (squares - count * mean * mean) / (count - 1) if count > 1 else np.nan
+            stats.update({
+                "min": minimum,
+                "max": maximum,
+                "mean": mean,
+                "std": float(np.sqrt(max(variance, 0.0))) if count > 1 else np.nan
+            })
+        return stats
+    
+    def to_dict(self, include_data: bool = True) -> Dict[str, Any]:
+        """将容器转换为字典格式（用于序列化）；include_data 为 False 时只包含描述信息（如项目清单）"""
+        result = {
+            "uuid": self.uuid,
+            "headers": self.get_table_headers(),
             "metadata": self.metadata,
             "name": self.name,
             "source": self.source,
             "data_type": self.data_type,
-            "data_unit": self.data_unit
+            "data_unit": self.data_unit,
+            "rows": self.row_count,
+            "columns": self.column_count
         }
+        if include_data:
+            result["data"] = self.dataframe.to_dict('list') if self.dataframe is not None else None
+        return result
     
     def from_dict(self, data_dict: Dict[str, Any]):
-        """从字典加载数据"""
+        """从字典加载数据（不含 data 时只恢复描述信息）"""
         if data_dict.get("data") is None:
             self.dataframe = None
         else:
@@ -386,6 +764,7 @@ class DataContainer:
                 self.dataframe.columns = data_dict["headers"]
         
         # 加载元数据
+        self.uuid = data_dict.get("uuid", self.uuid)
         self.metadata = data_dict.get("metadata", {})
         self.name = data_dict.get("name", "数据组")
         self.source = data_dict.get("source", "新建")
@@ -393,136 +772,354 @@ class DataContainer:
         self.data_unit = data_dict.get("data_unit", "")
         
         self.update_stats()
+        self.mark_changed()
     
     def __repr__(self):
         return f"DataContainer(name={self.name}, shape=({self.row_count}, {self.column_count}), source={self.source})"
 
-    def convert_data(self, options):
+    def convert_data(self, options, command_manager=None):
         """转换数据"""
-        choosed_option = options.get('choosed_option')
-        
-        if choosed_option == "数据类型转换":
-            return self.convert_data_type(options)
-        elif choosed_option == "数据标准化":
-            return self.normalize_data(options)
-        else:
-            QMessageBox.warning(None, "错误", f"不支持的转换类型: {choosed_option}")
-            return False
+        changes, errors = self.prepare_convert_data(options)
+        return self._apply_changes(changes, errors, "转换失败", command_manager)
 
-    def convert_data_type(self, options):
+    def convert_data_type(self, options, command_manager=None):
         """转换数据类型"""
-        try:
-            column_name = options['column']
-            target_type = options['target_type']
-            format_str = options.get('format', None)
-            
-            # 映射中文类型到实际类型
-            type_map = {
-                '整数': 'int',
-                '浮点数': 'float', 
-                '字符串': 'str',
-                '布尔值': 'bool',
-                '日期时间': 'datetime'
-            }
-            
-            if target_type not in type_map:
-                QMessageBox.warning(None, "错误", f"不支持的目标类型: {target_type}")
-                return False
-                
-            actual_type = type_map[target_type]
-            
-            if actual_type == 'int':
-                self.dataframe[column_name] = pd.to_numeric(self.dataframe[column_name], errors='coerce').astype('Int64')
-            elif actual_type == 'float':
-                self.dataframe[column_name] = pd.to_numeric(self.dataframe[column_name], errors='coerce')
-            elif actual_type == 'str':
-                self.dataframe[column_name] = self.dataframe[column_name].astype(str)
-            elif actual_type == 'bool':
-                # 布尔值转换逻辑
-                self.dataframe[column_name] = self.dataframe[column_name].astype(bool)
-            elif actual_type == 'datetime':
-                # 日期时间转换逻辑
-                if format_str:
-                    self.dataframe[column_name] = pd.to_datetime(self.dataframe[column_name], format=format_str, errors='coerce')
-                else:
-                    self.dataframe[column_name] = pd.to_datetime(self.dataframe[column_name], errors='coerce')
-            
-            self.update_stats()
-            data_signals.data_modified.emit(
-                self.dataframe.to_numpy().copy(), 
-                self.get_table_headers().copy()
-            )
-            return True
-            
-        except Exception as e:
-            QMessageBox.warning(None, "错误", f"数据类型转换失败: {e}")
-            return False
+        changes, errors = self.prepare_convert_columns(
+            options['column'], options['target_type'], options.get('format')
+        )
+        return self._apply_changes(changes, errors, "数据类型转换失败", command_manager)
 
-    def normalize_data(self, options):
+    def normalize_data(self, options, command_manager=None):
         """标准化数据"""
-        try:
-            column_name = options['column']
-            method = options['method']
-            min_val = options.get('min', 0)
-            max_val = options.get('max', 1)
+        changes, errors = self.prepare_normalize_columns(
+            options['column'], options['method'], options.get('min', 0), options.get('max', 1)
+        )
+        return self._apply_changes(changes, errors, "数据标准化失败", command_manager)
+
+    # ---------------- 批量列操作 ----------------
+    # prepare_* 方法只计算结果，不修改容器：返回 (新列字典, 错误报告)，
+    # 由 replace_columns 一次性写回，只发出一次更新通知。
+
+    def resolve_columns(self, columns) -> Tuple[List[str], Dict[str, str]]:
+        """将列选择解析为实际列名列表，支持"全部"和"全部数值列" """
+        if self.dataframe is None:
+            return [], {}
+        
+        if columns is None:
+            columns = [ALL_COLUMNS]
+        elif isinstance(columns, str):
+            columns = [columns]
+        
+        resolved = []
+        errors = {}
+        for column in columns:
+            if column == ALL_COLUMNS:
+                candidates = list(self.dataframe.columns)
+            elif column == ALL_NUMERIC_COLUMNS:
+                candidates = list(self.dataframe.select_dtypes(include='number').columns)
+            elif column in self.dataframe.columns:
+                candidates = [column]
+            else:
+                errors[column] = "列不存在"
+                continue
+            # 去重并保持顺序
+            resolved.extend(c for c in candidates if c not in resolved)
+        
+        return resolved, errors
+
+    def prepare_clean_columns(self, columns, sensitive: bool = False, target: str = '0') -> Tuple[Dict[str, pd.Series], Dict[str, str]]:
+        """批量清洗异常值，仅返回实际发生变化的列"""
+        if self.store is not None:
+            return {}, {"数据": OUT_OF_CORE_READ_ONLY}
+        if self.dataframe is None:
+            return {}, {"数据": "数据为空，无法清洗"}
+        
+        columns, errors = self.resolve_columns(columns)
+        changes = {}
+        
+        numeric_columns = [c for c in columns if pd.api.types.is_numeric_dtype(self.dataframe[c])]
+        other_columns = [c for c in columns if c not in numeric_columns]
+        
+        # 数值列：整块向量化处理
+        if numeric_columns:
+            try:
+                target_value = float(target)
+            except ValueError:
+                target_value = None
+                for column in numeric_columns:
+                    errors[column] = f"替换值 '{target}' 不是有效的数字"
             
-            # 映射中文方法名到实际方法
-            method_map = {
-                '最小-最大缩放': 'min_max',
-                'Z-score标准化': 'z_score',
-                '小数定标标准化': 'decimal_scaling',
-                '对数变换': 'log'
-            }
+            if target_value is not None:
+                block = self.dataframe[numeric_columns]
+                if sensitive:
+                    # 严格清洗：无限值与NaN一并替换
+                    block = block.replace([np.inf, -np.inf], np.nan)
+                changed = block.columns[block.isna().any().to_numpy()]
+                if len(changed) > 0:
+                    cleaned = block[changed].fillna(target_value)
+                    for column in changed:
+                        changes[column] = cleaned[column]
+        
+        # 字符串列：先统一转为字符串再整块替换
+        if other_columns:
+            if sensitive:
+                to_replace = ['', 'nan', 'None', 'null', 'NaN', 'NA', 'N/A']
+            else:
+                to_replace = ['', 'None', 'null']
             
-            if method not in method_map:
-                QMessageBox.warning(None, "错误", f"不支持的标准化方法: {method}")
-                return False
+            try:
+                if should_parallelize(self.row_count):
+                    # 大表：逐列转为定宽字符串，匹配计算分块交给进程池
+                    cleaned = {}
+                    for column in other_columns:
+                        values = to_fixed_width_strings(self.dataframe[column])
+                        if values is None:
+                            values = self.dataframe[column].astype(str).to_numpy()
+                            hits = np.isin(values, to_replace)
+                        else:
+                            try:
+                                hits = parallel_isin(values, to_replace)
+                            except Exception:
+                                # 进程池不可用时退回串行计算
+                                hits = np.isin(values, to_replace)
+                        if hits.any():
+                            values = values.astype(object)
+                            values[hits] = target
+                            cleaned[column] = pd.Series(values, index=self.dataframe.index, name=column)
+                else:
+                    block = self.dataframe[other_columns].astype(str)
+                    hits = block.isin(to_replace)
+                    changed = block.columns[hits.any().to_numpy()]
+                    cleaned = block[changed].mask(hits[changed], target) if len(changed) > 0 else {}
                 
-            actual_method = method_map[method]
-            
-            # 确保列是数值类型
-            if not pd.api.types.is_numeric_dtype(self.dataframe[column_name]):
-                QMessageBox.warning(None, "错误", f"列 '{column_name}' 不是数值类型，无法进行标准化")
-                return False
+                for column in list(cleaned.keys()):
+                    series = cleaned[column]
+                    # 尝试转换回原始数据类型
+                    try:
+                        series = series.astype(self.dataframe[column].dtype)
+                    except (ValueError, TypeError):
+                        pass
+                    changes[column] = series
+            except Exception as e:
+                for column in other_columns:
+                    errors[column] = f"清洗失败: {e}"
+        
+        return changes, errors
+
+    def prepare_convert_data(self, options) -> Tuple[Dict[str, pd.Series], Dict[str, str]]:
+        """按转换选项批量计算转换结果"""
+        choosed_option = options.get('choosed_option')
+        
+        if choosed_option == "数据类型转换":
+            return self.prepare_convert_columns(options['column'], options['target_type'], options.get('format'))
+        elif choosed_option == "数据标准化":
+            return self.prepare_normalize_columns(
+                options['column'], options['method'], options.get('min', 0), options.get('max', 1)
+            )
+        else:
+            return {}, {"转换": f"不支持的转换类型: {choosed_option}"}
+
+    def prepare_convert_columns(self, columns, target_type: str, format_str: Optional[str] = None) -> Tuple[Dict[str, pd.Series], Dict[str, str]]:
+        """批量转换数据类型"""
+        if self.store is not None:
+            return {}, {"数据": OUT_OF_CORE_READ_ONLY}
+        if self.dataframe is None:
+            return {}, {"数据": "数据为空，无法转换"}
+        
+        if target_type not in TYPE_MAP:
+            return {}, {"转换": f"不支持的目标类型: {target_type}"}
+        
+        actual_type = TYPE_MAP[target_type]
+        columns, errors = self.resolve_columns(columns)
+        changes = {}
+        if not columns:
+            return changes, errors
+        
+        block = self.dataframe[columns]
+        
+        # 字符串和布尔值可以整块转换
+        if actual_type in ('str', 'bool'):
+            try:
+                converted = block.astype(actual_type)
+                for column in columns:
+                    changes[column] = converted[column]
+            except (ValueError, TypeError) as e:
+                for column in columns:
+                    errors[column] = f"数据类型转换失败: {e}"
+            return changes, errors
+        
+        for column in columns:
+            try:
+                if actual_type == 'int':
+                    changes[column] = pd.to_numeric(block[column], errors='coerce').astype('Int64')
+                elif actual_type == 'float':
+                    changes[column] = pd.to_numeric(block[column], errors='coerce')
+                elif actual_type == 'datetime':
+                    changes[column] = self._to_datetime(block[column], format_str)
+            except Exception as e:
+                errors[column] = f"数据类型转换失败: {e}"
+        
+        return changes, errors
+
+    def _to_datetime(self, series: pd.Series, format_str: Optional[str] = None) -> pd.Series:
+        """解析日期时间，大的文本列分块交给进程池"""
+        if should_parallelize(len(series)) and (series.dtype == object or pd.api.types.is_string_dtype(series.dtype)):
+            values = to_fixed_width_strings(series)
+            if values is not None:
+                try:
+                    parsed = parallel_to_datetime(values, format_str or None)
+                    return pd.Series(parsed, index=series.index, name=series.name)
+                except Exception:
+                    pass  # 出现时区等特殊情况时退回串行解析
+        
+        if format_str:
+            return pd.to_datetime(series, format=format_str, errors='coerce')
+        return pd.to_datetime(series, errors='coerce')
+
+    def prepare_replace_text(self, find_text: str, replace_text: str, case_sensitive: bool = False,
+                             whole_word: bool = False, columns=None) -> Tuple[Dict[str, pd.Series], int]:
+        """向量化查找替换，返回 (新列字典, 被替换的单元格数)"""
+        if self.store is not None:
+            raise ValueError(OUT_OF_CORE_READ_ONLY)
+        if self.dataframe is None or not find_text:
+            return {}, 0
+        
+        columns, _ = self.resolve_columns(columns)
+        pattern = re.escape(find_text)
+        if whole_word:
+            pattern = r'\b{}\b'.format(pattern)
+        flags = 0 if case_sensitive else re.IGNORECASE
+        regex = re.compile(pattern, flags)
+        # 替换文本按字面处理
+        repl = replace_text.replace('\\', '\\\\')
+        
+        changes = {}
+        replaced_count = 0
+        for column in columns:
+            series = self.dataframe[column]
+            nulls = series.isna().to_numpy()
             
-            if actual_method == 'min_max':
-                # 最小-最大缩放
-                col_min = self.dataframe[column_name].min()
-                col_max = self.dataframe[column_name].max()
-                if col_max == col_min:
-                    QMessageBox.warning(None, "错误", f"列 '{column_name}' 的最大值和最小值相同，无法进行最小-最大缩放")
-                    return False
-                self.dataframe[column_name] = (self.dataframe[column_name] - col_min) / (col_max - col_min) * (max_val - min_val) + min_val
-                
-            elif actual_method == 'z_score':
-                # Z-score标准化
-                col_mean = self.dataframe[column_name].mean()
-                col_std = self.dataframe[column_name].std()
-                if col_std == 0:
-                    QMessageBox.warning(None, "错误", f"列 '{column_name}' 的标准差为0，无法进行Z-score标准化")
-                    return False
-                self.dataframe[column_name] = (self.dataframe[column_name] - col_mean) / col_std
-                
-            elif actual_method == 'decimal_scaling':
-                # 小数定标标准化
-                max_val = max(abs(self.dataframe[column_name].min()), abs(self.dataframe[column_name].max()))
-                j = len(str(int(max_val))) if max_val != 0 else 1
-                self.dataframe[column_name] = self.dataframe[column_name] / (10 ** j)
-                
-            elif actual_method == 'log':
-                # 对数变换
-                if (self.dataframe[column_name] <= 0).any():
-                    QMessageBox.warning(None, "错误", f"列 '{column_name}' 包含非正值，无法进行对数变换")
-                    return False
-                self.dataframe[column_name] = np.log(self.dataframe[column_name])
+            new_values = None
+            if should_parallelize(len(series)):
+                values = to_fixed_width_strings(series)
+                if values is not None:
+                    try:
+                        new_values = parallel_regex_replace(values, pattern, repl, flags)
+                        old_values = values.astype(object)
+                    except Exception:
+                        new_values = None  # 进程池不可用时退回串行替换
+            if new_values is None:
+                old_values = series.astype(str).to_numpy(dtype=object)
+                new_values = pd.Series(old_values, dtype=object).str.replace(regex, repl, regex=True).to_numpy(dtype=object)
             
-            self.update_stats()
-            data_signals.data_modified.emit(
-                self.dataframe.to_numpy().copy(), 
-                self.get_table_headers().copy()
-            )
-            return True
+            changed = (new_values != old_values) & ~nulls
+            count = int(changed.sum())
+            if count == 0:
+                continue
             
-        except Exception as e:
-            QMessageBox.warning(None, "错误", f"数据标准化失败: {e}")
-            return False
+            # 只改写命中的单元格，其余保持原值和类型
+            result = series.to_numpy(dtype=object).copy()
+            result[changed] = new_values[changed]
+            new_series = pd.Series(result, index=series.index, name=column)
+            if pd.api.types.is_numeric_dtype(series.dtype):
+                # 数值列替换后仍为数值时保持数值类型
+                numeric = pd.to_numeric(new_series, errors='coerce')
+                if not (numeric.isna().to_numpy() & ~nulls).any():
+                    new_series = numeric
+            else:
+                try:
+                    new_series = new_series.astype(series.dtype)
+                except (ValueError, TypeError):
+                    pass
+            changes[column] = new_series
+            replaced_count += count
+        
+        return changes, replaced_count
+
+    def prepare_normalize_columns(self, columns, method: str, min_val: float = 0, max_val: float = 1) -> Tuple[Dict[str, pd.Series], Dict[str, str]]:
+        """批量标准化数值列"""
+        if self.store is not None:
+            return {}, {"数据": OUT_OF_CORE_READ_ONLY}
+        if self.dataframe is None:
+            return {}, {"数据": "数据为空，无法标准化"}
+        
+        if method not in NORMALIZE_METHOD_MAP:
+            return {}, {"标准化": f"不支持的标准化方法: {method}"}
+        
+        actual_method = NORMALIZE_METHOD_MAP[method]
+        columns, errors = self.resolve_columns(columns)
+        changes = {}
+        
+        numeric_columns = []
+        for column in columns:
+            if pd.api.types.is_numeric_dtype(self.dataframe[column]) and not pd.api.types.is_bool_dtype(self.dataframe[column]):
+                numeric_columns.append(column)
+            else:
+                errors[column] = "不是数值类型，无法进行标准化"
+        if not numeric_columns:
+            return changes, errors
+        
+        block = self.dataframe[numeric_columns]
+        
+        # 先按列求出统计量，筛掉无法处理的列，再整块计算
+        if actual_method == 'min_max':
+            col_min = block.min()
+            col_max = block.max()
+            invalid = col_max == col_min
+            reason = "最大值和最小值相同，无法进行最小-最大缩放"
+        elif actual_method == 'z_score':
+            col_mean = block.mean()
+            col_std = block.std()
+            invalid = (col_std == 0) | col_std.isna()
+            reason = "标准差为0，无法进行Z-score标准化"
+        elif actual_method == 'decimal_scaling':
+            max_abs = block.abs().max()
+            invalid = max_abs.isna()
+            reason = "列中没有有效数值，无法进行小数定标标准化"
+        else:
+            invalid = (block <= 0).any()
+            reason = "包含非正值，无法进行对数变换"
+        
+        for column in invalid.index[invalid.to_numpy()]:
+            errors[column] = reason
+        valid = list(invalid.index[~invalid.to_numpy()])
+        if not valid:
+            return changes, errors
+        
+        block = block[valid]
+        if actual_method == 'min_max':
+            result = (block - col_min[valid]) / (col_max[valid] - col_min[valid]) * (max_val - min_val) + min_val
+        elif actual_method == 'z_score':
+            result = (block - col_mean[valid]) / col_std[valid]
+        elif actual_method == 'decimal_scaling':
+            # 与单列版本一致：j 为最大绝对值整数部分的位数
+            values = max_abs[valid].to_numpy(dtype=float)
+            j = np.where(values >= 1, np.floor(np.log10(np.where(values >= 1, values, 1))) + 1, 1)
+            result = block / (10 ** pd.Series(j, index=valid))
+        else:
+            result = np.log(block)
+        
+        for column in valid:
+            changes[column] = result[column]
+        
+        return changes, errors
+
+    def replace_columns(self, new_columns: Dict[str, pd.Series]) -> Dict[str, pd.Series]:
+        """一次性写回多列数据，只发出一次更新通知，返回被替换下来的旧列"""
+        if self.dataframe is None or not new_columns:
+            return {}
+        
+        old_columns = {}
+        rows = {}
+        for column, series in new_columns.items():
+            old_columns[column] = self.dataframe[column]
+            # 按位置写入：新列可能来自索引不同的旧版本数据（如编辑后索引被重置），不能按索引对齐
+            self.dataframe[column] = series.set_axis(self.dataframe.index)
+            changed = changed_rows(old_columns[column], self.dataframe[column])
+            if changed is None or len(changed):
+                rows[column] = changed
+        
+        self.update_stats()
+        self.mark_changed(list(rows), rows)
+        container_signals.container_updated.emit(self)
+        return old_columns
@@ -0,0 +1,3 @@
+from . import columnar_io, compression, encoding, csv_schema, sniffer, csv_loader, excel_loader, json_loader, project_io, table_writer, parse_cache, sqlite_io
+
+__all__ = ['columnar_io', 'compression', 'encoding', 'csv_schema', 'sniffer', 'csv_loader', 'excel_loader', 'json_loader', 'project_io', 'table_writer', 'parse_cache', 'sqlite_io']
@@ -0,0 +1,165 @@
+# src/core/data_io/columnar_io.py
+# 列式文件读写：Parquet 和 Feather（Arrow IPC）。读取时只解码选中的列（列投影），
+# 通过内存映射和多线程解码直接得到按列存储的数组；写入时保留各列的类型。
+# 依赖 pyarrow（可选），未安装时这两种格式不可用。
+
+import os
+from typing import Optional, List, Dict, Any, Iterable
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    import pyarrow.feather as feather
+except ImportError:  # pyarrow 为可选依赖
+    pa = None
+    pq = None
+    feather = None
+
+# 拓展名 -> 格式
+COLUMNAR_EXTENSIONS = {
+    ".parquet": "parquet",
+    ".feather": "feather",
+    ".arrow": "feather",
+}
+
+# 写入时使用的压缩算法：Parquet 用 snappy 兼顾速度和体积，Feather 用 lz4 以获得最快的读取速度
+COMPRESSION = {
+    "parquet": "snappy",
+    "feather": "lz4",
+}
+
+def columnar_available() -> bool:
+    return pa is not None
+
+def file_format(file_path: str) -> Optional[str]:
+    """根据拓展名返回列式格式，非列式文件返回 None"""
+    return COLUMNAR_EXTENSIONS.get(os.path.splitext(file_path)[1].lower())
+
+def _require_pyarrow():
+    if not columnar_available():
+        raise ValueError("读写Parquet/Feather文件需要安装pyarrow")
+
+def _nullable_integer_types() -> Dict[Any, Any]:
+    """Arrow整数类型 -> pandas可空整数类型"""
+    return {
+        pa.int8(): pd.Int8Dtype(), pa.int16(): pd.Int16Dtype(),
+        pa.int32(): pd.Int32Dtype(), pa.int64(): pd.Int64Dtype(),
+        pa.uint8(): pd.UInt8Dtype(), pa.uint16(): pd.UInt16Dtype(),
+        pa.uint32(): pd.UInt32Dtype(), pa.uint64(): pd.UInt64Dtype(),
+    }
+
+def read_schema(file_path: str) -> Dict[str, Any]:
+    """
+    只读取文件元数据
+
+    返回 {"columns": [(列名, 类型名)], "rows": 行数}
+    """
+    _require_pyarrow()
+    if file_format(file_path) == "parquet":
+        parquet_file = pq.ParquetFile(file_path)
+        schema = parquet_file.schema_arrow
+        rows = parquet_file.metadata.num_rows
+    else:
+        try:
+            reader = pa.ipc.open_file(pa.memory_map(file_path))
+            schema = reader.schema
+            rows = sum(reader.get_batch(i).num_rows for i in range(reader.num_record_batches))
+        except pa.ArrowInvalid:
+            # 旧版（V1）Feather文件
+            table = feather.read_table(file_path, memory_map=True)
+            schema = table.schema
+            rows = table.num_rows
+    # pandas 写入的索引列不作为数据列显示
+    # （RangeIndex 只记录在元数据中，不占用列）
+    index_columns = {name for name in (schema.pandas_metadata or {}).get("index_columns", []) if isinstance(name, str)}
+    columns = [(field.name, str(field.type)) for field in schema if field.name not in index_columns]
+    return {"columns": columns, "rows": rows}
+
+def read_columnar(file_path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """读取列式文件，columns 为要读取的列（None 表示全部）"""
+    _require_pyarrow()
+    if file_format(file_path) == "parquet":
+        table = pq.read_table(file_path, columns=columns, memory_map=True, use_threads=True)
+    else:
+        table = feather.read_table(file_path, columns=columns, memory_map=True, use_threads=True)
+    return table_to_frame(table)
+
+def table_to_frame(table) -> pd.DataFrame:
+    """Arrow表转换为DataFrame，含缺失值的整数列转换为pandas可空整数类型，避免变为浮点而丢失精度"""
+    nullable_types = _nullable_integer_types()
+    nullable_columns = {
+        field.name: table.column(i)
+        for i, field in enumerate(table.schema)
+        if field.type in nullable_types and table.column(i).null_count
+    }
+    df = table.to_pandas(split_blocks=True, use_threads=True)
+    for name, column in nullable_columns.items():
+        df[name] = column.to_pandas(types_mapper=nullable_types.get)
+    # pandas 写入的索引不作为数据列保留
+    return df.reset_index(drop=True)
+
+def load_columnar(file_path: str, container, columns: Optional[List[str]] = None):
+    """加载列式文件到数据容器"""
+    container.set_dataframe(read_columnar(file_path, columns))
+
+def read_parquet_stream(stream) -> pd.DataFrame:
+    """从可读的文件对象中读取Parquet数据"""
+    _require_pyarrow()
+    return table_to_frame(pq.read_table(stream, use_threads=True))
+
+def write_parquet_stream(stream, df: pd.DataFrame):
+    """将DataFrame以Parquet格式写入可写的文件对象（只顺序写入）"""
+    _require_pyarrow()
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), stream, compression=COMPRESSION["parquet"])
+
+def write_parquet_chunks(stream, chunks: Iterable[pd.DataFrame]):
+    """将按块产出的DataFrame依次写入Parquet（每块一个行组），列类型由第一块决定"""
+    _require_pyarrow()
+    writer = None
+    try:
+        for chunk in chunks:
+            if writer is None:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                writer = pq.ParquetWriter(stream, table.schema, compression=COMPRESSION["parquet"])
+            else:
+                table = pa.Table.from_pandas(chunk, schema=writer.schema, preserve_index=False)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+def write_columnar_chunks(file_path: str, chunks: Iterable[pd.DataFrame]):
+    """按块写入 Parquet 或 Feather 文件，内存占用只与块大小有关"""
+    _require_pyarrow()
+    fmt = file_format(file_path)
+    if fmt == "parquet":
+        write_parquet_chunks(file_path, chunks)
+        return
+    if fmt != "feather":
+        raise ValueError("不支持的文件类型")
+    writer = None
+    schema = None
+    try:
+        for chunk in chunks:
+            batch = pa.RecordBatch.from_pandas(chunk, schema=schema, preserve_index=False)
+            if writer is None:
+                schema = batch.schema
+                options = pa.ipc.IpcWriteOptions(compression=COMPRESSION[fmt])
+                writer = pa.ipc.new_file(file_path, schema, options=options)
+            writer.write_batch(batch)
+    finally:
+        if writer is not None:
+            writer.close()
+
+def write_columnar(file_path: str, df: pd.DataFrame):
+    """按拓展名写入 Parquet 或 Feather 文件，保留各列类型"""
+    _require_pyarrow()
+    fmt = file_format(file_path)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    if fmt == "parquet":
+        pq.write_table(table, file_path, compression=COMPRESSION[fmt])
+    elif fmt == "feather":
+        feather.write_feather(table, file_path, compression=COMPRESSION[fmt])
+    else:
+        raise ValueError("不支持的文件类型")
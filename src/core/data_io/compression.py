@@ -0,0 +1,264 @@
+# src/core/data_io/compression.py
+# 压缩文件：按拓展名（.gz/.bz2/.xz/.zst）识别，读写时透明地流式解压/压缩，不在磁盘上生成解压后的文件。
+# 读取时在单独的线程中解压，解析线程同时处理已解压的数据块；写入时格式化与压缩也分别在两个线程中进行。
+# 解压和压缩库在处理数据时会释放GIL，两个阶段可以真正重叠。
+# zstd 优先使用 zstandard，未安装时使用 pyarrow 自带的编解码器（不支持设置压缩级别），二者均为可选依赖。
+
+import bz2
+import gzip
+import io
+import lzma
+import os
+import queue
+import threading
+from typing import Optional, BinaryIO
+
+try:
+    import zstandard
+except ImportError:  # zstandard 为可选依赖
+    zstandard = None
+
+try:
+    import pyarrow as pa
+except ImportError:  # pyarrow 为可选依赖
+    pa = None
+
+# 压缩拓展名 -> 压缩格式
+COMPRESSIONS = {".gz": "gzip", ".bz2": "bz2", ".xz": "xz", ".zst": "zstd"}
+
+# 各压缩格式的压缩级别范围 (最小, 最大)，设置的级别超出范围时取边界值
+COMPRESSION_LEVELS = {"gzip": (1, 9), "bz2": (1, 9), "xz": (0, 9), "zstd": (1, 22)}
+
+# 可以压缩的数据文件（按流读写的文本格式）；Excel和列式文件有各自的内部压缩
+COMPRESSIBLE_EXTENSIONS = (".csv", ".json", ".ndjson", ".jsonl")
+
+# 后台线程每次解压/压缩的字节数
+BLOCK_BYTES = 1024 * 1024
+
+# 两个线程之间最多缓存的数据块数
+QUEUE_BLOCKS = 16
+
+def compression_of(file_path: str) -> Optional[str]:
+    """按拓展名判断压缩格式，未压缩时返回 None"""
+    return COMPRESSIONS.get(os.path.splitext(file_path)[1].lower())
+
+def strip_compression(file_path: str) -> str:
+    """去掉压缩拓展名，如 data.csv.gz -> data.csv"""
+    return os.path.splitext(file_path)[0] if compression_of(file_path) else file_path
+
+def data_extension(file_path: str) -> str:
+    """被压缩的数据文件的拓展名（小写），如 data.csv.gz -> .csv"""
+    return os.path.splitext(strip_compression(file_path))[1].lower()
+
+def compression_available(compression: str) -> bool:
+    if compression == "zstd":
+        return zstandard is not None or (pa is not None and pa.Codec.is_available("zstd"))
+    return compression in COMPRESSION_LEVELS
+
+def clamp_level(compression: str, level: Optional[int]) -> Optional[int]:
+    """将设置的压缩级别限制在该格式的范围内，None 或负数表示使用格式的默认级别"""
+    if level is None or level < 0:
+        return None
+    low, high = COMPRESSION_LEVELS[compression]
+    return min(max(level, low), high)
+
+def _open_reader(source, compression: str) -> BinaryIO:
+    """source 为文件路径或已打开的文件（由调用方关闭）"""
+    if compression == "gzip":
+        return gzip.open(source, "rb")
+    if compression == "bz2":
+        return bz2.open(source, "rb")
+    if compression == "xz":
+        return lzma.open(source, "rb")
+    if zstandard is not None:
+        if isinstance(source, str):
+            return zstandard.ZstdDecompressor().stream_reader(open(source, "rb"), closefd=True)
+        return zstandard.ZstdDecompressor().stream_reader(source, closefd=False)
+    return pa.CompressedInputStream(source, "zstd")
+
+def _open_writer(file_path: str, compression: str, level: Optional[int]) -> BinaryIO:
+    level = clamp_level(compression, level)
+    if compression == "gzip":
+        return gzip.open(file_path, "wb", compresslevel=6 if level is None else level)
+    if compression == "bz2":
+        return bz2.open(file_path, "wb", compresslevel=9 if level is None else level)
+    if compression == "xz":
+        return lzma.open(file_path, "wb", preset=level)
+    if zstandard is not None:
+        compressor = zstandard.ZstdCompressor(level=3 if level is None else level)
+        return compressor.stream_writer(open(file_path, "wb"), closefd=True)
+    return pa.CompressedOutputStream(pa.OSFile(file_path, "wb"), "zstd")
+
+class ThreadedReader(io.RawIOBase):
+    """
+    在后台线程中从 source 读取（解压）数据块，read 时取用已准备好的数据
+
+    raw 为 source 读取的原始文件，position 为后台线程已从中读取的字节数
+    """
+    def __init__(self, source: BinaryIO, raw: BinaryIO):
+        super().__init__()
+        self.source = source
+        self.raw = raw
+        self.position = 0
+        self.blocks = queue.Queue(maxsize=QUEUE_BLOCKS)
+        self.pending = memoryview(b"")
+        self.eof = False
+        self._stop = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="decompress", daemon=True)
+        self.thread.start()
+
+    def _put(self, item) -> bool:
+        """放入队列，队列已满时等待；关闭时放弃并返回 False"""
+        while not self._stop.is_set():
+            try:
+                self.blocks.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run(self):
+        try:
+            while True:
+                block = self.source.read(BLOCK_BYTES)
+                self.position = self.raw.tell()
+                if not self._put(block) or not block:
+                    return
+        except BaseException as e:
+            self._put(e)
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if not self.pending:
+            if self.eof:
+                return 0
+            item = self.blocks.get()
+            if isinstance(item, BaseException):
+                self.eof = True
+                raise item
+            if not item:
+                self.eof = True
+                return 0
+            self.pending = memoryview(item)
+        size = min(len(buffer), len(self.pending))
+        buffer[:size] = self.pending[:size]
+        self.pending = self.pending[size:]
+        return size
+
+    def close(self):
+        if not self.closed:
+            self._stop.set()
+            self.thread.join()
+            self.source.close()
+            self.raw.close()
+        super().close()
+
+class PrefixReader(io.RawIOBase):
+    """只读取文件开头 length 字节，之后视为文件末尾（文件在读取期间仍在增长时，只读到开始读取时的位置）"""
+    def __init__(self, raw: BinaryIO, length: int):
+        super().__init__()
+        self.raw = raw
+        self.remaining = length
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if self.remaining <= 0:
+            return 0
+        size = self.raw.readinto(memoryview(buffer)[:min(len(buffer), self.remaining)])
+        self.remaining -= size
+        return size
+
+    def tell(self) -> int:
+        return self.raw.tell()
+
+    def close(self):
+        if not self.closed:
+            self.raw.close()
+        super().close()
+
+class ThreadedWriter(io.RawIOBase):
+    """write 只将数据放入队列，由后台线程写入（压缩）到 target；close 时等待全部写完"""
+    def __init__(self, target: BinaryIO):
+        super().__init__()
+        self.target = target
+        self.blocks = queue.Queue(maxsize=QUEUE_BLOCKS)
+        self.error: Optional[BaseException] = None
+        self.thread = threading.Thread(target=self._run, name="compress", daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        while True:
+            block = self.blocks.get()
+            if block is None:
+                return
+            if self.error is None:
+                try:
+                    self.target.write(block)
+                except BaseException as e:
+                    # 继续取出队列中的数据，避免写入方阻塞
+                    self.error = e
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        if self.error is not None:
+            raise self.error
+        self.blocks.put(bytes(data))
+        return len(data)
+
+    def close(self):
+        if not self.closed:
+            self.blocks.put(None)
+            self.thread.join()
+            self.target.close()
+            super().close()
+            if self.error is not None:
+                raise self.error
+
+def open_input(file_path: str, threaded: bool = True, length: Optional[int] = None) -> BinaryIO:
+    """
+    以二进制方式打开要读取的文件，压缩文件返回解压后的数据流
+
+    threaded 为 True 时在后台线程中预先解压；只读取开头样本时传入 False。
+    length 不为 None 时未压缩的文件只读取开头 length 字节
+    """
+    compression = compression_of(file_path)
+    if compression is None:
+        if length is not None:
+            return io.BufferedReader(PrefixReader(open(file_path, "rb", buffering=0), length), BLOCK_BYTES)
+        return open(file_path, "rb")
+    if not compression_available(compression):
+        raise ValueError(f"读取{compression}压缩文件需要安装zstandard或pyarrow")
+    if not threaded:
+        return _open_reader(file_path, compression)
+    raw = open(file_path, "rb")
+    try:
+        source = _open_reader(raw, compression)
+    except BaseException:
+        raw.close()
+        raise
+    return io.BufferedReader(ThreadedReader(source, raw), BLOCK_BYTES)
+
+def read_position(stream: BinaryIO) -> int:
+    """已从文件中读取的字节数（压缩文件按压缩后的字节数计），配合文件大小汇报进度"""
+    raw = getattr(stream, "raw", None)
+    if isinstance(raw, ThreadedReader):
+        return raw.position
+    return stream.tell()
+
+def open_output(file_path: str, compression: Optional[str] = None, level: Optional[int] = None) -> BinaryIO:
+    """
+    以二进制方式打开要写入的文件，compression 不为 None 时压缩后写入
+
+    压缩在后台线程中进行，写入方格式化下一块数据的同时压缩上一块
+    """
+    if compression is None:
+        return open(file_path, "wb")
+    if not compression_available(compression):
+        raise ValueError(f"保存{compression}压缩文件需要安装zstandard或pyarrow")
+    return io.BufferedWriter(ThreadedWriter(_open_writer(file_path, compression, level)), BLOCK_BYTES)
@@ -0,0 +1,377 @@
+# src/core/data_io/csv_loader.py
+# CSV加载：先嗅探样本，再一次性将文件解析为按列存储的DataFrame，直接交给数据容器，
+# 不经过中间的对象数组。解析引擎可选 pandas（单线程C解析器）或 pyarrow（多线程分块解析）。
+
+import io
+import os
+import time
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+import numpy as np
+import pandas as pd
+from typing import Optional, Callable, List, Dict, Tuple
+from src.utils.parallel_csv import can_split_encoding, complete_length, parallel_read_csv, record_ends
+from .sniffer import CsvFormat, sniff_csv, default_headers, column_names
+from .encoding import remember_encoding
+from .compression import compression_of, open_input, read_position
+from src.core.column_store import ColumnStoreWriter
+
+# 写入列存储时每块的行数
+OUT_OF_CORE_CHUNK_ROWS = 500000
+
+# 修改时间在此秒数之内的文件视为可能正在写入，末尾没有换行的记录不解析
+WRITING_SECONDS = 2
+
+# 样本检测的编码在完整解析时仍解码失败时，依次尝试的编码
+FALLBACK_ENCODINGS = ("gb18030", "latin-1")
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:  # pyarrow 为可选依赖
+    pa = None
+    pa_csv = None
+
+# 解析引擎：设置项 io.csv_engine 的取值 -> 显示名称
+CSV_ENGINES = {
+    "auto": "自动（优先pyarrow）",
+    "pandas": "pandas",
+    "pyarrow": "pyarrow",
+}
+
+def pyarrow_available() -> bool:
+    return pa_csv is not None
+
+def resolve_engine(engine: str = "auto") -> str:
+    """将设置中的引擎解析为实际可用的引擎"""
+    if engine in ("auto", "pyarrow") and pyarrow_available():
+        return "pyarrow"
+    return "pandas"
+
+def read_options(fmt: CsvFormat) -> dict:
+    """根据嗅探结果生成 pd.read_csv 参数"""
+    options = {
+        "sep": fmt.delimiter,
+        "encoding": fmt.encoding,
+        "header": 0 if fmt.has_header else None,
+    }
+    # 样本中为浮点的列直接按float64解析，省去类型推断；整数列可能在后文出现缺失值，不做提示
+    dtype = {i: "float64" for i, column_type in fmt.dtypes.items() if column_type == "float64"}
+    # 导入结构中指定的类型、日期格式和缺失值标记交给解析器，直接产出对应类型的列
+    if fmt.schema is not None:
+        schema_options = fmt.schema.pandas_options(column_names(fmt), fmt.has_header)
+        dtype.update(schema_options.pop("dtype", {}))
+        for i in schema_options.get("parse_dates", []):
+            dtype.pop(i, None)
+        options.update(schema_options)
+    if dtype:
+        options["dtype"] = dtype
+    return options
+
+def schema_dtypes(fmt: CsvFormat) -> dict:
+    """导入结构中指定的列类型 {列位置: 类型}（不含日期时间列）"""
+    if fmt.schema is None:
+        return {}
+    return fmt.schema.pandas_options(column_names(fmt), fmt.has_header).get("dtype", {})
+
+def measure_source(file_path: str, fmt: CsvFormat):
+    """
+    解析前记录文件的大小和修改时间，解析只读取此时已完整写入的记录
+
+    文件在解析期间仍在增长时，之后追加的行由跟踪文件更新从记录的位置开始读取，不会遗漏；
+    刚被修改的文件末尾没有换行的记录可能尚未写完，不解析，留给跟踪文件更新读取
+    """
+    stat = os.stat(file_path)
+    fmt.size = stat.st_size
+    fmt.mtime = stat.st_mtime
+    if compression_of(file_path) is None and time.time() - stat.st_mtime < WRITING_SECONDS:
+        fmt.size = complete_length(file_path, stat.st_size)
+
+@contextmanager
+def open_source(file_path: str, length: Optional[int] = None):
+    """
+    未压缩的文件直接按路径交给解析器；压缩文件在后台线程中解压，解析器边解压边解析
+
+    length 不为 None 且文件已变长时，未压缩的文件只读取开头 length 字节
+    """
+    if compression_of(file_path) is None and (length is None or length >= os.path.getsize(file_path)):
+        yield file_path
+        return
+    with open_input(file_path, length=length) as f:
+        yield f
+
+def read_csv(file_path: str, fmt: Optional[CsvFormat] = None, engine: str = "auto") -> pd.DataFrame:
+    """单次解析CSV文件，pyarrow 不可用或解析失败时回退到 pandas"""
+    if fmt is None:
+        fmt = sniff_csv(file_path)
+    measure_source(file_path, fmt)
+    if resolve_engine(engine) == "pyarrow":
+        df = read_csv_pyarrow(file_path, fmt)
+        if df is not None:
+            fmt.engine = "pyarrow"
+            return df
+    fmt.engine = "pandas"
+    return read_csv_pandas(file_path, fmt)
+
+def origin_options(fmt: CsvFormat, **extra) -> dict:
+    """
+    记录实际使用的解析方式（引擎、编码、导入结构），作为数据容器来源的读取选项；
+    自动保存恢复时按相同方式重新读取，得到与读取时相同的列类型。
+    size、mtime 为解析前记录的文件大小和修改时间，作为来源文件的版本（跟踪文件更新从 size 处开始读取）
+    """
+    return {"size": fmt.size, "mtime": fmt.mtime, "csv": {
+        "engine": fmt.engine,
+        "encoding": fmt.encoding,
+        "schema": fmt.schema.to_dict() if fmt.schema is not None else None,
+        **extra
+    }}
+
+def read_csv_pyarrow(file_path: str, fmt: CsvFormat) -> Optional[pd.DataFrame]:
+    """
+    用 pyarrow 多线程解析，结果转换为numpy类型的列；无法处理时返回 None
+
+    样本之外出现与检测结果不符的字节时（UTF-8 下表现为二进制列，其他编码下为解码错误），
+    与 pandas 路径一致依次换用后备编码重新解析，并更新编码缓存
+    """
+    encodings = [fmt.encoding] + [encoding for encoding in FALLBACK_ENCODINGS if encoding != fmt.encoding]
+    for encoding in encodings:
+        try:
+            table = _read_arrow_table(file_path, fmt, encoding)
+        except UnicodeDecodeError:
+            continue
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError, LookupError):
+            # 列数不一致、编码不支持等情况交给 pandas 处理
+            return None
+        if any(pa.types.is_binary(field.type) or pa.types.is_large_binary(field.type) for field in table.schema):
+            continue
+        if encoding != fmt.encoding:
+            fmt.encoding = encoding
+            remember_encoding(file_path, encoding)
+        break
+    else:
+        return None
+    if len(set(table.column_names)) != len(table.column_names):
+        # 重复列名交给 pandas 按其规则重命名
+        return None
+    df = arrow_to_pandas(table)
+    if df is None:
+        return None
+    if fmt.schema is not None:
+        # 可空的整数、布尔列按可空类型转换，避免缺失值使其变为浮点或对象列
+        types_mapper = {pa.int64(): pd.Int64Dtype(), pa.bool_(): pd.BooleanDtype()}.get
+        for name in fmt.schema.nullable_columns():
+            if name in df.columns:
+                df[name] = table.column(name).to_pandas(types_mapper=types_mapper)
+    return df
+
+def _read_arrow_table(file_path: str, fmt: CsvFormat, encoding: str):
+    """按指定编码用 pyarrow 解析整个文件"""
+    # pyarrow 原生支持UTF-8（会跳过BOM），其他编码由其内部转码
+    encoding = "utf8" if encoding in ("utf-8", "utf-8-sig") else encoding
+    read_options = pa_csv.ReadOptions(encoding=encoding)
+    if not fmt.has_header:
+        read_options.column_names = default_headers(fmt.column_count)
+    # 不开启 newlines_in_values，保持按块并行；引号内含换行导致列数不一致时回退到 pandas
+    parse_options = pa_csv.ParseOptions(delimiter=fmt.delimiter)
+    # 与 pandas 一致：空字符串视为缺失值
+    convert_options = pa_csv.ConvertOptions(strings_can_be_null=True)
+    if fmt.schema is not None:
+        for name, value in fmt.schema.arrow_options(pa, convert_options.null_values).items():
+            setattr(convert_options, name, value)
+    with open_source(file_path, fmt.size) as source:
+        return pa_csv.read_csv(source, read_options=read_options,
+                               parse_options=parse_options, convert_options=convert_options)
+
+def arrow_to_pandas(table) -> Optional[pd.DataFrame]:
+    """
+    将 pyarrow 解析的表转换为 DataFrame，列类型与其余代码对 pandas 解析结果的假设保持一致：
+    日期、时间戳为 datetime64[ns]，时间为文本，文本列的缺失值为 NaN。
+    出现二进制列（内容不是有效的UTF-8）或日期超出 datetime64[ns] 范围时返回 None
+    """
+    columns = []
+    for field, column in zip(table.schema, table.columns):
+        arrow_type = field.type
+        if pa.types.is_binary(arrow_type) or pa.types.is_large_binary(arrow_type):
+            return None
+        try:
+            if pa.types.is_date(arrow_type):
+                column = column.cast(pa.timestamp("ns"))
+            elif pa.types.is_timestamp(arrow_type) and arrow_type.unit != "ns":
+                column = column.cast(pa.timestamp("ns", arrow_type.tz))
+            elif pa.types.is_time(arrow_type):
+                column = column.cast(pa.string())
+        except pa.ArrowInvalid:
+            return None
+        columns.append(column)
+    df = pa.Table.from_arrays(columns, names=table.column_names).to_pandas()
+    for field, column in zip(table.schema, columns):
+        if column.null_count and (pa.types.is_string(column.type) or pa.types.is_large_string(column.type)):
+            # pyarrow 将文本列的缺失值转换为 None，pandas 解析器为 NaN
+            series = df[field.name]
+            df[field.name] = series.where(series.notna(), np.nan)
+    return df
+
+def read_csv_pandas(file_path: str, fmt: CsvFormat) -> pd.DataFrame:
+    """用 pandas C 解析器解析"""
+    options = read_options(fmt)
+    try:
+        with open_source(file_path, fmt.size) as source:
+            df = pd.read_csv(source, **options)
+    except UnicodeDecodeError:
+        # 样本之外出现了与检测结果不符的字节，换用后备编码并更新缓存
+        df = _read_with_fallback_encoding(file_path, fmt, options)
+    except ValueError:
+        # 样本之外出现了非数值内容，去掉类型提示重新解析
+        if "dtype" not in options:
+            raise
+        options.pop("dtype")
+        with open_source(file_path, fmt.size) as source:
+            df = pd.read_csv(source, **options)
+    
+    if not fmt.has_header:
+        df.columns = default_headers(df.shape[1])
+    if fmt.schema is not None:
+        # 去掉类型提示重新解析、或日期不符合格式时，将指定了类型的列转换为指定类型
+        df = fmt.schema.coerce(df)
+    return df
+
+def _read_with_fallback_encoding(file_path: str, fmt: CsvFormat, options: dict) -> pd.DataFrame:
+    """用后备编码重新解析"""
+    options.pop("dtype", None)
+    for encoding in FALLBACK_ENCODINGS:
+        if encoding == fmt.encoding:
+            continue
+        try:
+            with open_source(file_path, fmt.size) as source:
+                df = pd.read_csv(source, **dict(options, encoding=encoding))
+        except UnicodeDecodeError:
+            continue
+        fmt.encoding = encoding
+        remember_encoding(file_path, encoding)
+        return df
+    raise ValueError(f"无法识别文件编码: {file_path}")
+
+def load_csv(file_path: str, container, fmt: Optional[CsvFormat] = None, engine: str = "auto"):
+    """加载CSV文件到数据容器"""
+    container.set_dataframe(read_csv(file_path, fmt, engine))
+
+def should_read_parallel(file_path: str, threshold_mb: int, engine: str = "auto") -> bool:
+    """
+    是否使用多进程按字节范围解析
+
+    pyarrow 本身已按块多线程解析，只有使用 pandas 解析器且文件超过阈值、有多个CPU时才启用；
+    压缩文件无法按字节范围读取
+    """
+    if resolve_engine(engine) != "pandas" or (os.cpu_count() or 1) < 2 or compression_of(file_path):
+        return False
+    return os.path.getsize(file_path) >= threshold_mb * 1024 * 1024
+
+def read_csv_parallel(file_path: str, fmt: Optional[CsvFormat] = None,
+                      check_cancelled: Optional[Callable] = None,
+                      progress: Optional[Callable] = None) -> pd.DataFrame:
+    """多进程解析CSV文件，编码不支持按字节切分或解析失败时退回单进程解析"""
+    if fmt is None:
+        fmt = sniff_csv(file_path)
+    measure_source(file_path, fmt)
+    fmt.engine = "parallel"
+    if not can_split_encoding(fmt.encoding) or fmt.schema is not None:
+        # 指定了导入结构时单进程解析，由解析器直接产出指定的类型
+        return read_csv_pandas(file_path, fmt)
+    headers = column_names(fmt)
+    try:
+        return parallel_read_csv(
+            file_path, headers, fmt.delimiter, fmt.encoding, fmt.has_header, fmt.dtypes,
+            check_cancelled=check_cancelled, progress=progress, size=fmt.size
+        )
+    except (ValueError, OSError, BrokenProcessPool):
+        # pandas 的解析错误均为 ValueError 子类
+        return read_csv_pandas(file_path, fmt)
+
+def load_csv_parallel(file_path: str, container, fmt: Optional[CsvFormat] = None,
+                      check_cancelled: Optional[Callable] = None,
+                      progress: Optional[Callable] = None):
+    """多进程加载CSV文件到数据容器"""
+    container.set_dataframe(read_csv_parallel(file_path, fmt, check_cancelled, progress))
+
+def read_appended(file_path: str, offset: int, fmt: CsvFormat, headers: List[str],
+                  dtypes: Optional[Dict[str, object]] = None) -> Tuple[Optional[pd.DataFrame], int]:
+    """
+    解析文件中 offset 之后追加的完整行，返回 (新增行, 新的读取位置)
+
+    末尾没有换行的行（写入方尚未写完）留到下次读取；dtypes 为已有列的类型，
+    已有的数值列中无法转换的内容记为缺失值，避免整列变为文本。没有完整的新行时返回 (None, offset)
+    """
+    if not can_split_encoding(fmt.encoding):
+        raise ValueError(f"不支持按字节读取 {fmt.encoding} 编码的文件")
+    with open(file_path, "rb") as f:
+        f.seek(offset)
+        data = f.read()
+    # offset 处为记录开头，引号内的换行不是行尾
+    ends = record_ends(data)
+    end = int(ends[-1]) + 1 if len(ends) else 0
+    if end == 0:
+        return None, offset
+    options = read_options(fmt)
+    options.pop("dtype", None)
+    options.update(header=None, names=headers)
+    try:
+        df = pd.read_csv(io.BytesIO(data[:end]), **options)
+    except pd.errors.EmptyDataError:
+        # 只有空行
+        return None, offset + end
+    for name, dtype in (dtypes or {}).items():
+        if name in df.columns and pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_numeric_dtype(df[name]):
+            df[name] = pd.to_numeric(df[name], errors="coerce")
+    return df, offset + end
+
+def iter_csv_chunks(file_path: str, chunk_rows: int, fmt: Optional[CsvFormat] = None):
+    """
+    分块读取CSV文件
+    
+    逐块产出 (DataFrame, 已读取字节数, 文件总字节数)，内存占用只与块大小有关
+    """
+    if fmt is None:
+        fmt = sniff_csv(file_path)
+    measure_source(file_path, fmt)
+    fmt.engine = "chunks"
+    options = read_options(fmt)
+    # 分块之间各自推断类型，不使用样本类型提示，避免某一块中的非数值内容导致整体失败；
+    # 导入结构中的文本、分类类型不会解析失败，直接交给解析器，其余指定的类型由各块按结构转换
+    options.pop("dtype", None)
+    dtype = {i: column_type for i, column_type in schema_dtypes(fmt).items() if column_type in (str, "category")}
+    if dtype:
+        options["dtype"] = dtype
+    total_bytes = fmt.size
+    
+    with open_input(file_path, length=fmt.size) as f:
+        reader = pd.read_csv(f, chunksize=chunk_rows, **options)
+        with reader:
+            for chunk in reader:
+                if not fmt.has_header:
+                    chunk.columns = default_headers(chunk.shape[1])
+                if fmt.schema is not None:
+                    chunk = fmt.schema.coerce(chunk)
+                yield chunk, min(read_position(f), total_bytes), total_bytes
+
+def load_csv_out_of_core(file_path: str, container, chunk_rows: int = OUT_OF_CORE_CHUNK_ROWS,
+                         progress: Optional[Callable] = None,
+                         check_cancelled: Optional[Callable] = None):
+    """
+    分块解析CSV并写入磁盘列存储，用于超出内存的文件
+
+    列类型由第一块决定，之后的块中数值列出现文本时该列改为字符串列；
+    progress(已读取字节数, 总字节数) 用于汇报进度，取消或出错时删除已写入的文件
+    """
+    writer = ColumnStoreWriter()
+    try:
+        for chunk, read_bytes, total_bytes in iter_csv_chunks(file_path, chunk_rows):
+            if check_cancelled:
+                check_cancelled()
+            writer.append(chunk)
+            if progress:
+                progress(read_bytes, total_bytes)
+        store = writer.finish()
+    except BaseException:
+        writer.abort()
+        raise
+    container.attach_store(store)
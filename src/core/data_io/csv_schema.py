@@ -0,0 +1,262 @@
+# src/core/data_io/csv_schema.py
+# 导入结构：为CSV的各列指定类型、日期时间格式，并指定额外的缺失值标记，解析器直接产出对应类型的列，
+# 不需要加载后再逐列转换。结构按文件名模式（如 log_*.csv）保存在 ~/.vplotter/csv_schemas.json 中，
+# 之后打开文件名匹配的文件时由嗅探自动附加到解析格式上。
+
+import fnmatch
+import io
+import json
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Optional, List, Dict
+import numpy as np
+import pandas as pd
+from src.utils.parallel import guess_datetime_format
+
+# 列类型：结构中记录的取值 -> 显示名称；auto 表示由解析器推断，不写入结构
+COLUMN_TYPES = {
+    "auto": "自动",
+    "float64": "浮点数",
+    "Int64": "整数（可含缺失值）",
+    "boolean": "布尔",
+    "str": "文本",
+    "category": "分类",
+    "datetime": "日期时间",
+}
+
+# 推断结构时，非空值中能转换为数值的比例不低于该值即视为数值列，其余内容作为缺失值标记
+NUMERIC_MIN_RATIO = 0.9
+
+# 推断结构时每列最多收集的缺失值标记数，超出时不视为数值列
+MAX_NA_TOKENS = 20
+
+# 保存的结构的最大条数，超出时丢弃最早的记录
+MAX_SCHEMAS = 200
+
+# 回退转换布尔列时识别的取值（不区分大小写）
+_BOOLEAN_VALUES = {"true": True, "false": False, "1": True, "0": False, "yes": True, "no": False}
+
+_lock = threading.Lock()
+
+class CsvSchema:
+    """CSV文件的导入结构"""
+    def __init__(self, pattern: str = "", types: Optional[Dict[str, str]] = None,
+                 datetime_formats: Optional[Dict[str, str]] = None, na_values: Optional[List[str]] = None):
+        self.pattern = pattern                                # 文件名模式，如 log_*.csv
+        self.types: Dict[str, str] = {name: dtype for name, dtype in (types or {}).items() if dtype != "auto"}
+        self.datetime_formats: Dict[str, str] = dict(datetime_formats or {})  # 列名 -> strptime 格式，空表示自动识别
+        self.na_values: List[str] = list(na_values or [])     # 在默认的缺失值标记之外额外视为缺失值的内容
+
+    def __repr__(self):
+        return f"CsvSchema(pattern={self.pattern!r}, types={self.types}, na_values={self.na_values})"
+
+    def is_empty(self) -> bool:
+        return not self.types and not self.na_values
+
+    def to_dict(self) -> dict:
+        return {
+            "pattern": self.pattern,
+            "types": self.types,
+            "datetime_formats": {name: fmt for name, fmt in self.datetime_formats.items() if self.types.get(name) == "datetime"},
+            "na_values": self.na_values,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "CsvSchema":
+        types = {name: dtype for name, dtype in data.get("types", {}).items() if dtype in COLUMN_TYPES}
+        return cls(data.get("pattern", ""), types, data.get("datetime_formats"), data.get("na_values"))
+
+    def matches(self, file_path: str) -> bool:
+        return bool(self.pattern) and fnmatch.fnmatchcase(os.path.basename(file_path).lower(), self.pattern.lower())
+
+    def pandas_options(self, headers: List[str], has_header: bool) -> dict:
+        """
+        生成 pd.read_csv 的类型、日期和缺失值参数
+
+        headers 为文件的列名，结构中不存在于文件的列忽略；类型按列位置指定
+        """
+        options = {}
+        dtype = {}
+        parse_dates = []
+        date_format = {}
+        for i, name in enumerate(headers):
+            column_type = self.types.get(name)
+            if column_type is None:
+                continue
+            if column_type == "datetime":
+                parse_dates.append(i)
+                if self.datetime_formats.get(name):
+                    date_format[name if has_header else i] = self.datetime_formats[name]
+            else:
+                dtype[i] = str if column_type == "str" else column_type
+        if dtype:
+            options["dtype"] = dtype
+        if parse_dates:
+            options["parse_dates"] = parse_dates
+        if date_format:
+            options["date_format"] = date_format
+        if self.na_values:
+            options["na_values"] = list(self.na_values)
+        return options
+
+    def arrow_options(self, pa, default_null_values: List[str]) -> dict:
+        """生成 pyarrow.csv.ConvertOptions 的参数；pyarrow 的时间格式对所有列生效，按出现顺序依次尝试"""
+        arrow_types = {
+            "float64": pa.float64(),
+            "Int64": pa.int64(),
+            "boolean": pa.bool_(),
+            "str": pa.string(),
+            "category": pa.dictionary(pa.int32(), pa.string()),
+            "datetime": pa.timestamp("ns"),
+        }
+        options = {"column_types": {name: arrow_types[column_type] for name, column_type in self.types.items()}}
+        formats = list(dict.fromkeys(
+            self.datetime_formats[name] for name, column_type in self.types.items()
+            if column_type == "datetime" and self.datetime_formats.get(name)
+        ))
+        if formats:
+            options["timestamp_parsers"] = formats
+        if self.na_values:
+            options["null_values"] = list(default_null_values) + list(self.na_values)
+        return options
+
+    def nullable_columns(self) -> List[str]:
+        """pyarrow 转换为 numpy 类型时会丢失可空类型的列（整数、布尔），需按可空类型单独转换"""
+        return [name for name, column_type in self.types.items() if column_type in ("Int64", "boolean")]
+
+    def coerce(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        将未按指定类型解析的列转换为指定类型，无法转换的内容记为缺失值
+
+        正常情况下类型由解析器直接产出，此时不做任何转换；只有样本之外出现了异常内容、
+        解析器无法按指定类型解析（或日期不符合格式）时才转换对应的列
+        """
+        for name, column_type in self.types.items():
+            if name not in df.columns or _has_type(df[name], column_type):
+                continue
+            series = df[name]
+            if column_type == "float64":
+                df[name] = pd.to_numeric(series, errors="coerce").astype("float64")
+            elif column_type == "Int64":
+                values = pd.to_numeric(series, errors="coerce")
+                df[name] = values.where(values == np.floor(values)).astype("Int64")
+            elif column_type == "boolean":
+                df[name] = series.astype(str).str.strip().str.lower().map(_BOOLEAN_VALUES).astype("boolean")
+            elif column_type == "category":
+                df[name] = series.astype("category")
+            elif column_type == "datetime":
+                df[name] = pd.to_datetime(series, format=self.datetime_formats.get(name) or None, errors="coerce")
+        return df
+
+def _has_type(series: pd.Series, column_type: str) -> bool:
+    if column_type == "float64":
+        return series.dtype == np.float64
+    if column_type == "Int64":
+        return isinstance(series.dtype, pd.Int64Dtype)
+    if column_type == "boolean":
+        return isinstance(series.dtype, pd.BooleanDtype)
+    if column_type == "category":
+        return isinstance(series.dtype, pd.CategoricalDtype)
+    if column_type == "datetime":
+        return pd.api.types.is_datetime64_any_dtype(series)
+    return True
+
+def default_pattern(file_path: str) -> str:
+    """由文件名生成默认模式：数字替换为通配符，如 log_20240105.csv -> log_*.csv"""
+    return re.sub(r"\d+", "*", os.path.basename(file_path))
+
+def sample_frame(text: str, headers: List[str], has_header: bool, delimiter: str) -> pd.DataFrame:
+    """将样本文本解析为全部为文本的列（默认的缺失值标记为缺失值），用于推断结构和预览"""
+    sample = pd.read_csv(
+        io.StringIO(text), sep=delimiter, header=0 if has_header else None,
+        dtype=str, keep_default_na=True
+    )
+    sample.columns = headers[:sample.shape[1]] + [str(i) for i in range(len(headers), sample.shape[1])]
+    return sample
+
+def infer_schema(sample: pd.DataFrame, pattern: str = "") -> CsvSchema:
+    """
+    从样本（sample_frame 的结果）推断结构，只为需要处理的列指定类型
+
+    主要为数值、夹杂少量其他内容（如 "-"、"error"）的列指定为浮点数，并把其他内容加入缺失值标记；
+    可按统一格式解析为日期时间的文本列指定为日期时间。其余列由解析器自行推断
+    """
+    schema = CsvSchema(pattern)
+    na_tokens = []
+    for name in sample.columns:
+        values = sample[name].dropna()
+        values = values[values.str.strip() != ""]
+        if values.empty:
+            continue
+        numbers = pd.to_numeric(values, errors="coerce")
+        valid = numbers.notna()
+        if valid.all():
+            continue
+        others = values[~valid].unique().tolist()
+        if valid.mean() >= NUMERIC_MIN_RATIO and len(others) <= MAX_NA_TOKENS:
+            schema.types[name] = "float64"
+            na_tokens.extend(others)
+            continue
+        if not valid.any():
+            date_format = uniform_datetime_format(values)
+            if date_format:
+                schema.types[name] = "datetime"
+                schema.datetime_formats[name] = date_format
+    schema.na_values = list(dict.fromkeys(na_tokens))
+    return schema
+
+def uniform_datetime_format(values: pd.Series) -> Optional[str]:
+    """按第一个值推断日期时间格式，所有值都符合该格式时返回格式，否则返回 None"""
+    date_format = guess_datetime_format(values.to_numpy())
+    if not date_format:
+        return None
+    parsed = pd.to_datetime(values, format=date_format, errors="coerce")
+    return date_format if parsed.notna().all() else None
+
+# ---------------- 按文件名模式保存 ----------------
+
+def _schema_file() -> Path:
+    return Path.home() / ".vplotter" / "csv_schemas.json"
+
+def load_schemas() -> List[CsvSchema]:
+    """已保存的结构，最近保存的在前"""
+    with _lock:
+        try:
+            with open(_schema_file(), "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return []
+    return [CsvSchema.from_dict(entry) for entry in data if isinstance(entry, dict)]
+
+def _save_schemas(schemas: List[CsvSchema]):
+    try:
+        _schema_file().parent.mkdir(parents=True, exist_ok=True)
+        with open(_schema_file(), "w", encoding="utf-8") as f:
+            json.dump([schema.to_dict() for schema in schemas[:MAX_SCHEMAS]], f, ensure_ascii=False, indent=2)
+    except OSError as e:
+        print(f"保存导入结构失败: {e}")
+
+def schema_for(file_path: str) -> Optional[CsvSchema]:
+    """文件名匹配的已保存结构（多个匹配时取最近保存的），没有时返回 None"""
+    for schema in load_schemas():
+        if schema.matches(file_path):
+            return schema
+    return None
+
+def remember_schema(schema: CsvSchema):
+    """保存结构，替换模式相同的旧结构"""
+    if not schema.pattern:
+        raise ValueError("文件名模式不能为空")
+    schemas = [old for old in load_schemas() if old.pattern != schema.pattern]
+    with _lock:
+        _save_schemas([schema] + schemas)
+
+def forget_schema(pattern: str):
+    """删除模式相同的结构"""
+    schemas = load_schemas()
+    remaining = [schema for schema in schemas if schema.pattern != pattern]
+    if len(remaining) != len(schemas):
+        with _lock:
+            _save_schemas(remaining)
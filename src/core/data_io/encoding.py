@@ -0,0 +1,114 @@
+# src/core/data_io/encoding.py
+# 编码检测：只检查文件开头、中部和末尾的有限字节样本（BOM、UTF-8有效性、GB18030解码成功率），
+# 检测结果按文件路径缓存在 ~/.vplotter/encoding_cache.json 中，文件大小或修改时间变化后失效。
+
+import codecs
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Optional
+from .compression import compression_of
+
+# 中部和末尾各取的样本字节数
+PROBE_BYTES = 16 * 1024
+
+# GB18030 解码时允许的错误字符比例（容忍少量损坏字节）
+GB18030_MAX_ERROR_RATE = 0.001
+
+# 缓存的最大条目数，超出时丢弃最早的记录
+CACHE_MAX_ENTRIES = 500
+
+_cache_lock = threading.Lock()
+
+def _cache_file() -> Path:
+    return Path.home() / ".vplotter" / "encoding_cache.json"
+
+def _load_cache() -> dict:
+    try:
+        with open(_cache_file(), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _file_key(file_path: str):
+    stat = os.stat(file_path)
+    return os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns
+
+def get_cached_encoding(file_path: str) -> Optional[str]:
+    """获取缓存的编码，文件已变化时返回 None"""
+    path, size, mtime = _file_key(file_path)
+    with _cache_lock:
+        entry = _load_cache().get(path)
+    if entry and entry.get("size") == size and entry.get("mtime") == mtime:
+        return entry.get("encoding")
+    return None
+
+def remember_encoding(file_path: str, encoding: str):
+    """记录文件的编码"""
+    path, size, mtime = _file_key(file_path)
+    with _cache_lock:
+        cache = _load_cache()
+        cache.pop(path, None)
+        cache[path] = {"size": size, "mtime": mtime, "encoding": encoding}
+        # dict 保持插入顺序，超出上限时丢弃最早的记录
+        while len(cache) > CACHE_MAX_ENTRIES:
+            cache.pop(next(iter(cache)))
+        try:
+            _cache_file().parent.mkdir(parents=True, exist_ok=True)
+            with open(_cache_file(), "w", encoding="utf-8") as f:
+                json.dump(cache, f, ensure_ascii=False)
+        except OSError as e:
+            print(f"保存编码缓存失败: {e}")
+
+def _trim_to_lines(block: bytes) -> bytes:
+    """去掉首尾不完整的行，避免从多字节字符中间截断"""
+    first = block.find(b"\n")
+    last = block.rfind(b"\n")
+    if first < 0 or first == last:
+        return b""
+    return block[first + 1:last + 1]
+
+def read_probe(file_path: str, head: bytes) -> bytes:
+    """在开头样本之外，再取文件中部和末尾的样本，拼接后用于编码检测（压缩文件无法跳转，只用开头样本）"""
+    if compression_of(file_path):
+        return head
+    size = os.path.getsize(file_path)
+    if size <= len(head) + 2 * PROBE_BYTES:
+        with open(file_path, "rb") as f:
+            return f.read()
+    parts = [head]
+    with open(file_path, "rb") as f:
+        for offset in (size // 2, size - PROBE_BYTES):
+            f.seek(offset)
+            parts.append(_trim_to_lines(f.read(PROBE_BYTES)))
+    return b"".join(parts)
+
+def detect_encoding(sample: bytes) -> str:
+    """根据字节样本推断编码"""
+    if sample.startswith(b"\xef\xbb\xbf"):
+        return "utf-8-sig"
+    if sample.startswith((b"\xff\xfe", b"\xfe\xff")):
+        return "utf-16"
+
+    # 纯ASCII或合法的UTF-8（允许样本末尾有被截断的字符）
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        pass
+
+    # GB18030（兼容GBK/GB2312）：按解码错误率判断
+    text = sample.decode("gb18030", errors="replace")
+    if text and text.count("�") / len(text) <= GB18030_MAX_ERROR_RATE:
+        return "gb18030"
+    return "latin-1"
+
+def detect_file_encoding(file_path: str, head: bytes) -> str:
+    """检测文件编码，优先使用缓存"""
+    encoding = get_cached_encoding(file_path)
+    if encoding:
+        return encoding
+    encoding = detect_encoding(read_probe(file_path, head))
+    remember_encoding(file_path, encoding)
+    return encoding
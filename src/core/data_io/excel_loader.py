@@ -0,0 +1,74 @@
+# src/core/data_io/excel_loader.py
+# Excel加载：列出工作表（含行列数），按第一行判断表头，读取选中的工作表；
+# 多个工作表在进程池中并行读取，每读完一个即交付。
+
+import os
+from concurrent.futures import as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional, List, Dict, Callable, Any
+import pandas as pd
+from src.utils import excel_reader
+from src.utils.parallel import get_process_pool
+from .sniffer import is_numeric_row
+
+def list_sheets(file_path: str) -> List[Dict[str, Any]]:
+    """列出工作表，并按第一行判断各表是否有表头"""
+    sheets = excel_reader.list_sheets(file_path)
+    for sheet in sheets:
+        sheet["has_header"] = not is_numeric_row(sheet["first_row"])
+    return sheets
+
+def read_sheets(file_path: str, sheets: List[Dict[str, Any]],
+                on_sheet: Callable,
+                check_cancelled: Optional[Callable] = None,
+                progress: Optional[Callable] = None):
+    """
+    读取选中的工作表，每读完一个调用 on_sheet(工作表信息, DataFrame)
+
+    只有一个工作表或只有一个CPU时在当前线程中逐行读取并汇报行进度；
+    否则各工作表在进程池中并行读取（openpyxl 为纯Python解析，线程无法并行），按完成顺序交付
+    """
+    if len(sheets) == 1 or (os.cpu_count() or 1) < 2:
+        for index, sheet in enumerate(sheets):
+            def row_progress(done, total, index=index):
+                if progress and total:
+                    progress((index + min(done / total, 1.0)) / len(sheets))
+            df = excel_reader.read_sheet(file_path, sheet["name"], sheet["has_header"],
+                                         progress=row_progress, check_cancelled=check_cancelled)
+            on_sheet(sheet, df)
+        return
+
+    executor = get_process_pool()
+    futures = {
+        executor.submit(excel_reader._read_sheet_worker, file_path, sheet["name"], sheet["has_header"]): sheet
+        for sheet in sheets
+    }
+    try:
+        for done, future in enumerate(as_completed(futures), 1):
+            if check_cancelled:
+                check_cancelled()
+            try:
+                df = future.result()
+            except BrokenProcessPool:
+                # 进程池不可用时退回当前线程读取
+                sheet = futures[future]
+                df = excel_reader.read_sheet(file_path, sheet["name"], sheet["has_header"])
+            on_sheet(futures[future], df)
+            if progress:
+                progress(done / len(sheets))
+    except BaseException:
+        for future in futures:
+            future.cancel()
+        raise
+
+def read_excel(file_path: str, sheet_name: Optional[str] = None) -> pd.DataFrame:
+    """读取单个工作表（默认第一个），智能识别第一行是否为表头"""
+    sheets = list_sheets(file_path)
+    if not sheets:
+        raise ValueError("工作簿中没有工作表")
+    sheet = next((s for s in sheets if s["name"] == sheet_name), sheets[0])
+    return excel_reader.read_sheet(file_path, sheet["name"], sheet["has_header"])
+
+def load_excel(file_path: str, container, sheet_name: Optional[str] = None):
+    """加载单个工作表（默认第一个）到数据容器"""
+    container.set_dataframe(read_excel(file_path, sheet_name))
@@ -0,0 +1,283 @@
+# src/core/data_io/json_loader.py
+# JSON加载：记录数组（[{...}, ...]）和换行分隔的JSON（NDJSON）按块流式解码，逐条展开嵌套对象，
+# 每积累一批记录即转换为按列存储的numpy数组，不在内存中保留完整的Python对象树。
+# 列及其类型由开头的样本推断，之后出现的新列或不符合类型的值会扩展或提升对应的列。
+# 列式布局（{"columns": [...], "data": [...]} 或 {列名: [值...]}）整体读取。
+
+import codecs
+import io
+import json
+import os
+from itertools import chain, islice
+from typing import Optional, Callable, Iterator, Tuple, Dict, List
+import numpy as np
+import pandas as pd
+from .compression import data_extension, open_input, read_position
+
+# 每次从文件读取的字节数
+READ_BLOCK_BYTES = 1024 * 1024
+
+# 判断布局时读取的字节数
+LAYOUT_SAMPLE_BYTES = 64 * 1024
+
+# 推断列类型的样本记录数
+SCHEMA_SAMPLE_ROWS = 1000
+
+# 每批转换为列数组的记录数
+BATCH_ROWS = 50000
+
+# 按行分隔的JSON文件拓展名
+NDJSON_EXTENSIONS = (".ndjson", ".jsonl")
+
+# 嵌套对象展开后的列名分隔符
+NESTED_SEPARATOR = "."
+
+_WHITESPACE = " \t\r\n"
+
+def detect_layout(file_path: str) -> str:
+    """
+    判断JSON文件的布局
+
+    返回 "records"（记录数组）、"ndjson"（每行一个JSON值）或 "object"（单个对象，按列式布局读取）
+    """
+    if data_extension(file_path) in NDJSON_EXTENSIONS:
+        return "ndjson"
+    with open_input(file_path, threaded=False) as f:
+        sample = f.read(LAYOUT_SAMPLE_BYTES)
+    text = codecs.getincrementaldecoder("utf-8-sig")(errors="replace").decode(sample).lstrip(_WHITESPACE)
+    if text.startswith("["):
+        return "records"
+    if text.startswith("{"):
+        # 第一个对象之后还有内容（下一个对象）时为NDJSON
+        try:
+            _, end = json.JSONDecoder().raw_decode(text)
+        except json.JSONDecodeError:
+            return "object"
+        return "ndjson" if text[end:].strip(_WHITESPACE) else "object"
+    raise ValueError("不支持的json格式")
+
+def _iter_text(file_path: str) -> Iterator[Tuple[str, int]]:
+    """按块读取并解码文件，返回 (文本块, 已读取的文件字节数)"""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    with open_input(file_path) as f:
+        while True:
+            block = f.read(READ_BLOCK_BYTES)
+            text = decoder.decode(block, final=not block)
+            if text:
+                yield text, read_position(f)
+            if not block:
+                return
+
+def iter_array_records(file_path: str) -> Iterator[Tuple[object, int]]:
+    """流式解码顶层数组中的元素，返回 (元素, 已读取字节数)"""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    started = False
+    read_bytes = 0
+    for text, read_bytes in _iter_text(file_path):
+        buffer = buffer[position:] + text
+        position = 0
+        while True:
+            # 跳过空白和元素间的逗号
+            while position < len(buffer) and buffer[position] in _WHITESPACE + ",":
+                position += 1
+            if position >= len(buffer):
+                break
+            if not started:
+                if buffer[position] != "[":
+                    raise ValueError("不支持的json格式")
+                started = True
+                position += 1
+                continue
+            if buffer[position] == "]":
+                return
+            try:
+                value, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                # 元素跨越了块边界，读取下一块后重试
+                break
+            if not isinstance(value, (dict, list, str)) and (end == len(buffer) or buffer[end] not in _WHITESPACE + ",]"):
+                # 数字或字面量之后还不是分隔符时可能在块边界处被截断（如 "1." 与 "25"），读取下一块后重试
+                break
+            yield value, read_bytes
+            position = end
+    # 文件结束仍有未解码的内容：重新解码以给出具体错误
+    rest = buffer[position:].strip(_WHITESPACE + ",")
+    if rest and rest != "]":
+        decoder.raw_decode(rest)
+    raise ValueError("JSON数组不完整")
+
+def iter_ndjson_records(file_path: str) -> Iterator[Tuple[object, int]]:
+    """逐行解码NDJSON，返回 (记录, 已读取的文件字节数)"""
+    with open_input(file_path) as f:
+        for line_number, line in enumerate(f, 1):
+            if line_number == 1:
+                line = line.lstrip(codecs.BOM_UTF8)
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line), read_position(f)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"第 {line_number} 行不是合法的JSON: {e}") from e
+
+def flatten_record(record, prefix: str = "", out: Optional[dict] = None) -> dict:
+    """展开嵌套对象为点号分隔的列名；数组和空对象保存为JSON文本"""
+    if out is None:
+        out = {}
+    if type(record) is not dict:
+        # 数组元素按位置成列，标量成为单列
+        values = record if type(record) is list else [record]
+        record = {f"列{i+1}": value for i, value in enumerate(values)}
+    for key, value in record.items():
+        value_type = type(value)
+        if value_type is dict and value:
+            flatten_record(value, prefix + key + NESTED_SEPARATOR, out)
+        elif value_type is dict or value_type is list:
+            out[prefix + key] = json.dumps(value, ensure_ascii=False)
+        else:
+            out[prefix + key] = value
+    return out
+
+# JSON解码得到的Python类型 -> 列类型（None 表示缺失值）
+_TYPE_DTYPES = {type(None): None, bool: "bool", int: "int64", float: "float64"}
+
+def _value_dtype(value) -> Optional[str]:
+    return _TYPE_DTYPES.get(type(value), "object")
+
+def _merge_dtype(current: Optional[str], new: Optional[str]) -> Optional[str]:
+    """两种类型的共同类型：整数与浮点合并为浮点，其余不同类型合并为对象"""
+    if current is None:
+        return new
+    if new is None or new == current:
+        return current
+    if {current, new} == {"int64", "float64"}:
+        return "float64"
+    return "object"
+
+def infer_schema(records: List[dict]) -> Dict[str, str]:
+    """由样本记录推断 {列名: 类型}，列按首次出现的顺序排列，样本中全为空的列按 float64 处理"""
+    schema: Dict[str, Optional[str]] = {}
+    for record in records:
+        for name, value in record.items():
+            schema[name] = _merge_dtype(schema.get(name), _value_dtype(value))
+    return {name: dtype or "float64" for name, dtype in schema.items()}
+
+# 含缺失值时整数列提升为浮点，布尔列提升为对象
+_MISSING_DTYPES = {"int64": "float64", "bool": "object"}
+
+class _ColumnBuilder:
+    """按批次积累一列的numpy数组，遇到不符合的值时提升类型"""
+    def __init__(self, dtype: str, leading_rows: int = 0):
+        self.dtype = dtype
+        self.parts: List[np.ndarray] = []
+        if leading_rows:
+            # 整数和布尔无法表示缺失值，提升为浮点或对象
+            self.dtype = _MISSING_DTYPES.get(dtype, dtype)
+            self.parts.append(self._missing(leading_rows))
+
+    def _missing(self, length: int) -> np.ndarray:
+        if self.dtype == "float64":
+            return np.full(length, np.nan)
+        return np.full(length, None, dtype=object)
+
+    def _promote(self, dtype: str):
+        if dtype == self.dtype:
+            return
+        self.dtype = dtype
+        self.parts = [part.astype(dtype) for part in self.parts]
+
+    def append(self, values: list):
+        if self.dtype in ("int64", "float64", "bool"):
+            kinds = {_TYPE_DTYPES.get(value_type, "object") for value_type in set(map(type, values))}
+            dtype = self.dtype
+            for kind in kinds:
+                dtype = _merge_dtype(dtype, kind)
+            if None in kinds:
+                dtype = _MISSING_DTYPES.get(dtype, dtype)
+            self._promote(dtype)
+        if self.dtype != "object":
+            try:
+                self.parts.append(np.array(values, dtype=self.dtype))
+                return
+            except OverflowError:
+                # 超出int64范围的整数
+                self._promote("object")
+        array = np.empty(len(values), dtype=object)
+        array[:] = values
+        self.parts.append(array)
+
+    def finish(self) -> np.ndarray:
+        if not self.parts:
+            return np.array([], dtype=self.dtype)
+        return self.parts[0] if len(self.parts) == 1 else np.concatenate(self.parts)
+
+def build_frame(records: Iterator[dict], schema: Dict[str, str],
+                check_cancelled: Optional[Callable] = None) -> pd.DataFrame:
+    """将展开后的记录按批次写入列数组"""
+    columns = {name: _ColumnBuilder(dtype) for name, dtype in schema.items()}
+    row_count = 0
+    while True:
+        batch = list(islice(records, BATCH_ROWS))
+        if not batch:
+            break
+        if check_cancelled:
+            check_cancelled()
+        for record in batch:
+            if record.keys() <= columns.keys():
+                continue
+            for name, value in record.items():
+                if name not in columns:
+                    # 样本之后出现的新列，之前的行补缺失值
+                    columns[name] = _ColumnBuilder(_value_dtype(value) or "float64", row_count)
+        for name, builder in columns.items():
+            builder.append([record.get(name) for record in batch])
+        row_count += len(batch)
+    return pd.DataFrame({name: builder.finish() for name, builder in columns.items()}, columns=list(columns))
+
+def read_object(file_path: str) -> pd.DataFrame:
+    """读取列式布局的JSON对象"""
+    with io.TextIOWrapper(open_input(file_path), encoding="utf-8-sig") as f:
+        data = json.load(f)
+    if isinstance(data, dict) and "data" in data and "columns" in data:
+        # 本程序保存的格式：列名 + 按行排列的数据
+        return pd.DataFrame(data.get("data", []), columns=[str(column) for column in data.get("columns", [])])
+    if isinstance(data, dict) and data and all(isinstance(values, list) for values in data.values()):
+        # {列名: [值...]}
+        return pd.DataFrame({str(name): pd.Series(values) for name, values in data.items()})
+    if isinstance(data, dict):
+        # 单条记录
+        return build_frame(iter([flatten_record(data)]), infer_schema([flatten_record(data)]))
+    raise ValueError("不支持的json格式")
+
+def read_json(file_path: str, progress: Optional[Callable] = None,
+              check_cancelled: Optional[Callable] = None) -> pd.DataFrame:
+    """
+    读取JSON文件为DataFrame
+
+    progress(已读取字节数, 总字节数) 用于汇报进度，check_cancelled() 用于协作式取消
+    """
+    layout = detect_layout(file_path)
+    if layout == "object":
+        return read_object(file_path)
+
+    total_bytes = os.path.getsize(file_path)
+    source = iter_array_records(file_path) if layout == "records" else iter_ndjson_records(file_path)
+
+    def flattened():
+        reported = 0
+        for record, read_bytes in source:
+            if progress and read_bytes != reported:
+                reported = read_bytes
+                progress(read_bytes, total_bytes)
+            yield flatten_record(record)
+
+    records = flattened()
+    sample = list(islice(records, SCHEMA_SAMPLE_ROWS))
+    schema = infer_schema(sample)
+    return build_frame(chain(sample, records), schema, check_cancelled)
+
+def load_json(file_path: str, container, progress: Optional[Callable] = None,
+              check_cancelled: Optional[Callable] = None):
+    """加载JSON文件到数据容器"""
+    container.set_dataframe(read_json(file_path, progress, check_cancelled))
@@ -0,0 +1,131 @@
+# src/core/data_io/parse_cache.py
+# 导入缓存：解析后的数据表以未压缩的Arrow IPC文件保存在 ~/.vplotter/cache 中，
+# 以 (文件路径, 大小, 修改时间, 解析选项) 为键，文件变化后自然失效。
+# 再次打开同一文件时以内存映射方式读取缓存，数值列无需复制即可转换为DataFrame。
+# 缓存总大小超过上限时按最近使用时间淘汰。依赖 pyarrow（可选），未安装时不使用缓存。
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Optional, Dict, Any
+import pandas as pd
+from . import columnar_io
+from .table_writer import atomic_output
+
+# 缓存格式版本，格式变化时使旧缓存失效
+CACHE_VERSION = 1
+
+CACHE_EXTENSION = ".arrow"
+
+def cache_root() -> Path:
+    return Path.home() / ".vplotter" / "cache"
+
+def cache_available() -> bool:
+    return columnar_io.columnar_available()
+
+def cache_path(file_path: str, size: int, mtime: float, options: Dict[str, Any]) -> Path:
+    """缓存文件的路径，由文件路径、大小、修改时间和解析选项决定"""
+    key = json.dumps(
+        [CACHE_VERSION, os.path.abspath(file_path), size, mtime, options],
+        ensure_ascii=False, sort_keys=True, default=str
+    )
+    return cache_root() / (hashlib.sha1(key.encode("utf-8")).hexdigest() + CACHE_EXTENSION)
+
+def current_path(file_path: str, options: Dict[str, Any]) -> Path:
+    """按文件当前的大小和修改时间计算缓存路径"""
+    stat = os.stat(file_path)
+    return cache_path(file_path, stat.st_size, stat.st_mtime, options)
+
+def lookup(file_path: str, options: Dict[str, Any]) -> Optional[Path]:
+    """文件当前版本的缓存存在时返回其路径"""
+    if not cache_available():
+        return None
+    try:
+        path = current_path(file_path, options)
+    except OSError:
+        return None
+    return path if path.exists() else None
+
+# 缓存文件的Arrow元数据中记录来源读取选项（实际使用的解析引擎、编码等）的键
+OPTIONS_METADATA_KEY = b"vplotter.read_options"
+
+def read(path: Path) -> pd.DataFrame:
+    """以内存映射方式读取缓存，并更新其最近使用时间"""
+    table = columnar_io.feather.read_table(str(path), memory_map=True)
+    os.utime(path)
+    return columnar_io.table_to_frame(table)
+
+def read_options(path: Path) -> Dict[str, Any]:
+    """缓存写入时记录的来源读取选项，只读取文件的元数据"""
+    with columnar_io.pa.memory_map(str(path)) as source:
+        metadata = columnar_io.pa.ipc.open_file(source).schema.metadata or {}
+    return json.loads(metadata.get(OPTIONS_METADATA_KEY, b"{}"))
+
+def store(file_path: str, size: int, mtime: float, options: Dict[str, Any],
+          df: pd.DataFrame, limit_bytes: int, origin_options: Optional[Dict[str, Any]] = None) -> bool:
+    """
+    写入缓存（size、mtime 为解析时文件的大小和修改时间），之后按上限淘汰最久未使用的缓存
+
+    origin_options 为解析时实际使用的读取选项，随缓存保存，命中缓存时记录为来源文件的读取选项。
+    无法以Arrow格式保存的数据（如混合类型的列）不缓存，返回 False
+    """
+    if not cache_available():
+        return False
+    try:
+        table = columnar_io.pa.Table.from_pandas(df, preserve_index=False)
+    except (columnar_io.pa.ArrowInvalid, columnar_io.pa.ArrowTypeError, columnar_io.pa.ArrowNotImplementedError):
+        return False
+    if table.nbytes > limit_bytes:
+        return False
+    metadata = dict(table.schema.metadata or {})
+    metadata[OPTIONS_METADATA_KEY] = json.dumps(origin_options or {}, ensure_ascii=False).encode("utf-8")
+    table = table.replace_schema_metadata(metadata)
+    path = cache_path(file_path, size, mtime, options)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with atomic_output(str(path)) as temp_path:
+        columnar_io.feather.write_feather(table, temp_path, compression="uncompressed")
+    evict(limit_bytes, keep=path)
+    return True
+
+def _entries():
+    root = cache_root()
+    if not root.exists():
+        return []
+    entries = []
+    for path in root.glob("*" + CACHE_EXTENSION):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+    return entries
+
+def evict(limit_bytes: int, keep: Optional[Path] = None):
+    """缓存总大小超过上限时，从最久未使用的开始删除"""
+    entries = sorted(_entries(), key=lambda entry: entry[0])
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in entries:
+        if total <= limit_bytes:
+            break
+        if path == keep:
+            continue
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+
+def cache_size() -> int:
+    return sum(size for _, size, _ in _entries())
+
+def clear() -> int:
+    """删除全部缓存，返回释放的字节数"""
+    freed = 0
+    for _, size, path in _entries():
+        try:
+            os.remove(path)
+            freed += size
+        except OSError:
+            pass
+    return freed
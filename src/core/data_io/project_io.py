@@ -0,0 +1,162 @@
+# src/core/data_io/project_io.py
+# 项目文件（.vplot）：一个zip包，包含JSON清单（各数据表的名称、来源、元数据、单位和图表选项）
+# 和每个数据表的列式数据块。打开项目时只读取清单，数据块在数据表首次显示时才读取；
+# 重新保存时，尚未读取的数据块直接从原项目复制，不经过解码。
+
+import io
+import json
+import shutil
+import zipfile
+from typing import Optional, List, Dict, Any, Callable
+import numpy as np
+import pandas as pd
+from src.core.data_container import DataContainer
+from . import columnar_io
+from .table_writer import atomic_output
+
+PROJECT_EXTENSION = ".vplot"
+MANIFEST_NAME = "manifest.json"
+FORMAT_VERSION = 1
+
+# 复制数据块时的缓冲区大小
+COPY_BUFFER_BYTES = 4 * 1024 * 1024
+
+class ProjectBlobLoader:
+    """延迟读取项目文件中的一个数据块"""
+    def __init__(self, project_path: str, entry: Dict[str, Any]):
+        self.project_path = project_path
+        self.entry = entry
+
+    def __call__(self) -> pd.DataFrame:
+        with zipfile.ZipFile(self.project_path) as archive:
+            return read_blob(archive, self.entry["blob"], self.entry.get("headers"))
+
+    def copy_to(self, archive: zipfile.ZipFile):
+        """将数据块不经解码复制到新的项目包中"""
+        blob = self.entry["blob"]
+        with zipfile.ZipFile(self.project_path) as source:
+            for name in blob.get("members", [blob["path"]]):
+                info = source.getinfo(name)
+                with source.open(info) as src, archive.open(info, "w", force_zip64=True) as dst:
+                    shutil.copyfileobj(src, dst, COPY_BUFFER_BYTES)
+
+# ---------------- 数据块 ----------------
+
+def write_blob(archive: zipfile.ZipFile, uuid: str, df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    写入一个数据表的数据块，返回其描述
+
+    有 pyarrow 时写为 Parquet（保留列类型，本身已压缩）；否则每列一个成员：
+    numpy原生类型的列为 .npy，其余列为JSON数组
+    """
+    if columnar_io.columnar_available():
+        path = f"data/{uuid}.parquet"
+        # Parquet 已压缩，zip中不再压缩；直接流式写入包内，不在内存中缓存整个数据块
+        info = zipfile.ZipInfo(path)
+        info.compress_type = zipfile.ZIP_STORED
+        with archive.open(info, "w", force_zip64=True) as stream:
+            columnar_io.write_parquet_stream(stream, df)
+        return {"format": "parquet", "path": path}
+
+    path = f"data/{uuid}"
+    members = []
+    for i in range(df.shape[1]):
+        values = df.iloc[:, i]
+        if isinstance(values.dtype, np.dtype) and values.dtype.kind in "biufcmM":
+            member = f"{path}/{i}.npy"
+            buffer = io.BytesIO()
+            np.save(buffer, values.to_numpy(), allow_pickle=False)
+            archive.writestr(member, buffer.getvalue())
+        else:
+            member = f"{path}/{i}.json"
+            data = values.astype(object).where(values.notna(), None).tolist()
+            archive.writestr(member, json.dumps(data, ensure_ascii=False, default=str))
+        members.append(member)
+    return {"format": "columns", "path": path, "members": members}
+
+def write_store_blob(archive: zipfile.ZipFile, uuid: str, container: DataContainer) -> Dict[str, Any]:
+    """将超出内存的数据表按块写为Parquet数据块（需要 pyarrow）"""
+    if not columnar_io.columnar_available():
+        raise ValueError(f"保存超出内存的数据表 {container.name} 需要安装pyarrow")
+    path = f"data/{uuid}.parquet"
+    info = zipfile.ZipInfo(path)
+    info.compress_type = zipfile.ZIP_STORED
+    with archive.open(info, "w", force_zip64=True) as stream:
+        columnar_io.write_parquet_chunks(stream, container.iter_chunks())
+    return {"format": "parquet", "path": path}
+
+def read_blob(archive: zipfile.ZipFile, blob: Dict[str, Any], headers: Optional[List[str]] = None) -> pd.DataFrame:
+    """读取数据块，headers 为按列存储的数据块的列名"""
+    if blob["format"] == "parquet":
+        # 未压缩的zip成员支持随机访问，Parquet 可以直接从中读取
+        with archive.open(blob["path"]) as stream:
+            return columnar_io.read_parquet_stream(stream)
+    if blob["format"] == "columns":
+        columns = []
+        for member in blob["members"]:
+            data = archive.read(member)
+            if member.endswith(".npy"):
+                columns.append(np.load(io.BytesIO(data), allow_pickle=False))
+            else:
+                values = json.loads(data)
+                array = np.empty(len(values), dtype=object)
+                array[:] = values
+                columns.append(array)
+        headers = headers or [f"列{i+1}" for i in range(len(columns))]
+        return pd.DataFrame(dict(zip(headers, columns)), columns=headers)
+    raise ValueError(f"不支持的数据块格式: {blob['format']}")
+
+# ---------------- 清单 ----------------
+
+def read_manifest(project_path: str) -> Dict[str, Any]:
+    with zipfile.ZipFile(project_path) as archive:
+        manifest = json.loads(archive.read(MANIFEST_NAME))
+    if manifest.get("format_version", 0) > FORMAT_VERSION:
+        raise ValueError("项目文件由更新版本的程序保存，无法打开")
+    return manifest
+
+def open_project(project_path: str) -> List[DataContainer]:
+    """读取项目清单，返回数据尚未读取的数据容器（数据块由 lazy_loader 延迟读取）"""
+    containers = []
+    for entry in read_manifest(project_path)["containers"]:
+        container = DataContainer()
+        container.from_dict(entry)
+        container.row_count = entry.get("rows", 0)
+        container.column_count = entry.get("columns", 0)
+        container.lazy_loader = ProjectBlobLoader(project_path, entry)
+        containers.append(container)
+    return containers
+
+def save_project(project_path: str, containers: List[DataContainer],
+                 progress: Optional[Callable] = None,
+                 check_cancelled: Optional[Callable] = None):
+    """
+    保存项目：先写入同目录下的临时文件，完成后替换目标文件
+
+    containers 应为数据快照；尚未读取的数据块从原项目文件复制
+    """
+    entries = []
+    with atomic_output(project_path) as temp_path:
+        with zipfile.ZipFile(temp_path, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=1) as archive:
+            for done, container in enumerate(containers, 1):
+                if check_cancelled:
+                    check_cancelled()
+                entry = container.to_dict(include_data=False)
+                if isinstance(container.lazy_loader, ProjectBlobLoader):
+                    container.lazy_loader.copy_to(archive)
+                    # 列名和行列数沿用原清单
+                    for key in ("headers", "rows", "columns", "blob"):
+                        entry[key] = container.lazy_loader.entry.get(key)
+                elif container.is_out_of_core():
+                    entry["blob"] = write_store_blob(archive, container.uuid, container)
+                else:
+                    df = container.dataframe if container.dataframe is not None else pd.DataFrame()
+                    entry["blob"] = write_blob(archive, container.uuid, df)
+                entries.append(entry)
+                if progress:
+                    progress(done, len(containers))
+            manifest = {
+                "format_version": FORMAT_VERSION,
+                "containers": entries
+            }
+            archive.writestr(MANIFEST_NAME, json.dumps(manifest, ensure_ascii=False, indent=2, default=str))
@@ -0,0 +1,132 @@
+# src/core/data_io/sniffer.py
+# 文件格式嗅探：只读取文件开头的一段有限字节样本，推断编码、分隔符、表头和列类型，
+# 之后只需对文件完整解析一次。
+
+import csv
+import io
+from typing import Optional, List, Dict
+import pandas as pd
+from src.utils.parallel_csv import record_ends
+from .encoding import detect_file_encoding
+from .compression import open_input
+from .csv_schema import CsvSchema, schema_for
+
+# 样本大小：足以覆盖表头和若干数据行，又不会在大文件上产生明显开销
+SAMPLE_BYTES = 64 * 1024
+
+# 候选分隔符
+CANDIDATE_DELIMITERS = ",;\t|"
+
+class CsvFormat:
+    """嗅探得到的CSV格式信息"""
+    def __init__(self):
+        self.encoding = "utf-8"
+        self.delimiter = ","
+        self.has_header = True
+        self.headers: List[str] = []
+        self.column_count = 0
+        self.dtypes: Dict[int, str] = {}   # 列位置 -> 样本中推断出的类型
+        self.schema: Optional[CsvSchema] = None  # 导入结构（指定的列类型等），None 表示全部由解析器推断
+        self.engine: Optional[str] = None  # 实际使用的解析方式（pyarrow、pandas、parallel、chunks），解析后设置
+        self.size: Optional[int] = None    # 解析的字节数（解析前文件中完整记录的长度），None 表示整个文件
+        self.mtime: Optional[float] = None # 解析前文件的修改时间
+
+    def __repr__(self):
+        return f"CsvFormat(encoding={self.encoding}, delimiter={self.delimiter!r}, has_header={self.has_header})"
+
+def read_sample(file_path: str, size: int = SAMPLE_BYTES) -> bytes:
+    """
+    读取文件开头的字节样本（压缩文件为解压后的开头），截断到最后一个完整记录
+
+    引号内的字段可以包含换行，截断位置取最后一个不在引号内的换行，不会把多行字段截成半个
+    """
+    with open_input(file_path, threaded=False) as f:
+        sample = f.read(size)
+        at_eof = not f.read(1)
+    if not at_eof:
+        ends = record_ends(sample)
+        if len(ends) and ends[-1] > 0:
+            sample = sample[:ends[-1] + 1]
+    return sample
+
+def detect_delimiter(text: str) -> str:
+    """推断分隔符，无法判断时使用逗号"""
+    try:
+        return csv.Sniffer().sniff(text, delimiters=CANDIDATE_DELIMITERS).delimiter
+    except csv.Error:
+        return ","
+
+def sniff_csv(file_path: str, sample_size: int = SAMPLE_BYTES) -> CsvFormat:
+    """嗅探CSV文件的编码、分隔符、表头和列类型，文件名匹配已保存的导入结构时附加该结构"""
+    fmt = CsvFormat()
+    fmt.schema = schema_for(file_path)
+    sample = read_sample(file_path, sample_size)
+    fmt.encoding = detect_file_encoding(file_path, sample)
+    text = sample.decode(fmt.encoding, errors="replace")
+    if not text.strip():
+        return fmt
+    
+    fmt.delimiter = detect_delimiter(text)
+    first_row = next(csv.reader(io.StringIO(text), delimiter=fmt.delimiter), [])
+    fmt.has_header = not is_numeric_row(first_row)
+    
+    # 用样本推断列类型，供完整解析时作为类型提示
+    header = 0 if fmt.has_header else None
+    try:
+        sample_df = pd.read_csv(io.StringIO(text), sep=fmt.delimiter, header=header)
+        fmt.dtypes = {i: str(dtype) for i, dtype in enumerate(sample_df.dtypes)}
+    except pd.errors.ParserError:
+        # 样本无法解析（如单个记录超出样本大小、各行字段数不一致）时只读取第一个记录得到列名，
+        # 不提供类型提示，由完整解析自行推断
+        sample_df = pd.read_csv(io.StringIO(first_record(text, fmt.delimiter)), sep=fmt.delimiter, header=header)
+    fmt.headers = [str(column) for column in sample_df.columns] if fmt.has_header else []
+    fmt.column_count = sample_df.shape[1]
+    return fmt
+
+def first_record(text: str, delimiter: str) -> str:
+    """文本中第一个记录（可能跨多行）的内容"""
+    buffer = io.StringIO(text)
+    next(csv.reader(buffer, delimiter=delimiter), None)
+    return text[:buffer.tell()]
+
+def default_headers(column_count: int) -> List[str]:
+    """无表头文件的默认列名"""
+    return [f"列{i+1}" for i in range(column_count)]
+
+def column_names(fmt: CsvFormat) -> List[str]:
+    """解析后的列名：有表头时为表头，否则为默认列名"""
+    return fmt.headers if fmt.has_header else default_headers(fmt.column_count)
+
+def is_numeric_row(row):
+    """
+    判断一行数据是否主要为数值类型
+    
+    参数:
+        row: 一行数据，可以是列表、Series或其他可迭代对象
+        
+    返回:
+        bool: 如果该行 >50% 的元素可以转换为数值，则返回True
+    """
+    numeric_count = 0
+    total_count = 0
+    
+    for item in row:
+        # 跳过空值
+        if pd.isna(item) or item == "":
+            continue
+            
+        total_count += 1
+        
+        # 尝试转换为数值
+        try:
+            float(item)
+            numeric_count += 1
+        except (ValueError, TypeError):
+            pass
+    
+    # 如果没有有效数据，默认返回False
+    if total_count == 0:
+        return False
+    
+    # 如果数值比例超过50%，则认为这是数值行
+    return (numeric_count / total_count) > 0.5
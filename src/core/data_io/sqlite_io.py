@@ -0,0 +1,194 @@
+# src/core/data_io/sqlite_io.py
+# SQLite数据源：列出数据库中的表，执行SQL查询并按批次 fetchmany 读取结果，筛选和聚合在SQLite中完成，
+# 只有查询结果进入内存。读取时以只读方式打开数据库，查询不会修改数据。
+# 写回时在一个事务中按块 executemany 插入，出错或取消时回滚，数据库保持原样。
+
+import sqlite3
+from pathlib import Path
+from typing import Optional, Callable, Iterator, List, Dict, Any
+import pandas as pd
+
+SQLITE_EXTENSIONS = (".db", ".sqlite", ".sqlite3")
+
+# 每批读取/写入的行数
+BATCH_ROWS = 100000
+
+# 执行查询时每执行多少条虚拟机指令检查一次取消
+CANCEL_CHECK_STEPS = 100000
+
+# 写入时 DataFrame 列类型（dtype.kind）对应的SQLite列类型，其余为 TEXT
+_COLUMN_TYPES = {"i": "INTEGER", "u": "INTEGER", "b": "INTEGER", "f": "REAL"}
+
+def quote_identifier(name: str) -> str:
+    """将表名、列名转义为SQL标识符"""
+    return '"' + str(name).replace('"', '""') + '"'
+
+def table_query(table_name: str) -> str:
+    """读取整个表的查询"""
+    return f"SELECT * FROM {quote_identifier(table_name)}"
+
+def connect_readonly(file_path: str) -> sqlite3.Connection:
+    """以只读方式打开数据库，文件不存在时不会创建"""
+    return sqlite3.connect(Path(file_path).resolve().as_uri() + "?mode=ro", uri=True)
+
+def list_tables(file_path: str) -> List[Dict[str, Any]]:
+    """列出数据库中的表和视图：[{"name", "type", "columns": [(列名, 声明的类型)]}]"""
+    connection = connect_readonly(file_path)
+    try:
+        tables = []
+        rows = connection.execute(
+            "SELECT name, type FROM sqlite_master WHERE type IN ('table', 'view') "
+            "AND name NOT LIKE 'sqlite_%' ORDER BY type, name"
+        ).fetchall()
+        for name, table_type in rows:
+            columns = connection.execute(f"PRAGMA table_info({quote_identifier(name)})").fetchall()
+            tables.append({"name": name, "type": table_type, "columns": [(column[1], column[2]) for column in columns]})
+        return tables
+    finally:
+        connection.close()
+
+def table_exists(file_path: str, table_name: str) -> bool:
+    if not Path(file_path).exists():
+        return False
+    connection = connect_readonly(file_path)
+    try:
+        row = connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type IN ('table', 'view') AND name = ?", (table_name,)
+        ).fetchone()
+        return row is not None
+    finally:
+        connection.close()
+
+def _interrupt_handler(check_cancelled: Callable) -> Callable:
+    """SQLite进度回调：已取消时返回非零值，中断正在执行的语句"""
+    def handler():
+        try:
+            check_cancelled()
+        except BaseException:
+            return 1
+        return 0
+    return handler
+
+def iter_query(file_path: str, sql: str, params=(), batch_rows: int = BATCH_ROWS,
+               check_cancelled: Optional[Callable] = None) -> Iterator[pd.DataFrame]:
+    """
+    执行查询，按批次 fetchmany 结果，逐批产出 DataFrame
+
+    check_cancelled() 在批次之间检查取消，执行耗时的聚合或排序时也会定期检查并中断查询
+    """
+    connection = connect_readonly(file_path)
+    try:
+        if check_cancelled:
+            connection.set_progress_handler(_interrupt_handler(check_cancelled), CANCEL_CHECK_STEPS)
+        try:
+            cursor = connection.execute(sql, params)
+            if cursor.description is None:
+                raise ValueError("查询没有返回结果")
+            columns = [description[0] for description in cursor.description]
+            first = True
+            while True:
+                rows = cursor.fetchmany(batch_rows)
+                if not rows and not first:
+                    return
+                yield pd.DataFrame.from_records(rows, columns=columns, coerce_float=True)
+                first = False
+                if check_cancelled:
+                    check_cancelled()
+        except sqlite3.OperationalError:
+            # 被进度回调中断时抛出取消，其他错误原样抛出
+            if check_cancelled:
+                check_cancelled()
+            raise
+    finally:
+        connection.close()
+
+def read_query(file_path: str, sql: str, params=(), check_cancelled: Optional[Callable] = None) -> pd.DataFrame:
+    """执行查询，返回全部结果"""
+    frames = list(iter_query(file_path, sql, params, check_cancelled=check_cancelled))
+    return frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+
+def column_type(dtype) -> str:
+    return _COLUMN_TYPES.get(dtype.kind, "TEXT")
+
+def _rows(chunk: pd.DataFrame):
+    """将一块数据转换为可绑定的Python值的行，缺失值为 NULL，日期时间为ISO格式文本"""
+    columns = []
+    for i in range(chunk.shape[1]):
+        series = chunk.iloc[:, i]
+        if series.dtype.kind == "M":
+            series = series.dt.strftime("%Y-%m-%d %H:%M:%S.%f").str.rstrip("0").str.rstrip(".")
+        elif series.dtype.kind == "m":
+            series = series.astype(str)
+        values = series.astype(object)
+        columns.append(values.where(series.notna(), None).tolist())
+    return zip(*columns)
+
+def write_table(file_path: str, table_name: str, container, if_exists: str = "fail",
+                progress: Optional[Callable] = None, check_cancelled: Optional[Callable] = None,
+                batch_rows: int = BATCH_ROWS):
+    """
+    将数据容器（通常为快照）写入数据库中的表，数据库不存在时创建
+
+    if_exists 为表已存在时的处理："fail" 报错、"replace" 清空原有数据后写入、"append" 追加到末尾；
+    表已存在时保留其定义（列类型、约束、索引、触发器和视图的引用），按列名插入，表中缺少的列报错。
+    建表、清空、插入在同一事务中进行，出错或取消时回滚。progress(已写入行数, 总行数) 用于汇报进度
+    """
+    if if_exists not in ("fail", "replace", "append"):
+        raise ValueError(f"不支持的处理方式: {if_exists}")
+    if not table_name:
+        raise ValueError("表名不能为空")
+    if not container.is_loaded():
+        # 尚未读取的延迟数据（如项目文件中的表）先读取
+        container.set_dataframe(container.lazy_loader())
+    headers = container.get_table_headers()
+    if not headers:
+        raise ValueError("数据表没有列")
+    total_rows = container.row_count
+    table = quote_identifier(table_name)
+    column_list = ", ".join(quote_identifier(name) for name in headers)
+    insert = f"INSERT INTO {table} ({column_list}) VALUES ({', '.join('?' * len(headers))})"
+
+    # 显式控制事务：isolation_level=None 时由 BEGIN/COMMIT 决定事务范围
+    connection = sqlite3.connect(file_path, isolation_level=None)
+    try:
+        if check_cancelled:
+            connection.set_progress_handler(_interrupt_handler(check_cancelled), CANCEL_CHECK_STEPS)
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            exists = connection.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table_name,)
+            ).fetchone() is not None
+            if exists and if_exists == "fail":
+                raise ValueError(f"表 {table_name} 已存在")
+            if exists:
+                # SQLite的列名不区分大小写
+                columns = {column[1].lower() for column in connection.execute(f"PRAGMA table_info({table})")}
+                missing = [name for name in headers if name.lower() not in columns]
+                if missing:
+                    raise ValueError(f"表 {table_name} 中没有列: {', '.join(missing)}")
+                if if_exists == "replace":
+                    connection.execute(f"DELETE FROM {table}")
+            else:
+                dtypes = container.get_rows(0, 0).dtypes
+                definitions = ", ".join(
+                    f"{quote_identifier(name)} {column_type(dtypes.iloc[i])}" for i, name in enumerate(headers)
+                )
+                connection.execute(f"CREATE TABLE {table} ({definitions})")
+            written = 0
+            for chunk in container.iter_chunks(batch_rows):
+                if check_cancelled:
+                    check_cancelled()
+                connection.executemany(insert, _rows(chunk))
+                written += len(chunk)
+                if progress:
+                    progress(written, total_rows)
+            connection.execute("COMMIT")
+        except BaseException as e:
+            # 取消时进度回调会中断所有语句，回滚前先移除
+            connection.set_progress_handler(None, 0)
+            connection.execute("ROLLBACK")
+            if isinstance(e, sqlite3.OperationalError) and check_cancelled:
+                check_cancelled()
+            raise
+    finally:
+        connection.close()
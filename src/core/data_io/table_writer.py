@@ -0,0 +1,252 @@
+# src/core/data_io/table_writer.py
+# 数据表写入：先写入目标目录下的临时文件，全部写完后原子替换目标文件，
+# 写入中途出错、取消或程序崩溃都不会破坏原文件。
+# 数据按块写入，每块之后汇报进度并检查取消，可在后台线程中运行。
+# JSON按列将整块数据编码为紧凑的文本片段再逐行拼接，内存占用只与块大小有关。
+# CSV和JSON可以保存为压缩文件（如 data.csv.gz），压缩在单独的线程中与格式化同时进行。
+
+import io
+import json
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from typing import Optional, Callable, Iterator, List
+import numpy as np
+import pandas as pd
+from . import columnar_io
+from .compression import COMPRESSIBLE_EXTENSIONS, compression_of, data_extension, open_output
+
+# 每块写入的行数
+WRITE_CHUNK_ROWS = 100000
+
+# Excel工作表的最大行数（含表头）
+EXCEL_MAX_ROWS = 1048576
+
+WRITABLE_EXTENSIONS = (".csv", ".xlsx", ".json", ".ndjson", ".jsonl", ".parquet", ".feather", ".arrow")
+
+# 按行分隔的JSON（每行一条记录）
+NDJSON_EXTENSIONS = (".ndjson", ".jsonl")
+
+# JSON文件的布局：设置项 io.json_layout 的取值 -> 显示名称，均可由 json_loader 读回
+JSON_LAYOUTS = {
+    "split": "列名 + 行数组",
+    "records": "记录数组",
+    "columns": "按列",
+}
+
+_JSON_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=str)
+
+@contextmanager
+def atomic_output(file_path: str) -> Iterator[str]:
+    """
+    返回同目录下的临时文件路径，with 块正常结束后替换目标文件，出错时删除临时文件
+
+    临时文件与目标文件在同一文件系统上，os.replace 为原子操作；目标文件已存在时沿用其权限
+    """
+    directory = os.path.dirname(os.path.abspath(file_path))
+    base, extension = os.path.splitext(os.path.basename(file_path))
+    fd, temp_path = tempfile.mkstemp(prefix=f".{base}.", suffix=extension, dir=directory)
+    os.close(fd)
+    try:
+        yield temp_path
+        if os.path.exists(file_path):
+            shutil.copymode(file_path, temp_path)
+        else:
+            # mkstemp 创建的文件仅所有者可读写，新文件改为按 umask 的默认权限
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(temp_path, 0o666 & ~umask)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+def is_writable(file_path: str) -> bool:
+    """按拓展名判断能否保存，压缩文件只支持CSV和JSON"""
+    if compression_of(file_path):
+        return data_extension(file_path) in COMPRESSIBLE_EXTENSIONS
+    return data_extension(file_path) in WRITABLE_EXTENSIONS
+
+@contextmanager
+def _open_text(file_path: str, compression: Optional[str], level: Optional[int], newline: Optional[str] = None):
+    """以UTF-8文本方式打开要写入的文件，compression 不为 None 时压缩后写入"""
+    with io.TextIOWrapper(open_output(file_path, compression, level), encoding="utf-8", newline=newline) as f:
+        yield f
+
+def iter_frame_chunks(df: pd.DataFrame, chunk_rows: int = WRITE_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """按行切片（不复制数据）"""
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+def _tracked(chunks, total_rows: int, progress: Optional[Callable], check_cancelled: Optional[Callable]):
+    """逐块检查取消并汇报 progress(已写入行数, 总行数)"""
+    written = 0
+    for chunk in chunks:
+        if check_cancelled:
+            check_cancelled()
+        yield chunk
+        written += len(chunk)
+        if progress:
+            progress(written, total_rows)
+
+def _to_python(chunk: pd.DataFrame) -> pd.DataFrame:
+    """缺失值转换为 None，供Excel和JSON写入"""
+    return chunk.astype(object).where(chunk.notna(), None)
+
+def write_csv(file_path: str, chunks, compression: Optional[str] = None, level: Optional[int] = None):
+    with _open_text(file_path, compression, level, newline="") as f:
+        for i, chunk in enumerate(chunks):
+            chunk.to_csv(f, header=(i == 0), index=False)
+
+def write_excel(file_path: str, chunks, headers, total_rows: int):
+    """以只写模式逐行写入，不在内存中保留整个工作簿"""
+    from openpyxl import Workbook
+    if total_rows + 1 > EXCEL_MAX_ROWS:
+        raise ValueError(f"数据共 {total_rows} 行，超过Excel工作表的最大行数 {EXCEL_MAX_ROWS - 1}")
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(list(headers))
+    for chunk in chunks:
+        for row in _to_python(chunk).itertuples(index=False, name=None):
+            sheet.append(row)
+    workbook.save(file_path)
+
+def json_tokens(series: pd.Series, precision: Optional[int] = None) -> List[str]:
+    """
+    将一列编码为JSON文本片段列表，缺失值和无穷大为 null
+
+    precision 为浮点列保留的小数位数（None 表示不舍入，按最短的精确表示输出）
+    """
+    if series.dtype.kind == "f":
+        values = series.to_numpy()
+        if precision is not None:
+            values = np.round(values, precision)
+        tokens = list(map(repr, values.tolist()))
+        for i in np.flatnonzero(~np.isfinite(values)):
+            tokens[i] = "null"
+        return tokens
+    if series.dtype.kind in "iu" and isinstance(series.dtype, np.dtype):
+        return list(map(str, series.to_numpy().tolist()))
+    if series.dtype.kind == "b" and isinstance(series.dtype, np.dtype):
+        return ["true" if value else "false" for value in series.to_numpy().tolist()]
+    encode = _JSON_ENCODER.encode
+    return [
+        "null" if value is None or (type(value) is float and not np.isfinite(value)) else encode(value)
+        for value in _to_python(series.to_frame()).iloc[:, 0]
+    ]
+
+def _json_rows(chunk: pd.DataFrame, precision: Optional[int], keys: Optional[List[str]] = None) -> List[str]:
+    """将一块数据编码为每行一个JSON数组（keys 为 None）或对象的文本"""
+    columns = [json_tokens(chunk.iloc[:, i], precision) for i in range(chunk.shape[1])]
+    if keys is None:
+        return ["[" + ",".join(row) + "]" for row in zip(*columns)]
+    return ["{" + ",".join(key + value for key, value in zip(keys, row)) + "}" for row in zip(*columns)]
+
+def write_json(file_path: str, chunks, headers, layout: str = "split", precision: Optional[int] = None,
+               compression: Optional[str] = None, level: Optional[int] = None):
+    """
+    按行写入JSON，每条记录占一行、使用紧凑的分隔符
+
+    layout 为 "split"（{"columns": [...], "data": [[...], ...]}）、"records"（[{...}, ...]）
+    或 "ndjson"（每行一个对象，没有外层括号）
+    """
+    keys = None if layout == "split" else [_JSON_ENCODER.encode(str(name)) + ":" for name in headers]
+    if layout == "split":
+        head, tail = '{"columns":' + _JSON_ENCODER.encode([str(name) for name in headers]) + ',"data":[\n', "\n]}\n"
+    elif layout == "records":
+        head, tail = "[\n", "\n]\n"
+    else:
+        head, tail = "", "\n"
+    separator = "\n" if layout == "ndjson" else ",\n"
+    with _open_text(file_path, compression, level) as f:
+        f.write(head)
+        first = True
+        for chunk in chunks:
+            lines = _json_rows(chunk, precision, keys)
+            if lines:
+                f.write(("" if first else separator) + separator.join(lines))
+                first = False
+        if not first or layout != "ndjson":
+            f.write(tail)
+
+def write_json_columns(file_path: str, column_chunks, headers, precision: Optional[int] = None,
+                       compression: Optional[str] = None, level: Optional[int] = None):
+    """按列写入 {列名: [...], ...}；column_chunks(i) 按块返回第 i 列，每次只读取一列的一块"""
+    with _open_text(file_path, compression, level) as f:
+        f.write("{")
+        for i, name in enumerate(headers):
+            f.write(("" if i == 0 else ",") + "\n" + _JSON_ENCODER.encode(str(name)) + ":[")
+            first = True
+            for chunk in column_chunks(i):
+                tokens = json_tokens(chunk.iloc[:, 0], precision)
+                if tokens:
+                    f.write(("" if first else ",") + ",".join(tokens))
+                    first = False
+            f.write("]")
+        f.write("\n}\n")
+
+def write_table(file_path: str, container, progress: Optional[Callable] = None,
+                check_cancelled: Optional[Callable] = None,
+                json_layout: str = "split", json_precision: Optional[int] = None,
+                compression_level: Optional[int] = None):
+    """
+    按拓展名将数据容器（通常为快照）写入文件
+
+    progress(已写入行数, 总行数) 用于汇报进度，check_cancelled() 用于协作式取消；
+    json_layout、json_precision 为JSON文件的布局和浮点数保留的小数位数（.ndjson/.jsonl 总是每行一条记录）；
+    文件名带压缩拓展名时按 compression_level 压缩（None 表示使用该格式的默认级别）
+    """
+    if not is_writable(file_path):
+        raise ValueError("不支持的文件类型")
+    extension = data_extension(file_path)
+    compression = compression_of(file_path)
+    if not container.is_loaded():
+        # 尚未读取的延迟数据（如项目文件中的表）先读取
+        container.set_dataframe(container.lazy_loader())
+    headers = container.get_table_headers()
+    total_rows = container.row_count
+    if extension in NDJSON_EXTENSIONS:
+        json_layout = "ndjson"
+    if json_layout not in JSON_LAYOUTS and json_layout != "ndjson":
+        raise ValueError(f"不支持的JSON布局: {json_layout}")
+    if extension == ".json" and json_layout == "columns":
+        # 按列写入时逐列分块读取，每读完一块汇报一次进度
+        column_count = max(len(headers), 1)
+        def column_chunks(i):
+            for chunk in container.iter_chunks(WRITE_CHUNK_ROWS, columns=[i]):
+                if check_cancelled:
+                    check_cancelled()
+                yield chunk
+            if progress:
+                progress(total_rows * (i + 1) // column_count, total_rows)
+        with atomic_output(file_path) as temp_path:
+            write_json_columns(temp_path, column_chunks, headers, json_precision, compression, compression_level)
+        return
+    if container.is_out_of_core():
+        if extension == ".xlsx":
+            raise ValueError("超出内存的数据表不能保存为Excel文件")
+        chunks = container.iter_chunks()
+    else:
+        df = container.dataframe if container.dataframe is not None else pd.DataFrame(columns=headers)
+        if columnar_io.file_format(file_path):
+            # 内存中的表整体写入列式文件，列类型由完整数据推断
+            with atomic_output(file_path) as temp_path:
+                columnar_io.write_columnar(temp_path, df)
+            return
+        chunks = iter_frame_chunks(df)
+    if total_rows == 0:
+        # 空表也写入表头
+        chunks = iter([container.get_rows(0, 0)])
+    chunks = _tracked(chunks, total_rows, progress, check_cancelled)
+
+    with atomic_output(file_path) as temp_path:
+        if columnar_io.file_format(file_path):
+            columnar_io.write_columnar_chunks(temp_path, chunks)
+        elif extension == ".csv":
+            write_csv(temp_path, chunks, compression, compression_level)
+        elif extension == ".xlsx":
+            write_excel(temp_path, chunks, headers, total_rows)
+        else:
+            write_json(temp_path, chunks, headers, json_layout, json_precision, compression, compression_level)
@@ -0,0 +1,121 @@
+# src/core/file_follower.py
+# 跟踪增长中的CSV文件（如不断写入的仪器日志）：监视文件变化，只解析上次读取位置之后追加的完整行，
+# 追加到数据容器末尾并发出行追加信号，表格和图表只处理新增的行，不重新解析整个文件。
+
+import os
+from PyQt6.QtCore import QObject, QFileSystemWatcher, QTimer, pyqtSignal
+from src.core.data_container import DataContainer
+from src.core.data_io import csv_loader
+from src.core.data_io.sniffer import sniff_csv
+from src.core.job_runner import get_job_manager
+
+# 轮询间隔（毫秒）：文件被替换或位于网络驱动器时文件监视可能收不到通知，以轮询兜底
+FOLLOW_POLL_MS = 1000
+
+# 新增数据不超过该大小时直接在GUI线程中解析，更大时在后台解析
+FOLLOW_INLINE_BYTES = 1024 * 1024
+
+class FileFollower(QObject):
+    """跟踪一个数据表的来源CSV文件，将文件末尾新追加的行追加到数据表"""
+    stopped = pyqtSignal(str)  # 停止跟踪信号 - 参数: 停止原因（主动停止时为空字符串）
+
+    def __init__(self, container: DataContainer, parent=None):
+        super().__init__(parent)
+        origin = container.origin
+        if origin is None or os.path.splitext(origin["path"])[1].lower() != ".csv":
+            raise ValueError("只能跟踪从CSV文件打开的数据表")
+        if container.is_out_of_core():
+            raise ValueError("超出内存的数据表不能跟踪文件更新")
+        self.container = container
+        self.file_path = origin["path"]
+        # 从解析前记录的位置开始，解析期间及之后追加的行不会遗漏
+        self.offset = origin["size"]
+        self.fmt = sniff_csv(self.file_path)
+        if origin.get("csv"):
+            # 与读取时实际使用的编码一致
+            self.fmt.encoding = origin["csv"]["encoding"]
+        self.headers = container.get_table_headers()
+        self.job = None
+        self.pending = False
+
+        self.watcher = QFileSystemWatcher([self.file_path], self)
+        self.watcher.fileChanged.connect(self.check)
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.check)
+        self.timer.start(FOLLOW_POLL_MS)
+        # 读取之后到开始跟踪之间追加的行在事件循环空闲时读取
+        QTimer.singleShot(0, self.check)
+
+    def is_active(self) -> bool:
+        return self.timer.isActive()
+
+    def check(self):
+        """文件变长时读取新增的部分"""
+        if not self.is_active():
+            return
+        if self.job is not None:
+            # 上一次读取尚未完成，完成后再检查
+            self.pending = True
+            return
+        try:
+            size = os.path.getsize(self.file_path)
+        except OSError:
+            # 文件暂时不存在（如日志轮转过程中），稍后再检查
+            return
+        if size < self.offset:
+            self.stop("文件被截断或替换")
+            return
+        if size == self.offset:
+            return
+        # 文件被替换后监视会失效，重新添加
+        if self.file_path not in self.watcher.files():
+            self.watcher.addPath(self.file_path)
+        if size - self.offset <= FOLLOW_INLINE_BYTES:
+            try:
+                self.on_read(self.read_appended(None, self.offset))
+            except Exception as e:
+                self.stop(f"读取新增数据失败：{e}")
+            return
+        self.job = get_job_manager().submit(
+            f"跟踪 {self.container.name}",
+            self.read_appended, self.offset,
+            on_finished=self.on_read,
+            on_failed=lambda message: self.stop(f"读取新增数据失败：{message}"),
+            on_cancelled=self.on_cancelled
+        )
+
+    def read_appended(self, job, offset: int):
+        """解析 offset 之后的完整行（可在后台线程中运行）"""
+        if job is not None:
+            job.report_progress(-1, "正在读取新增数据...")
+        dtypes = self.container.dataframe.dtypes.to_dict() if self.container.dataframe is not None else None
+        return csv_loader.read_appended(self.file_path, offset, self.fmt, self.headers, dtypes)
+
+    def on_read(self, result):
+        """新增的行追加到数据表（GUI线程）"""
+        self.job = None
+        if not self.is_active():
+            return
+        dataframe, self.offset = result
+        if dataframe is not None and not dataframe.empty:
+            if self.container.get_table_headers() != self.headers:
+                self.stop("数据表的列已改变")
+                return
+            self.container.append_rows(dataframe)
+        if self.pending:
+            self.pending = False
+            self.check()
+
+    def on_cancelled(self):
+        self.job = None
+
+    def stop(self, reason: str = ""):
+        """停止跟踪，reason 为空表示主动停止"""
+        if not self.is_active():
+            return
+        self.timer.stop()
+        if self.watcher.files():
+            self.watcher.removePaths(self.watcher.files())
+        if self.job is not None:
+            get_job_manager().cancel(self.job.job_id)
+        self.stopped.emit(reason)
@@ -1,5 +1,5 @@
 # src/core/font_manager.py
-from PyQt6.QtWidgets import QMessageBox
+from PyQt6.QtWidgets import QApplication, QMessageBox
 import matplotlib.pyplot as plt
 from matplotlib import font_manager as fm
 import os
@@ -66,7 +66,11 @@ def setup_chinese_font(settings=None):
             return font_name
     
     # 如果没有找到中文字体，尝试使用字体文件
-    QMessageBox.warning(None, "警告", "未找到系统中文字体，尝试使用内置字体文件...")
+    # 模块导入时可能还没有创建QApplication（如命令行基准脚本），此时只打印提示
+    if QApplication.instance() is not None:
+        QMessageBox.warning(None, "警告", "未找到系统中文字体，尝试使用内置字体文件...")
+    else:
+        print("警告: 未找到系统中文字体，尝试使用内置字体文件...")
     return setup_chinese_font_with_file()
 
 def setup_chinese_font_with_file():
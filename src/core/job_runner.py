@@ -0,0 +1,158 @@
+# src/core/job_runner.py
+# 后台任务管理：在线程池中执行耗时的数据操作，通过信号汇报进度，
+# 支持协作式取消，结果在GUI线程中回调写回。
+
+import os
+import threading
+import uuid
+from typing import Callable, Dict, Optional
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from src.core.signals import job_signals
+
+class JobCancelled(Exception):
+    """任务被取消时在工作线程中抛出"""
+    pass
+
+class _JobEmitter(QObject):
+    """单个任务的内部信号，在GUI线程创建，由工作线程发射"""
+    progress = pyqtSignal(int, str)   # 进度、说明
+    partial = pyqtSignal(object)      # 中间结果（如流式导入的数据块）
+    finished = pyqtSignal(object)     # 结果
+    failed = pyqtSignal(str)          # 错误信息
+    cancelled = pyqtSignal()
+
+class Job(QRunnable):
+    """后台任务，任务函数以 fn(job, *args, **kwargs) 的形式在工作线程中运行"""
+    def __init__(self, name: str, fn: Callable, *args, **kwargs):
+        super().__init__()
+        self.setAutoDelete(False)  # 生命周期由 JobManager 管理
+        self.job_id = uuid.uuid4().hex
+        self.name = name
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.emitter = _JobEmitter()
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        """请求取消任务，任务函数需在合适的位置调用 check_cancelled"""
+        self._cancel_event.set()
+
+    def is_cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def check_cancelled(self):
+        """检查取消请求，已取消则抛出 JobCancelled"""
+        if self._cancel_event.is_set():
+            raise JobCancelled()
+
+    def report_progress(self, percent: int, message: str = ""):
+        """汇报进度，percent 为 -1 表示进度未知"""
+        self.emitter.progress.emit(int(percent), message)
+
+    def emit_partial(self, result):
+        """在任务完成前向GUI线程交付一部分结果，按发出顺序送达"""
+        self.emitter.partial.emit(result)
+
+    def run(self):
+        try:
+            result = self.fn(self, *self.args, **self.kwargs)
+        except JobCancelled:
+            self.emitter.cancelled.emit()
+        except Exception as e:
+            self.emitter.failed.emit(str(e))
+        else:
+            if self.is_cancelled():
+                self.emitter.cancelled.emit()
+            else:
+                self.emitter.finished.emit(result)
+
+class JobManager(QObject):
+    """任务管理器，负责提交、跟踪和取消后台任务"""
+    def __init__(self, max_workers: Optional[int] = None):
+        super().__init__()
+        self.thread_pool = QThreadPool()
+        self.thread_pool.setMaxThreadCount(max_workers or max(2, (os.cpu_count() or 2)))
+        self.jobs: Dict[str, Job] = {}
+
+    def submit(self, name: str, fn: Callable, *args,
+               on_finished: Optional[Callable] = None,
+               on_failed: Optional[Callable] = None,
+               on_cancelled: Optional[Callable] = None,
+               on_progress: Optional[Callable] = None,
+               on_partial: Optional[Callable] = None,
+               **kwargs) -> Job:
+        """
+        提交后台任务
+        
+        回调均在GUI线程中执行：
+            on_finished(result)、on_failed(message)、on_cancelled()、on_progress(percent, message)、
+            on_partial(result)（任务中调用 job.emit_partial 时触发，总在 on_finished 之前）
+        """
+        job = Job(name, fn, *args, **kwargs)
+        job_id = job.job_id
+        
+        def finished(result):
+            self._release(job_id)
+            if on_finished:
+                on_finished(result)
+        
+        def failed(message):
+            self._release(job_id)
+            if on_failed:
+                on_failed(message)
+        
+        def cancelled():
+            self._release(job_id)
+            if on_cancelled:
+                on_cancelled()
+        
+        def progress(percent, message):
+            job_signals.job_progress.emit(job_id, percent, message)
+            if on_progress:
+                on_progress(percent, message)
+        
+        job.emitter.finished.connect(finished)
+        job.emitter.failed.connect(failed)
+        job.emitter.cancelled.connect(cancelled)
+        job.emitter.progress.connect(progress)
+        if on_partial:
+            job.emitter.partial.connect(on_partial)
+        
+        self.jobs[job_id] = job
+        job_signals.job_started.emit(job_id, name)
+        self.thread_pool.start(job)
+        return job
+
+    def _release(self, job_id: str):
+        """任务结束后移除记录并通知"""
+        if self.jobs.pop(job_id, None) is not None:
+            job_signals.job_finished.emit(job_id)
+
+    def cancel(self, job_id: str):
+        """取消指定任务"""
+        job = self.jobs.get(job_id)
+        if job:
+            job.cancel()
+
+    def cancel_all(self):
+        """取消所有任务"""
+        for job in list(self.jobs.values()):
+            job.cancel()
+
+    def running_jobs(self):
+        """获取正在运行的任务列表"""
+        return list(self.jobs.values())
+
+    def wait_for_done(self, msecs: int = -1) -> bool:
+        """等待所有任务结束（用于退出程序时）"""
+        return self.thread_pool.waitForDone(msecs)
+
+_job_manager: Optional[JobManager] = None
+
+def get_job_manager() -> JobManager:
+    """获取全局任务管理器（需在GUI线程中首次调用）"""
+    global _job_manager
+    if _job_manager is None:
+        _job_manager = JobManager()
+    return _job_manager
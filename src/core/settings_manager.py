@@ -129,6 +129,18 @@ class SettingsManager:
                 "border_width": 1.0,
                 "marker_size": 5.0
             },
+            "io": {
+                "stream_threshold_mb": 64,      # 超过该大小的CSV文件以流式分块导入
+                "stream_chunk_rows": 100000,    # 流式导入每块的行数
+                "csv_engine": "auto",           # CSV解析引擎: auto / pandas / pyarrow
+                "parallel_threshold_mb": 1024,  # 超过该大小的CSV文件按字节范围多进程解析（pandas引擎）
+                "out_of_core_threshold_mb": 2048,  # 超过该大小的CSV文件写入磁盘列存储，以只读方式分页显示
+                "cache_enabled": True,          # 缓存CSV/JSON的解析结果，再次打开未修改的文件时直接读取
+                "cache_limit_mb": 4096,         # 导入缓存的总大小上限，超出后淘汰最久未使用的缓存
+                "json_layout": "split",         # 保存JSON文件的布局: split（列名 + 行数组） / records（记录数组） / columns（按列）
+                "json_precision": -1,           # 保存JSON文件时浮点数保留的小数位数，-1 表示不舍入
+                "compression_level": -1         # 保存压缩文件（.gz/.bz2/.xz/.zst）的压缩级别，-1 表示使用各格式的默认级别
+            },
             "recent_files": [],  # 最近打开的文件列表
             "user_preferences": {
                 "auto_save": False,
@@ -149,6 +161,17 @@ class SettingsManager:
         settings["ui"] = ui_settings
         return self.save_settings(settings)
     
+    def get_recent_files(self):
+        """获取最近打开的文件列表"""
+        settings = self.load_settings()
+        return settings.get("recent_files", [])
+    
+    def save_recent_files(self, recent_files):
+        """保存最近打开的文件列表"""
+        settings = self.load_settings()
+        settings["recent_files"] = recent_files
+        return self.save_settings(settings)
+    
     def get_theme_setting(self):
         """获取主题设置"""
         ui_settings = self.get_ui_settings()
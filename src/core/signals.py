@@ -16,6 +16,8 @@ class ContainerSignals(QObject):
     container_ready = pyqtSignal(object)    # 数据容器准备就绪信号 - 参数: 数据容器对象
     container_updated = pyqtSignal(object)  # 数据容器更新信号 - 参数: 数据容器对象
     container_deleted = pyqtSignal(object)  # 数据容器删除信号 - 参数: 数据容器对象
+    rows_appended = pyqtSignal(object, int, int)  # 行追加信号 - 参数: 数据容器对象、起始行、行数
+    open_files_requested = pyqtSignal(list)  # 请求打开文件信号（如拖放到主窗口） - 参数: 文件或文件夹路径列表
 
     _current_container = None
     
@@ -32,6 +34,7 @@ class TabSignals(QObject):
     table_tab_closed = pyqtSignal(str)        # 关闭的标签页UUID
     activate_table_tab = pyqtSignal(str)      # 请求激活的表格标签页UUID
     table_tab_renamed = pyqtSignal(str, str)  # 标签页重命名信号 - 参数: 标签页UUID、名称
+    current_table_tab_changed = pyqtSignal(str)  # 当前表格标签页改变信号 - 参数: 标签页UUID（欢迎页为空字符串）
 
     # 缩略图标签信号
     thumbnnail_clicked = pyqtSignal(str)      # 缩略图点击信号 - 参数: 缩略图UUID
@@ -58,6 +61,7 @@ class EditSignals(QObject):
     """编辑相关信号类"""
     undo_available = pyqtSignal(bool)  # 撤销可用信号 - 参数: 是否可用
     redo_available = pyqtSignal(bool)  # 重做可用信号 - 参数: 是否可用
+    history_changed = pyqtSignal(object)  # 撤销历史改变信号 - 参数: 命令管理器
     find_available = pyqtSignal(bool)  # 查找可用信号 - 参数: 是否可用
     replace_available = pyqtSignal(bool)  # 替换可用信号 - 参数: 是否可用
     find_requested = pyqtSignal(str, bool, bool)        # 文本，是否区分大小写，是否全词匹配
@@ -65,6 +69,12 @@ class EditSignals(QObject):
     replace_all_requested = pyqtSignal(str, str, bool, bool)  # 文本, 替换文本，是否区分大小写，是否全词匹配
     replace_all_finished = pyqtSignal()  # 替换全部完成信号
 
+class JobSignals(QObject):
+    """后台任务相关信号类"""
+    job_started = pyqtSignal(str, str)        # 任务开始信号 - 参数: 任务ID、任务名称
+    job_progress = pyqtSignal(str, int, str)  # 任务进度信号 - 参数: 任务ID、进度(0-100, -1表示未知)、说明
+    job_finished = pyqtSignal(str)            # 任务结束信号（完成、失败或取消） - 参数: 任务ID
+
 
 # 创建全局唯一实例
 # 信号中心类实例
@@ -89,4 +99,7 @@ settings_signals = SettingsSignals()
 theme_signals = ThemeSignals()
 
 # 编辑相关信号中心类实例
-edit_signals = EditSignals()
\ No newline at end of file
+edit_signals = EditSignals()
+
+# 后台任务相关信号中心类实例
+job_signals = JobSignals()
@@ -2,6 +2,7 @@
 # 这个文件是图表窗口的实现，主要是继承自QDialog，并使用matplotlib绘制图表。
 
 from PyQt6.QtWidgets import QDialog, QVBoxLayout, QMessageBox
+from PyQt6.QtCore import Qt, QTimer
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as NavigationToolbar
 from matplotlib.figure import Figure
@@ -10,9 +11,13 @@ import numpy as np
 import matplotlib
 
 from src.core.settings_manager import SettingsManager
+from src.core.signals import container_signals
 
 matplotlib.use('SVG')
 
+# 数据表追加行后延迟多久（毫秒）更新图表，期间多次追加合并为一次更新
+APPEND_UPDATE_MS = 500
+
 class ChartWindow(QDialog):
     def __init__(self, container, chart_type, parent=None, options=None):
         super().__init__(parent)
@@ -23,7 +28,26 @@ class ChartWindow(QDialog):
         self.settings = self.setting_manager.load_settings()
         self.setWindowTitle(f"{chart_type} - {container.name}")
         self.resize(800, 600)
+        # 折线图、散点图的数据系列及已绘制的行数，追加行时只绘制新增的点
+        self.series = None
+        self.x_labels = None
+        self.plotted_rows = 0
+        self.update_timer = QTimer(self)
+        self.update_timer.setSingleShot(True)
+        self.update_timer.timeout.connect(self.update_appended)
         self.init_ui()
+        # 窗口关闭后释放，并断开全局的追加行信号，避免已关闭的图表继续重绘
+        self.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        container_signals.rows_appended.connect(self.on_rows_appended)
+
+    def done(self, result):
+        """关闭窗口时停止更新并断开追加行信号"""
+        self.update_timer.stop()
+        try:
+            container_signals.rows_appended.disconnect(self.on_rows_appended)
+        except TypeError:
+            pass
+        super().done(result)
 
     def init_ui(self):
         layout = QVBoxLayout(self)
@@ -98,7 +122,12 @@ class ChartWindow(QDialog):
         if self.container is None:
             return
         
-        data_array = self.container.get_table_data_as_numpy()
+        # 超出内存的数据表按等间隔抽样绘图
+        plot_data = self.container.get_plot_dataframe()
+        if plot_data is None or plot_data.empty:
+            QMessageBox.warning(self, "错误", "数据为空！")
+            return
+        data_array = plot_data.to_numpy()
         headers = self.container.get_table_headers()
         
         # 确保数据是二维的
@@ -111,8 +140,11 @@ class ChartWindow(QDialog):
         
         # 清除旧图形
         self.figure.clear()
+        self.series = None
+        self.plotted_rows = len(data_array)
         
         ax = self.figure.add_subplot(111)
+        self.ax = ax
         
         # 应用绘图配置
         self.apply_draw_config(ax)
@@ -139,6 +171,49 @@ class ChartWindow(QDialog):
         
         self.canvas.draw()
     
+    def on_rows_appended(self, container, start, count):
+        """数据表追加行（如跟踪文件更新）时延迟更新图表"""
+        if container is self.container and self.isVisible() and not self.update_timer.isActive():
+            self.update_timer.start(APPEND_UPDATE_MS)
+
+    def update_appended(self):
+        """折线图、散点图只追加新增的数据点，其他图表重新绘制"""
+        container = self.container
+        if self.series is None or container.is_out_of_core() or container.row_count < self.plotted_rows:
+            self.draw_chart()
+            return
+        data_array = container.get_rows(self.plotted_rows, container.row_count).to_numpy()
+        if len(data_array) == 0:
+            return
+        start = self.plotted_rows
+        try:
+            if self.chart_type == 'line':
+                values = data_array[:, 1].astype(float)
+            else:
+                points = data_array[:, 1:3].astype(float)
+        except ValueError:
+            # 新增的行包含非数值数据，按原有逻辑重新绘制并提示
+            self.draw_chart()
+            return
+        
+        if self.chart_type == 'line':
+            _, y_data = self.series.get_data()
+            x_pos = np.arange(container.row_count)
+            self.series.set_data(x_pos, np.concatenate([y_data, values]))
+            # 标签只取新增行的第一列，不合并整个数据表
+            self.x_labels = np.concatenate([self.x_labels, data_array[:, 0]])
+            self.ax.set_xticks(x_pos)
+            self.ax.set_xticklabels(self.x_labels)
+            self.ax.relim()
+        else:
+            self.series.set_offsets(np.vstack([self.series.get_offsets(), points]))
+            self.ax.update_datalim(points)
+            for label, (x, y) in zip(data_array[:, 0], points):
+                self.ax.annotate(label, (x, y))
+        self.ax.autoscale_view()
+        self.plotted_rows = start + len(data_array)
+        self.canvas.draw_idle()
+
     def draw_line_chart(self, ax, data_array, headers):
         """绘制折线图，应用线宽和标记点大小设置"""
         if data_array.shape[1] < 2:
@@ -166,7 +241,8 @@ class ChartWindow(QDialog):
         line_width = self.settings.get("plot_settings", {}).get("line_width", 2)
         marker_size = self.settings.get("plot_settings", {}).get("marker_size", 5)
         
-        ax.plot(x_pos, values, marker='o', linewidth=line_width, markersize=marker_size)
+        self.series = ax.plot(x_pos, values, marker='o', linewidth=line_width, markersize=marker_size)[0]
+        self.x_labels = labels
         ax.set_xticks(x_pos)
         ax.set_xticklabels(labels)
         ax.set_xlabel(headers[0] if headers else 'X')
@@ -251,7 +327,7 @@ class ChartWindow(QDialog):
                     transform=ax.transAxes)
             return
         
-        ax.scatter(x_values, y_values)
+        self.series = ax.scatter(x_values, y_values)
         ax.set_xlabel(headers[1] if len(headers) > 1 else 'X')
         ax.set_ylabel(headers[2] if len(headers) > 2 else 'Y')
         ax.set_title(self.options.get('title', '散点图'))
@@ -1,3 +1,3 @@
-from . import data_overview, table_tab_area, table_view_tab
+from . import data_overview, table_tab_area, table_view_tab, job_status_bar
 
-__all__ = ["data_overview", "table_tab_area", "table_view_tab"]
\ No newline at end of file
+__all__ = ["data_overview", "table_tab_area", "table_view_tab", "job_status_bar"]
\ No newline at end of file
@@ -0,0 +1,82 @@
+# src/ui/core_components/job_status_bar.py
+from PyQt6.QtWidgets import QWidget, QHBoxLayout, QLabel, QProgressBar, QPushButton
+from src.core.signals import job_signals
+from src.core.job_runner import get_job_manager
+
+class JobStatusWidget(QWidget):
+    """状态栏中的后台任务显示：最近任务的名称、进度以及取消按钮"""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.job_manager = get_job_manager()
+        self.job_names = {}     # {job_id: 任务名称}，按开始顺序排列
+        self.job_progress = {}  # {job_id: (进度, 说明)}
+        self.init_ui()
+        
+        job_signals.job_started.connect(self.on_job_started)
+        job_signals.job_progress.connect(self.on_job_progress)
+        job_signals.job_finished.connect(self.on_job_finished)
+        self.refresh()
+
+    def init_ui(self):
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        
+        self.label = QLabel()
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setFixedWidth(160)
+        self.progress_bar.setTextVisible(True)
+        self.cancel_button = QPushButton("取消")
+        self.cancel_button.clicked.connect(self.cancel_current_job)
+        
+        layout.addWidget(self.label)
+        layout.addWidget(self.progress_bar)
+        layout.addWidget(self.cancel_button)
+
+    def current_job_id(self):
+        """当前显示的任务（最近开始的任务）"""
+        return next(reversed(self.job_names), None)
+
+    def on_job_started(self, job_id, name):
+        self.job_names[job_id] = name
+        self.job_progress[job_id] = (-1, "")
+        self.refresh()
+
+    def on_job_progress(self, job_id, percent, message):
+        if job_id in self.job_names:
+            self.job_progress[job_id] = (percent, message)
+            if job_id == self.current_job_id():
+                self.refresh()
+
+    def on_job_finished(self, job_id):
+        self.job_names.pop(job_id, None)
+        self.job_progress.pop(job_id, None)
+        self.refresh()
+
+    def refresh(self):
+        """刷新显示"""
+        job_id = self.current_job_id()
+        if job_id is None:
+            self.setVisible(False)
+            return
+        
+        self.setVisible(True)
+        name = self.job_names[job_id]
+        percent, message = self.job_progress.get(job_id, (-1, ""))
+        text = f"{name}: {message}" if message else name
+        if len(self.job_names) > 1:
+            text += f"（共 {len(self.job_names)} 个任务运行中）"
+        self.label.setText(text)
+        
+        if percent < 0:
+            # 进度未知，显示忙碌状态
+            self.progress_bar.setRange(0, 0)
+        else:
+            self.progress_bar.setRange(0, 100)
+            self.progress_bar.setValue(min(percent, 100))
+
+    def cancel_current_job(self):
+        """取消当前显示的任务"""
+        job_id = self.current_job_id()
+        if job_id:
+            self.job_manager.cancel(job_id)
+            self.label.setText(f"{self.job_names[job_id]}: 正在取消...")
@@ -1,5 +1,6 @@
 # src/ui/core_components/parent_table_tab.py
 from PyQt6.QtWidgets import QTabWidget, QWidget, QMessageBox, QInputDialog, QLineEdit
+from PyQt6.QtCore import QTimer
 from .table_view_tab import TableViewTab
 from src.core.signals import tab_signals, container_signals
 from src.core.data_container import DataContainer
@@ -18,6 +19,7 @@ class ParentTableTab(QTabWidget):
         self.setTabsClosable(True)
         self.tabBar().tabBarDoubleClicked.connect(self.on_tab_double_clicked)
         self.tabCloseRequested.connect(self.handle_tab_close_by_index)
+        self.currentChanged.connect(self.on_current_changed)
         
         # 信号连接
         container_signals.container_ready.connect(self.create_sub_tab)      # 数据容器准备就绪信号
@@ -28,6 +30,20 @@ class ParentTableTab(QTabWidget):
         tab_signals.table_tab_renamed.connect(self.handle_tab_rename)           # 表格子标签页重命名信号
 
     
+    def on_current_changed(self, index):
+        """当前标签页改变时通知其他组件（如编辑菜单刷新撤销状态）"""
+        current_widget = self.widget(index)
+        container = getattr(current_widget, "container", None)
+        tab_signals.current_table_tab_changed.emit(container.uuid if container else "")
+        # 延迟加载的数据表在事件循环空闲时读取，批量创建标签页时途经的标签页不会触发读取
+        if container is not None and not container.is_loaded():
+            QTimer.singleShot(0, lambda: self.load_if_current(current_widget))
+
+    def load_if_current(self, widget):
+        """标签页仍为当前页时读取其延迟加载的数据"""
+        if self.currentWidget() is widget:
+            widget.ensure_loaded()
+
     def on_container_created(self):
         cur_container = DataContainer()
         cur_container.name = f"数据组{len(self.tab_map) + 1}"
@@ -97,14 +113,16 @@ class ParentTableTab(QTabWidget):
             if uuid_str == closed_widget_uuid:
                 container_index = info["index"]
                 break
-        if container_index:
+        if container_index is not None:
             # 从映射中移除
-            del self.tab_map[closed_widget_uuid]
+            closed_widget = self.tab_map.pop(closed_widget_uuid)["widget"]
         
-            # 移除标签页
+            # 移除标签页并释放其撤销历史
             self.removeTab(container_index)
+            closed_widget.release()
         else:
             print(f"未找到UUID为{closed_widget_uuid}的标签页")
+            return
         
         # 更新剩余标签页的索引
         for info in self.tab_map.values():
@@ -126,8 +144,9 @@ class ParentTableTab(QTabWidget):
                 container_uuid = uuid_str
                 break
         if container_uuid:
-            # 移除标签页
+            # 移除标签页并释放其撤销历史
             self.removeTab(index)
+            close_widget.release()
             
             # 从映射中移除
             del self.tab_map[container_uuid]
@@ -1,4 +1,5 @@
 # src/ui/core_components/table_view_tab.py
+from collections import OrderedDict
 from typing import Optional, List, Dict, Any, Set
 import numpy as np
 import pandas as pd
@@ -8,11 +9,12 @@ from PyQt6.QtWidgets import (
     QInputDialog, QMenu, QLineEdit, QStyledItemDelegate,
     QApplication, QStyleOptionViewItem, QStyle
 )
-from PyQt6.QtCore import QAbstractTableModel, Qt, QModelIndex, QPoint
+from PyQt6.QtCore import QAbstractTableModel, Qt, QModelIndex, QPoint, pyqtSignal
 from PyQt6.QtGui import QKeySequence, QShortcut, QClipboard, QBrush, QColor, QFont
-from src.core.signals import data_signals, theme_signals, tab_signals
-from src.core.command_manager import EditCellCommand, AddRowCommand, RemoveRowCommand, AddColumnCommand, RemoveColumnCommand
+from src.core.signals import theme_signals, tab_signals, container_signals, edit_signals
+from src.core.command_manager import CommandManager, EditCellCommand, AddRowCommand, RemoveRowCommand, AddColumnCommand, RemoveColumnCommand, ReplaceColumnsCommand
 from src.core.data_container import DataContainer
+from src.core.job_runner import get_job_manager
 import re
 
 class NumericDelegate(QStyledItemDelegate):
@@ -64,6 +66,9 @@ class NumericDelegate(QStyledItemDelegate):
 
 class TableModel(QAbstractTableModel):
     """自定义表格模型，支持混合数据类型"""
+    data_modified = pyqtSignal(object, list)  # 数据修改信号 - 参数: 数据对象,列标题
+    cell_modified = pyqtSignal(int, int, object)  # 单元格修改信号 - 参数: 行,列,新值
+
     def __init__(self, data=None, headers=None, parent=None):
         super().__init__(parent)
         self._headers = headers or ["列1", "列2"]
@@ -137,7 +142,8 @@ class TableModel(QAbstractTableModel):
                 self._data[row, col] = new_value
                 self.modified = True
                 self.dataChanged.emit(index, index, [role])
-                data_signals.data_modified.emit(self._data.copy(), self._headers.copy())   
+                # 只修改了一个单元格，不必复制整表
+                self.cell_modified.emit(row, col, new_value)
                 return True
         return False
     
@@ -180,7 +186,7 @@ class TableModel(QAbstractTableModel):
         
         self.endInsertRows()
         self.modified = True
-        data_signals.data_modified.emit(self._data.copy(), self._headers.copy())   
+        self.data_modified.emit(self._data.copy(), self._headers.copy())   
         return True
     
     def removeRow(self, row: int) -> bool:
@@ -191,7 +197,7 @@ class TableModel(QAbstractTableModel):
         self._data = np.delete(self._data, row, axis=0)
         self.endRemoveRows()
         self.modified = True
-        data_signals.data_modified.emit(self._data.copy(), self._headers.copy())   
+        self.data_modified.emit(self._data.copy(), self._headers.copy())   
         return True
     
     def insertColumn(self, col: int, header: Optional[str] = None) -> bool:
@@ -218,7 +224,7 @@ class TableModel(QAbstractTableModel):
         self._headers.insert(col, header)
         self.endInsertColumns()
         self.modified = True
-        data_signals.data_modified.emit(self._data.copy(), self._headers.copy())   
+        self.data_modified.emit(self._data.copy(), self._headers.copy())   
         return True
     
     def removeColumn(self, col: int) -> bool:
@@ -230,9 +236,18 @@ class TableModel(QAbstractTableModel):
         self._headers.pop(col)
         self.endRemoveColumns()
         self.modified = True
-        data_signals.data_modified.emit(self._data.copy(), self._headers.copy())   
+        self.data_modified.emit(self._data.copy(), self._headers.copy())   
         return True
     
+    def append_rows(self, rows: np.ndarray):
+        """在末尾追加多行"""
+        if len(rows) == 0:
+            return
+        start = self.rowCount()
+        self.beginInsertRows(QModelIndex(), start, start + len(rows) - 1)
+        self._data = np.vstack([self._data, rows])
+        self.endInsertRows()
+
     def get_data(self) -> tuple:
         """返回表格数据和列标题"""
         return self._data.copy(), self._headers.copy()
@@ -241,20 +256,83 @@ class TableModel(QAbstractTableModel):
         """清除修改状态"""
         self.modified = False
 
+class PagedTableModel(QAbstractTableModel):
+    """超出内存的数据表的只读模型：按页从列存储读取可见的行，只缓存最近使用的若干页"""
+    data_modified = pyqtSignal(object, list)  # 与 TableModel 保持一致，只读模型不会发出
+
+    PAGE_ROWS = 1000
+    MAX_PAGES = 16
+
+    def __init__(self, container: DataContainer, parent=None):
+        super().__init__(parent)
+        self.container = container
+        self._headers = container.get_table_headers()
+        self._pages: "OrderedDict[int, np.ndarray]" = OrderedDict()
+
+    def _page(self, page: int) -> np.ndarray:
+        rows = self._pages.get(page)
+        if rows is None:
+            start = page * self.PAGE_ROWS
+            rows = self.container.get_rows(start, start + self.PAGE_ROWS).to_numpy(dtype=object)
+            self._pages[page] = rows
+            if len(self._pages) > self.MAX_PAGES:
+                self._pages.popitem(last=False)
+        else:
+            self._pages.move_to_end(page)
+        return rows
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return self.container.row_count
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return len(self._headers)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            row = index.row()
+            value = self._page(row // self.PAGE_ROWS)[row % self.PAGE_ROWS, index.column()]
+            if role == Qt.ItemDataRole.EditRole:
+                return value
+            return "" if value is None or value != value else str(value)
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignHCenter
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole) -> Any:
+        if role == Qt.ItemDataRole.DisplayRole:
+            if orientation == Qt.Orientation.Horizontal:
+                return self._headers[section] if section < len(self._headers) else ""
+            return str(section + 1)
+        return None
+
+    def flags(self, index) -> Qt.ItemFlag:
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+    def get_data(self) -> tuple:
+        """返回首页数据和列标题（完整数据请通过数据容器分块读取）"""
+        return self._page(0).copy(), list(self._headers)
+
 class TableViewTab(QWidget):
     """单个表格视图标签页"""
     def __init__(self, container: DataContainer, main_window=None, parent=None):
         super().__init__(parent)
         self.container = container
         self.main_window = main_window
-        self.command_manager = main_window.get_command_manager() if main_window else None
+        # 撤销历史归属于本标签页，标签页关闭时一并释放
+        self.command_manager = CommandManager(self)
         self.model: Optional[TableModel] = None
+        self.loading = False  # 是否正在后台读取延迟加载的数据
         self.init_ui()
         self.setup_shortcuts()
         
         # 连接信号
         tab_signals.table_tab_renamed.connect(self.on_tab_renamed)
-        data_signals.data_modified.connect(self.update_container_data)
+        self.model.data_modified.connect(self.update_container_data)
+        self.model.cell_modified.connect(self.update_container_cell)
+        container_signals.container_updated.connect(self.on_container_updated)
+        container_signals.rows_appended.connect(self.on_rows_appended)
         theme_signals.theme_changed.connect(self.on_theme_changed)
 
     def on_tab_renamed(self, uuid: str, name: str):
@@ -262,6 +340,78 @@ class TableViewTab(QWidget):
         if self.container.uuid == uuid:
             self.container.name = name
 
+    def on_container_updated(self, container):
+        """容器数据被整体更新（如批量工具、撤销）时重新加载视图"""
+        if container is self.container:
+            self.load_data()
+
+    def on_rows_appended(self, container, start, count):
+        """流式导入追加行时只转换新增的行"""
+        if container is not self.container or container.is_out_of_core():
+            return
+        # 撤销记录基于追加前的行，追加后不能安全回放
+        self.command_manager.clear()
+        headers = self.container.get_table_headers()
+        if headers != self.model._headers or start != self.model.rowCount():
+            self.load_data()
+            return
+        new_rows = self.container.get_rows(start, start + count).to_numpy().astype(object)
+        self.model.append_rows(new_rows)
+
+    def ensure_loaded(self):
+        """延迟加载的数据表（如项目文件中的表）首次显示时在后台读取数据"""
+        if self.container.is_loaded() or self.loading:
+            return
+        self.loading = True
+        loader = self.container.lazy_loader
+        
+        def on_finished(dataframe):
+            self.loading = False
+            # 读取期间数据未被替换时才采用读取结果
+            if self.container.lazy_loader is loader:
+                self.container.set_dataframe(dataframe)
+                container_signals.container_updated.emit(self.container)
+        
+        def on_failed(message):
+            self.loading = False
+            QMessageBox.warning(self, "错误", f"读取数据失败：{message}")
+        
+        get_job_manager().submit(
+            f"读取 {self.container.name}",
+            self.read_lazy_data, loader,
+            on_finished=on_finished,
+            on_failed=on_failed,
+            on_cancelled=lambda: setattr(self, "loading", False)
+        )
+
+    def read_lazy_data(self, job, loader):
+        """在后台线程中读取延迟加载的数据"""
+        job.report_progress(-1, "正在读取数据...")
+        return loader()
+
+    def release(self):
+        """标签页关闭时释放撤销历史及其持有的数据"""
+        self.command_manager.clear()
+        # 超出内存的数据表删除其列存储缓存
+        self.container.release_store()
+        self.deleteLater()
+
+    def check_editable(self) -> bool:
+        """超出内存的数据表只读，编辑前提示"""
+        if self.container.is_out_of_core():
+            QMessageBox.information(self, "提示", "该数据表超出内存，以只读方式打开。请先过滤出较小的子集再编辑")
+            return False
+        return True
+
+    def set_read_only(self, read_only: bool):
+        """切换只读状态：只读时使用分页模型并禁用编辑按钮"""
+        for button in (self.add_row_btn, self.remove_row_btn, self.add_col_btn, self.remove_col_btn):
+            button.setEnabled(not read_only)
+        if read_only:
+            self.tableView.setModel(PagedTableModel(self.container, self))
+        elif self.tableView.model() is not self.model:
+            self.tableView.setModel(self.model)
+
     def update_container_data(self, data, headers):
         """更新容器数据"""
         try:
@@ -269,6 +419,18 @@ class TableViewTab(QWidget):
         except Exception as e:
             QMessageBox.warning(self, "错误", f"更新容器数据失败: {str(e)}")
 
+    def update_container_cell(self, row, col, value):
+        """将单个单元格的修改写入容器；容器与表格的行列或表头不一致（如新建表格、修改过表头）时整表更新"""
+        dataframe = self.container.dataframe
+        if (dataframe is None or dataframe.shape != self.model._data.shape
+                or self.container.get_table_headers() != self.model._headers):
+            self.update_container_data(*self.model.get_data())
+            return
+        try:
+            self.container.set_cell(row, col, value)
+        except Exception as e:
+            QMessageBox.warning(self, "错误", f"更新容器数据失败: {str(e)}")
+
     def init_ui(self):
         """初始化UI"""
         layout = QVBoxLayout(self)
@@ -313,9 +475,8 @@ class TableViewTab(QWidget):
         self.tableView.setModel(self.model)
         
         # 设置自定义委托
-        if self.command_manager:
-            self.delegate = NumericDelegate(self.command_manager)
-            self.tableView.setItemDelegate(self.delegate)
+        self.delegate = NumericDelegate(self.command_manager)
+        self.tableView.setItemDelegate(self.delegate)
         
         layout.addLayout(button_layout)
         layout.addWidget(self.tableView)
@@ -352,6 +513,10 @@ class TableViewTab(QWidget):
     
     def load_data(self):
         """从容器加载数据，支持混合类型"""
+        if self.container and self.container.is_out_of_core():
+            self.set_read_only(True)
+            return
+        self.set_read_only(False)
         if self.container and self.container.dataframe is not None:
             try:
                 data_array = self.container.get_table_data_as_numpy()
@@ -383,6 +548,8 @@ class TableViewTab(QWidget):
     # 表头编辑方法
     def edit_header(self, section):
         """编辑指定列的表头"""
+        if not self.check_editable():
+            return
         current_header = self.model.headerData(section, Qt.Orientation.Horizontal)
         new_header, ok = QInputDialog.getText(
             self, 
@@ -457,12 +624,16 @@ class TableViewTab(QWidget):
     #         self.model.removeColumn(col)
     
     def add_row(self):
+        if not self.check_editable():
+            return
         selected_indexes = self.tableView.selectedIndexes()
         row = max(index.row() for index in selected_indexes) + 1 if selected_indexes else self.model.rowCount()
         command = AddRowCommand(self.model, row)
         self.command_manager.execute(command)
 
     def remove_row(self):
+        if not self.check_editable():
+            return
         selected_indexes = self.tableView.selectedIndexes()
         if not selected_indexes:
             QMessageBox.warning(self, "操作错误", "请先选择要删除的行")
@@ -476,12 +647,16 @@ class TableViewTab(QWidget):
             self.command_manager.execute(command)
 
     def add_column(self):
+        if not self.check_editable():
+            return
         selected_indexes = self.tableView.selectedIndexes()
         col = max(index.column() for index in selected_indexes) + 1 if selected_indexes else self.model.columnCount()
         command = AddColumnCommand(self.model, col)
         self.command_manager.execute(command)
 
     def remove_column(self):
+        if not self.check_editable():
+            return
         selected_indexes = self.tableView.selectedIndexes()
         if not selected_indexes:
             QMessageBox.warning(self, "操作错误", "请先选择要删除的列")
@@ -528,6 +703,8 @@ class TableViewTab(QWidget):
     
     def clear_insertion(self):
         """清除选中单元格的输入内容"""
+        if not self.check_editable():
+            return
         selected_indexes = self.tableView.selectedIndexes()
         if not selected_indexes:
             return
@@ -563,6 +740,8 @@ class TableViewTab(QWidget):
     
     def paste_to_selection(self):
         """从剪贴板粘贴数据到选中区域"""
+        if not self.check_editable():
+            return
         clipboard = QApplication.clipboard()
         clipboard_text = clipboard.text().strip()
         if not clipboard_text:
@@ -680,7 +859,7 @@ class TableViewTab(QWidget):
 
     def replace_text(self, find_text, replace_text, case_sensitive=False, whole_word=False, replace_all=False):
         """替换指定文本"""
-        if not find_text:
+        if not find_text or not self.check_editable():
             return
 
         # 获取模型
@@ -697,18 +876,9 @@ class TableViewTab(QWidget):
         
         replaced_count = 0
         
-        # 如果是替换全部，遍历所有单元格
+        # 如果是替换全部，在后台对容器做向量化替换，结果作为一条撤销记录写回
         if replace_all:
-            for r in range(rows):
-                for c in range(cols):
-                    index = model.index(r, c)
-                    cell_value = model.data(index, Qt.ItemDataRole.DisplayRole)
-                    if cell_value and self._matches_text(cell_value, find_text, case_sensitive, whole_word):
-                        new_value = self._replace_in_text(cell_value, find_text, replace_text, case_sensitive, whole_word)
-                        model.setData(index, new_value, Qt.ItemDataRole.EditRole)
-                        replaced_count += 1
-            
-            QMessageBox.information(self, "替换", f"已替换 {replaced_count} 处文本")
+            self.replace_all_text(find_text, replace_text, case_sensitive, whole_word)
         else:
             # 只替换当前选中的单元格
             if current_index.isValid():
@@ -730,6 +900,30 @@ class TableViewTab(QWidget):
                 QMessageBox.information(self, "替换", "未找到匹配项")
 
 
+    def replace_all_text(self, find_text, replace_text, case_sensitive=False, whole_word=False):
+        """全部替换：大表分块交给进程池处理"""
+        snapshot = self.container.snapshot()
+        
+        def on_finished(result):
+            changes, replaced_count = result
+            # 替换结果按快照计算，期间数据被修改（如编辑、流式追加）时写回会覆盖修改或行数不符，丢弃结果
+            if self.container.version != snapshot.version or self.container.row_count != snapshot.row_count:
+                QMessageBox.warning(self, "替换", "替换期间数据已被修改，替换结果已丢弃，请重新替换")
+                edit_signals.replace_all_finished.emit()
+                return
+            if changes:
+                command = ReplaceColumnsCommand(self.container, changes)
+                self.command_manager.execute(command)
+            QMessageBox.information(self, "替换", f"已替换 {replaced_count} 处文本")
+            edit_signals.replace_all_finished.emit()
+        
+        get_job_manager().submit(
+            f"替换 {self.container.name}",
+            lambda job: snapshot.prepare_replace_text(find_text, replace_text, case_sensitive, whole_word),
+            on_finished=on_finished,
+            on_failed=lambda message: QMessageBox.warning(self, "替换", f"替换失败：{message}")
+        )
+
     # 右键菜单功能
     def show_context_menu(self, pos):
         """显示右键菜单"""
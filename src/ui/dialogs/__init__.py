@@ -1,3 +1,3 @@
-from . import filter_dialog, find_replace_dialogs, preferences_dialog, sort_dialog, theme_dialog
+from . import column_picker_dialog, filter_dialog, find_replace_dialogs, preferences_dialog, schema_dialog, sheet_picker_dialog, sort_dialog, sql_query_dialog, theme_dialog
 
-all = ["filter_dialogs", "find_replace_dialogs", "preferences_dialog", "sort_dialog", "theme_dialog"]
\ No newline at end of file
+all = ["column_picker_dialog", "filter_dialogs", "find_replace_dialogs", "preferences_dialog", "schema_dialog", "sheet_picker_dialog", "sort_dialog", "sql_query_dialog", "theme_dialog"]
\ No newline at end of file
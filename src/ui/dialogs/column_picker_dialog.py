@@ -0,0 +1,64 @@
+# src/ui/dialogs/column_picker_dialog.py
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QListWidget, QListWidgetItem
+from PyQt6.QtCore import Qt
+
+class ColumnPickerDialog(QDialog):
+    """选择要加载的列（列投影），列表中显示各列的类型"""
+    def __init__(self, columns, rows=None, file_name="", parent=None):
+        super().__init__(parent)
+        self.columns = columns  # [(列名, 类型名)]
+        self.setWindowTitle('选择列')
+        self.resize(360, 400)
+        self.init_ui(rows, file_name)
+
+    def init_ui(self, rows, file_name):
+        layout = QVBoxLayout()
+
+        size = f'{rows} 行 × {len(self.columns)} 列' if rows is not None else f'{len(self.columns)} 列'
+        layout.addWidget(QLabel(f'{file_name} ({size})，选择要加载的列：'))
+
+        self.column_list = QListWidget()
+        for name, type_name in self.columns:
+            item = QListWidgetItem(f'{name} ({type_name})')
+            item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+            item.setCheckState(Qt.CheckState.Checked)
+            self.column_list.addItem(item)
+        layout.addWidget(self.column_list)
+
+        # 按钮布局
+        button_layout = QHBoxLayout()
+        self.select_all_button = QPushButton('全选')
+        self.select_none_button = QPushButton('全不选')
+        self.ok_button = QPushButton('确定')
+        self.cancel_button = QPushButton('取消')
+        button_layout.addWidget(self.select_all_button)
+        button_layout.addWidget(self.select_none_button)
+        button_layout.addStretch()
+        button_layout.addWidget(self.ok_button)
+        button_layout.addWidget(self.cancel_button)
+        layout.addLayout(button_layout)
+
+        self.select_all_button.clicked.connect(lambda: self.set_all_checked(True))
+        self.select_none_button.clicked.connect(lambda: self.set_all_checked(False))
+        self.ok_button.clicked.connect(self.accept)
+        self.cancel_button.clicked.connect(self.reject)
+        self.column_list.itemChanged.connect(self.update_ok_button)
+
+        self.setLayout(layout)
+
+    def set_all_checked(self, checked):
+        """选中或取消选中全部列"""
+        state = Qt.CheckState.Checked if checked else Qt.CheckState.Unchecked
+        for i in range(self.column_list.count()):
+            self.column_list.item(i).setCheckState(state)
+
+    def update_ok_button(self, *args):
+        """至少选中一列时才能确定"""
+        self.ok_button.setEnabled(bool(self.get_selected_columns()))
+
+    def get_selected_columns(self):
+        """获取选中的列名"""
+        return [
+            name for i, (name, _) in enumerate(self.columns)
+            if self.column_list.item(i).checkState() == Qt.CheckState.Checked
+        ]
@@ -1,4 +1,5 @@
 from PyQt6.QtWidgets import QDialog, QMessageBox, QVBoxLayout, QLineEdit, QPushButton, QComboBox, QLabel, QGridLayout, QGroupBox, QHBoxLayout, QCheckBox, QFileDialog, QDialogButtonBox
+from src.core.data_container import ALL_COLUMNS, ALL_NUMERIC_COLUMNS
 
 class DataCleanDialog(QDialog):
     def __init__(self, container=None, parent=None):
@@ -35,8 +36,8 @@ class DataCleanDialog(QDialog):
 
         for header in headers:
             self.column_combobox.addItem(header)
-        layout.addWidget(self.column_combobox)
-        self.column_combobox.addItem('全部')
+        self.column_combobox.addItem(ALL_COLUMNS)
+        self.column_combobox.addItem(ALL_NUMERIC_COLUMNS)
         layout.addWidget(self.column_combobox)
 
         layout.addWidget(QLabel('请选择清洗设置'))
@@ -1,6 +1,7 @@
 # src/ui/dialogs/data_convert_dialog.py
 from PyQt6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QComboBox, QLineEdit, QPushButton, QLabel, QGroupBox, QGridLayout, QSpinBox, QDoubleSpinBox, QCheckBox, QMessageBox
 from PyQt6.QtCore import Qt
+from src.core.data_container import ALL_COLUMNS, ALL_NUMERIC_COLUMNS
 
 class DataConvertDialog(QDialog):
     def __init__(self, container=None, parent=None):
@@ -27,6 +28,7 @@ class DataConvertDialog(QDialog):
         if self.container:
             headers = self.container.get_table_headers()
             self.column_combo.addItems(headers)
+            self.column_combo.addItems([ALL_COLUMNS, ALL_NUMERIC_COLUMNS])
         column_layout.addWidget(self.column_combo)
         layout.addLayout(column_layout)
         
@@ -1,6 +1,8 @@
 # src/ui/dialogs/data_interface_tab.py
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QGroupBox, QCheckBox, QSpinBox, QLabel, QComboBox, QHBoxLayout
 from PyQt6.QtCore import Qt
+from src.core.data_io.csv_loader import CSV_ENGINES, pyarrow_available
+from src.core.data_io.table_writer import JSON_LAYOUTS
 
 class DataInterfaceTab(QWidget):
     def __init__(self, parent=None):
@@ -62,6 +64,130 @@ class DataInterfaceTab(QWidget):
         behavior_group.setLayout(behavior_layout)
         layout.addWidget(behavior_group)
         
+        # 导入设置组
+        io_group = QGroupBox("导入设置")
+        io_layout = QVBoxLayout()
+        
+        io_row = QHBoxLayout()
+        io_row.addWidget(QLabel("流式导入阈值(MB):"))
+        self.stream_threshold_mb = QSpinBox()
+        self.stream_threshold_mb.setRange(1, 100000)
+        self.stream_threshold_mb.setValue(64)
+        io_row.addWidget(self.stream_threshold_mb)
+        io_row.addStretch()
+        io_layout.addLayout(io_row)
+        
+        io_row2 = QHBoxLayout()
+        io_row2.addWidget(QLabel("每块行数:"))
+        self.stream_chunk_rows = QSpinBox()
+        self.stream_chunk_rows.setRange(1000, 10000000)
+        self.stream_chunk_rows.setSingleStep(10000)
+        self.stream_chunk_rows.setValue(100000)
+        io_row2.addWidget(self.stream_chunk_rows)
+        io_row2.addStretch()
+        io_layout.addLayout(io_row2)
+        
+        io_row3 = QHBoxLayout()
+        io_row3.addWidget(QLabel("CSV解析引擎:"))
+        self.csv_engine = QComboBox()
+        for engine, label in CSV_ENGINES.items():
+            self.csv_engine.addItem(label, engine)
+        if not pyarrow_available():
+            self.csv_engine.setToolTip("未安装pyarrow，将使用pandas解析")
+        io_row3.addWidget(self.csv_engine)
+        io_row3.addStretch()
+        io_layout.addLayout(io_row3)
+        
+        io_row4 = QHBoxLayout()
+        io_row4.addWidget(QLabel("多进程解析阈值(MB):"))
+        self.parallel_threshold_mb = QSpinBox()
+        self.parallel_threshold_mb.setRange(1, 1000000)
+        self.parallel_threshold_mb.setValue(1024)
+        self.parallel_threshold_mb.setToolTip("使用pandas解析器时，超过该大小的CSV文件按字节范围切分后多进程解析")
+        io_row4.addWidget(self.parallel_threshold_mb)
+        io_row4.addStretch()
+        io_layout.addLayout(io_row4)
+        
+        io_row5 = QHBoxLayout()
+        io_row5.addWidget(QLabel("超出内存阈值(MB):"))
+        self.out_of_core_threshold_mb = QSpinBox()
+        self.out_of_core_threshold_mb.setRange(1, 10000000)
+        self.out_of_core_threshold_mb.setValue(2048)
+        self.out_of_core_threshold_mb.setToolTip("超过该大小的CSV文件写入磁盘列存储，以只读方式分页显示，绘图时抽样")
+        io_row5.addWidget(self.out_of_core_threshold_mb)
+        io_row5.addStretch()
+        io_layout.addLayout(io_row5)
+        
+        io_row6 = QHBoxLayout()
+        self.cache_enabled = QCheckBox("缓存解析结果，上限(MB):")
+        self.cache_enabled.setChecked(True)
+        self.cache_enabled.setToolTip("再次打开未修改的CSV/JSON文件时直接读取缓存，不重新解析（需要pyarrow）")
+        io_row6.addWidget(self.cache_enabled)
+        self.cache_limit_mb = QSpinBox()
+        self.cache_limit_mb.setRange(64, 10000000)
+        self.cache_limit_mb.setValue(4096)
+        io_row6.addWidget(self.cache_limit_mb)
+        io_row6.addStretch()
+        io_layout.addLayout(io_row6)
+        
+        io_row7 = QHBoxLayout()
+        io_row7.addWidget(QLabel("JSON保存布局:"))
+        self.json_layout = QComboBox()
+        for json_layout, label in JSON_LAYOUTS.items():
+            self.json_layout.addItem(label, json_layout)
+        io_row7.addWidget(self.json_layout)
+        io_row7.addWidget(QLabel("小数位数:"))
+        self.json_precision = QSpinBox()
+        self.json_precision.setRange(-1, 17)
+        self.json_precision.setSpecialValueText("不舍入")
+        self.json_precision.setValue(-1)
+        io_row7.addWidget(self.json_precision)
+        io_row7.addStretch()
+        io_layout.addLayout(io_row7)
+        
+        io_row8 = QHBoxLayout()
+        io_row8.addWidget(QLabel("压缩级别:"))
+        self.compression_level = QSpinBox()
+        self.compression_level.setRange(-1, 22)
+        self.compression_level.setSpecialValueText("默认")
+        self.compression_level.setValue(-1)
+        self.compression_level.setToolTip("保存为 .gz/.bz2/.xz/.zst 文件时使用，超出格式支持的范围时取边界值")
+        io_row8.addWidget(self.compression_level)
+        io_row8.addStretch()
+        io_layout.addLayout(io_row8)
+        
+        io_group.setLayout(io_layout)
+        layout.addWidget(io_group)
+        
+        # 自动保存设置组
+        autosave_group = QGroupBox("自动保存")
+        autosave_layout = QVBoxLayout()
+        
+        autosave_row = QHBoxLayout()
+        self.auto_save = QCheckBox("自动保存，间隔(分钟):")
+        autosave_row.addWidget(self.auto_save)
+        self.auto_save_interval = QSpinBox()
+        self.auto_save_interval.setRange(1, 120)
+        self.auto_save_interval.setValue(5)
+        autosave_row.addWidget(self.auto_save_interval)
+        autosave_row.addStretch()
+        autosave_layout.addLayout(autosave_row)
+        
+        autosave_row2 = QHBoxLayout()
+        self.backup_enabled = QCheckBox("保留备份，份数:")
+        self.backup_enabled.setChecked(True)
+        autosave_row2.addWidget(self.backup_enabled)
+        self.backup_count = QSpinBox()
+        self.backup_count.setRange(1, 20)
+        self.backup_count.setValue(3)
+        self.backup_count.setToolTip("每个数据表保留的完整快照份数，每份之后只保存修改过的单元格")
+        autosave_row2.addWidget(self.backup_count)
+        autosave_row2.addStretch()
+        autosave_layout.addLayout(autosave_row2)
+        
+        autosave_group.setLayout(autosave_layout)
+        layout.addWidget(autosave_group)
+        
         layout.addStretch()
         
     def get_settings(self):
@@ -75,6 +201,38 @@ class DataInterfaceTab(QWidget):
             "column_naming": self.column_naming.currentText()
         }
 
+    def get_io_settings(self):
+        """获取导入导出设置"""
+        return {
+            "stream_threshold_mb": self.stream_threshold_mb.value(),
+            "stream_chunk_rows": self.stream_chunk_rows.value(),
+            "csv_engine": self.csv_engine.currentData(),
+            "parallel_threshold_mb": self.parallel_threshold_mb.value(),
+            "out_of_core_threshold_mb": self.out_of_core_threshold_mb.value(),
+            "cache_enabled": self.cache_enabled.isChecked(),
+            "cache_limit_mb": self.cache_limit_mb.value(),
+            "json_layout": self.json_layout.currentData(),
+            "json_precision": self.json_precision.value(),
+            "compression_level": self.compression_level.value()
+        }
+
+    def load_io_settings(self, settings):
+        """加载导入导出设置"""
+        self.stream_threshold_mb.setValue(settings.get("stream_threshold_mb", 64))
+        self.stream_chunk_rows.setValue(settings.get("stream_chunk_rows", 100000))
+        self.parallel_threshold_mb.setValue(settings.get("parallel_threshold_mb", 1024))
+        self.out_of_core_threshold_mb.setValue(settings.get("out_of_core_threshold_mb", 2048))
+        self.cache_enabled.setChecked(settings.get("cache_enabled", True))
+        self.cache_limit_mb.setValue(settings.get("cache_limit_mb", 4096))
+        self.json_precision.setValue(settings.get("json_precision", -1))
+        self.compression_level.setValue(settings.get("compression_level", -1))
+        index = self.json_layout.findData(settings.get("json_layout", "split"))
+        if index >= 0:
+            self.json_layout.setCurrentIndex(index)
+        index = self.csv_engine.findData(settings.get("csv_engine", "auto"))
+        if index >= 0:
+            self.csv_engine.setCurrentIndex(index)
+
     def load_settings(self, settings):
         """加载数据界面设置"""
         self.show_row_numbers.setChecked(settings.get("show_row_numbers", True))
@@ -86,4 +244,20 @@ class DataInterfaceTab(QWidget):
         column_naming = settings.get("column_naming", "列1, 列2, ...")
         index = self.column_naming.findText(column_naming)
         if index >= 0:
-            self.column_naming.setCurrentIndex(index)
\ No newline at end of file
+            self.column_naming.setCurrentIndex(index)
+
+    def get_preference_settings(self):
+        """获取自动保存设置"""
+        return {
+            "auto_save": self.auto_save.isChecked(),
+            "auto_save_interval": self.auto_save_interval.value(),
+            "backup_enabled": self.backup_enabled.isChecked(),
+            "backup_count": self.backup_count.value()
+        }
+
+    def load_preference_settings(self, settings):
+        """加载自动保存设置"""
+        self.auto_save.setChecked(settings.get("auto_save", False))
+        self.auto_save_interval.setValue(settings.get("auto_save_interval", 5))
+        self.backup_enabled.setChecked(settings.get("backup_enabled", True))
+        self.backup_count.setValue(settings.get("backup_count", 3))
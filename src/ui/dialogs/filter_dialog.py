@@ -16,6 +16,7 @@ class FilterDialog(QDialog):
         self.current_operator = None           # 当前选择的运算符
         self.current_value = None              # 当前输入的值
         self.value_widget = None               # 动态值输入控件
+        self.filter_condition = None           # 确认后的过滤条件
         
         # 检查数据容器是否有效
         if self.data_container is None or not hasattr(self.data_container, 'get_table_headers'):
@@ -260,25 +261,18 @@ class FilterDialog(QDialog):
         # 获取是否区分大小写
         case_sensitive = self.case_sensitive_check.isChecked() if self.case_sensitive_check.isVisible() else False
         
-        # 创建过滤条件对象
-        filter_condition = {
+        # 创建过滤条件对象，由调用方在后台执行过滤
+        self.filter_condition = {
             "column": column_name,
             "operator": operator,
             "value": value,
             "case_sensitive": case_sensitive
         }
-        
-        # 应用过滤
-        try:
-            # 假设数据容器有一个apply_filter方法
-            success = self.data_container.apply_filter(filter_condition)
-            if success:
-                self.accept()  # 关闭对话框并返回成功
-            else:
-                QMessageBox.warning(self, "警告", "过滤应用失败！")
-        except Exception as e:
-            # 这里处理从 DataContainer 抛出的异常
-            QMessageBox.critical(self, "错误", f"过滤过程中发生错误：{str(e)}")
+        self.accept()
+
+    def get_filter_condition(self):
+        """获取确认后的过滤条件"""
+        return self.filter_condition
 
 
 if __name__ == "__main__":
@@ -310,7 +304,7 @@ if __name__ == "__main__":
     dialog = FilterDialog(data_container=data_container)
     
     if dialog.exec() == QDialog.DialogCode.Accepted:
-        print("Filter applied successfully")
+        data_container.apply_filter(dialog.get_filter_condition())
     else:
         print("Filter dialog cancelled")
     
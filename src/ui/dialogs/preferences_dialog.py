@@ -27,6 +27,8 @@ class PreferencesDialog(QDialog):
         self.data_interface_tab = DataInterfaceTab()
         # 加载当前设置
         self.data_interface_tab.load_settings(self.current_settings.get("data_interface", {}))
+        self.data_interface_tab.load_io_settings(self.current_settings.get("io", {}))
+        self.data_interface_tab.load_preference_settings(self.current_settings.get("user_preferences", {}))
         self.tab_widget.addTab(self.data_interface_tab, "数据界面设置")
         
         # 绘图参数设置标签页
@@ -52,11 +54,15 @@ class PreferencesDialog(QDialog):
         layout.addLayout(button_layout)
         
     def get_settings(self):
-        """获取所有设置"""
-        return {
+        """获取所有设置（未在对话框中编辑的部分保持原值）"""
+        settings = dict(self.current_settings)
+        settings.update({
             "data_interface": self.data_interface_tab.get_settings(),
-            "plot_settings": self.plot_settings_tab.get_settings()
-        }
+            "plot_settings": self.plot_settings_tab.get_settings(),
+            "io": self.data_interface_tab.get_io_settings(),
+            "user_preferences": self.data_interface_tab.get_preference_settings()
+        })
+        return settings
     
     def apply_settings(self):
         settings = self.get_settings()
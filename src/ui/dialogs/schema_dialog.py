@@ -0,0 +1,132 @@
+# src/ui/dialogs/schema_dialog.py
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QLineEdit, QCheckBox,
+                             QComboBox, QTableWidget, QTableWidgetItem, QHeaderView, QMessageBox)
+from PyQt6.QtCore import Qt
+from src.core.data_io.csv_schema import COLUMN_TYPES, CsvSchema
+
+# 样本类型的显示名称
+SAMPLE_TYPE_NAMES = {"int64": "整数", "float64": "浮点数", "object": "文本", "bool": "布尔"}
+
+# 每列显示的示例值个数
+EXAMPLE_VALUES = 5
+
+class SchemaDialog(QDialog):
+    """
+    导入CSV前设置导入结构：预览样本推断的各列类型，指定列类型、日期时间格式和缺失值标记，
+    可按文件名模式保存，之后打开匹配的文件时自动使用
+    """
+    def __init__(self, sample, sample_types, schema, file_name="", saved=False, parent=None):
+        super().__init__(parent)
+        self.sample = sample              # 样本（各列均为文本）
+        self.sample_types = sample_types  # 各列在样本中推断出的类型
+        self.schema = schema              # 初始结构（已保存的结构或从样本推断的结构）
+        self.file_name = file_name
+        self.saved = saved                # 初始结构是否为已保存的结构
+        self.setWindowTitle('导入结构')
+        self.resize(760, 480)
+        self.init_ui()
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+
+        source = '已保存的结构' if self.saved else '样本推断的结构'
+        layout.addWidget(QLabel(f'{self.file_name}：按{source}设置各列的类型，解析时直接得到对应类型的列'))
+
+        self.column_table = QTableWidget(len(self.sample.columns), 5)
+        self.column_table.setHorizontalHeaderLabels(['列名', '样本类型', '示例', '导入类型', '日期时间格式'])
+        self.column_table.verticalHeader().setVisible(False)
+        self.column_table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)
+        self.type_combos = []
+        self.format_edits = []
+        for row, name in enumerate(self.sample.columns):
+            examples = self.sample[name].dropna().head(EXAMPLE_VALUES).tolist()
+            sample_type = self.sample_types[row] if row < len(self.sample_types) else ""
+            for column, text in enumerate([name, SAMPLE_TYPE_NAMES.get(sample_type, sample_type), ', '.join(examples)]):
+                item = QTableWidgetItem(text)
+                item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)
+                self.column_table.setItem(row, column, item)
+
+            type_combo = QComboBox()
+            for key, label in COLUMN_TYPES.items():
+                type_combo.addItem(label, key)
+            type_combo.setCurrentIndex(max(type_combo.findData(self.schema.types.get(name, "auto")), 0))
+            self.column_table.setCellWidget(row, 3, type_combo)
+            self.type_combos.append(type_combo)
+
+            format_edit = QLineEdit(self.schema.datetime_formats.get(name, ""))
+            format_edit.setPlaceholderText('自动识别，如 %Y-%m-%d %H:%M:%S')
+            self.column_table.setCellWidget(row, 4, format_edit)
+            self.format_edits.append(format_edit)
+
+            type_combo.currentIndexChanged.connect(lambda _, row=row: self.update_format_edit(row))
+            self.update_format_edit(row)
+        layout.addWidget(self.column_table)
+
+        # 缺失值标记
+        na_layout = QHBoxLayout()
+        na_layout.addWidget(QLabel('缺失值标记:'))
+        self.na_edit = QLineEdit(', '.join(self.schema.na_values))
+        self.na_edit.setPlaceholderText('在默认标记（空、NA、null 等）之外，以逗号分隔，如 -, error')
+        na_layout.addWidget(self.na_edit)
+        layout.addLayout(na_layout)
+
+        # 保存结构
+        pattern_layout = QHBoxLayout()
+        self.remember_check = QCheckBox('保存结构，之后打开文件名匹配的文件时自动使用  模式:')
+        self.remember_check.setChecked(True)
+        if self.saved:
+            self.remember_check.setToolTip('取消勾选将删除已保存的结构')
+        self.pattern_edit = QLineEdit(self.schema.pattern)
+        self.pattern_edit.setToolTip('* 匹配任意字符，? 匹配单个字符，不区分大小写')
+        self.remember_check.toggled.connect(self.pattern_edit.setEnabled)
+        pattern_layout.addWidget(self.remember_check)
+        pattern_layout.addWidget(self.pattern_edit)
+        layout.addLayout(pattern_layout)
+
+        # 按钮布局
+        button_layout = QHBoxLayout()
+        self.reset_button = QPushButton('全部自动')
+        self.ok_button = QPushButton('导入')
+        self.cancel_button = QPushButton('取消')
+        button_layout.addWidget(self.reset_button)
+        button_layout.addStretch()
+        button_layout.addWidget(self.ok_button)
+        button_layout.addWidget(self.cancel_button)
+        layout.addLayout(button_layout)
+
+        self.reset_button.clicked.connect(self.reset_types)
+        self.ok_button.clicked.connect(self.accept)
+        self.cancel_button.clicked.connect(self.reject)
+
+        self.setLayout(layout)
+
+    def update_format_edit(self, row):
+        """只有日期时间列可以指定格式"""
+        self.format_edits[row].setEnabled(self.type_combos[row].currentData() == "datetime")
+
+    def reset_types(self):
+        """全部列改为由解析器推断"""
+        for type_combo in self.type_combos:
+            type_combo.setCurrentIndex(type_combo.findData("auto"))
+
+    def should_remember(self):
+        return self.remember_check.isChecked()
+
+    def get_schema(self):
+        """获取设置的导入结构"""
+        types = {}
+        datetime_formats = {}
+        for row, name in enumerate(self.sample.columns):
+            column_type = self.type_combos[row].currentData()
+            types[name] = column_type
+            if column_type == "datetime" and self.format_edits[row].text().strip():
+                datetime_formats[name] = self.format_edits[row].text().strip()
+        na_values = [token.strip() for token in self.na_edit.text().split(',') if token.strip()]
+        return CsvSchema(self.pattern_edit.text().strip(), types, datetime_formats, na_values)
+
+    def accept(self):
+        """保存结构时模式必须匹配当前文件，否则保存后对当前文件不起作用"""
+        if self.should_remember() and not self.get_schema().matches(self.file_name):
+            QMessageBox.warning(self, '错误', f'文件名模式与 {self.file_name} 不匹配')
+            return
+        super().accept()
@@ -0,0 +1,63 @@
+# src/ui/dialogs/sheet_picker_dialog.py
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QListWidget, QListWidgetItem
+from PyQt6.QtCore import Qt
+
+class SheetPickerDialog(QDialog):
+    """选择要导入的工作表，列表中显示各表的行列数"""
+    def __init__(self, sheets, file_name="", parent=None):
+        super().__init__(parent)
+        self.sheets = sheets
+        self.setWindowTitle('选择工作表')
+        self.resize(360, 300)
+        self.init_ui(file_name)
+
+    def init_ui(self, file_name):
+        layout = QVBoxLayout()
+
+        layout.addWidget(QLabel(f'{file_name} 包含 {len(self.sheets)} 个工作表，选择要导入的工作表：'))
+
+        self.sheet_list = QListWidget()
+        for index, sheet in enumerate(self.sheets):
+            rows = sheet.get("rows")
+            columns = sheet.get("columns")
+            size = f'{rows if rows is not None else "未知"} 行 × {columns if columns is not None else "未知"} 列'
+            item = QListWidgetItem(f'{sheet["name"]} ({size})')
+            item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+            # 默认只选中第一个工作表
+            item.setCheckState(Qt.CheckState.Checked if index == 0 else Qt.CheckState.Unchecked)
+            self.sheet_list.addItem(item)
+        layout.addWidget(self.sheet_list)
+
+        # 按钮布局
+        button_layout = QHBoxLayout()
+        self.select_all_button = QPushButton('全选')
+        self.ok_button = QPushButton('确定')
+        self.cancel_button = QPushButton('取消')
+        button_layout.addWidget(self.select_all_button)
+        button_layout.addStretch()
+        button_layout.addWidget(self.ok_button)
+        button_layout.addWidget(self.cancel_button)
+        layout.addLayout(button_layout)
+
+        self.select_all_button.clicked.connect(self.select_all)
+        self.ok_button.clicked.connect(self.accept)
+        self.cancel_button.clicked.connect(self.reject)
+        self.sheet_list.itemChanged.connect(self.update_ok_button)
+
+        self.setLayout(layout)
+
+    def select_all(self):
+        """选中全部工作表"""
+        for i in range(self.sheet_list.count()):
+            self.sheet_list.item(i).setCheckState(Qt.CheckState.Checked)
+
+    def update_ok_button(self, *args):
+        """至少选中一个工作表时才能确定"""
+        self.ok_button.setEnabled(bool(self.get_selected_sheets()))
+
+    def get_selected_sheets(self):
+        """获取选中的工作表信息"""
+        return [
+            sheet for i, sheet in enumerate(self.sheets)
+            if self.sheet_list.item(i).checkState() == Qt.CheckState.Checked
+        ]
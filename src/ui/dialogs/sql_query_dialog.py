@@ -0,0 +1,76 @@
+# src/ui/dialogs/sql_query_dialog.py
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QListWidget, QListWidgetItem,
+                             QPlainTextEdit, QSplitter)
+from PyQt6.QtCore import Qt
+from src.core.data_io.sqlite_io import table_query
+
+class SqlQueryDialog(QDialog):
+    """选择SQLite数据库中的表或输入SQL查询，筛选和聚合在数据库中执行，只导入查询结果"""
+    def __init__(self, tables, file_name="", parent=None):
+        super().__init__(parent)
+        self.tables = tables  # [{"name", "type", "columns": [(列名, 类型)]}]
+        self.setWindowTitle('打开SQLite数据库')
+        self.resize(640, 420)
+        self.init_ui(file_name)
+
+    def init_ui(self, file_name):
+        layout = QVBoxLayout()
+
+        layout.addWidget(QLabel(f'{file_name} 包含 {len(self.tables)} 个表/视图，选择要导入的表或编辑查询：'))
+
+        splitter = QSplitter(Qt.Orientation.Horizontal)
+        self.table_list = QListWidget()
+        for table in self.tables:
+            kind = '视图' if table["type"] == "view" else '表'
+            item = QListWidgetItem(f'{table["name"]} ({kind}, {len(table["columns"])} 列)')
+            item.setToolTip('\n'.join(f'{name} {column_type}'.rstrip() for name, column_type in table["columns"]))
+            self.table_list.addItem(item)
+        splitter.addWidget(self.table_list)
+
+        self.query_edit = QPlainTextEdit()
+        self.query_edit.setPlaceholderText('SELECT ... FROM ... WHERE ... GROUP BY ...')
+        splitter.addWidget(self.query_edit)
+        splitter.setSizes([200, 440])
+        layout.addWidget(splitter)
+
+        layout.addWidget(QLabel('查询以只读方式在数据库中执行，结果按批次读取并陆续显示'))
+
+        # 按钮布局
+        button_layout = QHBoxLayout()
+        self.ok_button = QPushButton('导入')
+        self.cancel_button = QPushButton('取消')
+        button_layout.addStretch()
+        button_layout.addWidget(self.ok_button)
+        button_layout.addWidget(self.cancel_button)
+        layout.addLayout(button_layout)
+
+        self.table_list.currentRowChanged.connect(self.select_table)
+        self.table_list.itemDoubleClicked.connect(lambda _: self.accept())
+        self.query_edit.textChanged.connect(self.update_ok_button)
+        self.ok_button.clicked.connect(self.accept)
+        self.cancel_button.clicked.connect(self.reject)
+
+        self.setLayout(layout)
+        if self.tables:
+            self.table_list.setCurrentRow(0)
+        self.update_ok_button()
+
+    def select_table(self, row):
+        """选择表时将查询设置为读取整个表"""
+        if 0 <= row < len(self.tables):
+            self.query_edit.setPlainText(table_query(self.tables[row]["name"]))
+
+    def update_ok_button(self):
+        """查询不为空时才能导入"""
+        self.ok_button.setEnabled(bool(self.get_query()))
+
+    def get_query(self):
+        return self.query_edit.toPlainText().strip().rstrip(';').strip()
+
+    def get_table_name(self):
+        """查询为读取整个表时返回表名，否则返回 None"""
+        query = self.get_query()
+        for table in self.tables:
+            if query == table_query(table["name"]):
+                return table["name"]
+        return None
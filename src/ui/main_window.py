@@ -2,22 +2,29 @@
 
 import pyqtgraph as pg
 from PyQt6.QtWidgets import QApplication, QMainWindow, QSplitter, QVBoxLayout, QHBoxLayout, QWidget, QMessageBox
-from PyQt6.QtCore import Qt
+from pathlib import Path
+from PyQt6.QtCore import Qt, QTimer
 from src.ui.menu import MenuBar
 from src.ui.core_components import (
     data_overview,
-    table_tab_area
+    table_tab_area,
+    job_status_bar
 )
-from src.core.signals import plot_signals, theme_signals
+from src.core.signals import plot_signals, theme_signals, container_signals
 from src.core.settings_manager import SettingsManager
 from src.core.theme_manager import ThemeManager
-from src.core.command_manager import CommandManager
+from src.core.job_runner import get_job_manager
+from src.utils.parallel import shutdown_process_pool
+from src.core.column_store import cleanup_stale_stores
+from src.core import autosave
 from src.ui.chart_windows import ChartWindow
 
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("V-Plotter")
+        # 接受拖放的文件和文件夹
+        self.setAcceptDrops(True)
         
         self.data_containers = []
         self.current_container = None
@@ -35,6 +42,8 @@ class MainWindow(QMainWindow):
         self.on_theme_changed('light')  # 应用主题
         
         self.show()
+        # 窗口显示后检查上次异常退出时的自动保存记录
+        QTimer.singleShot(0, self.recover_autosaves)
 
     def init_ui(self):
         # 创建菜单
@@ -63,6 +72,10 @@ class MainWindow(QMainWindow):
         main_layout = QVBoxLayout(central_widget)
         main_layout.addWidget(main_splitter)
         main_layout.setContentsMargins(5, 5, 5, 5)
+        
+        # 状态栏 - 显示后台任务
+        self.job_status = job_status_bar.JobStatusWidget(self)
+        self.statusBar().addPermanentWidget(self.job_status)
 
     def init_managers(self):
         """初始化管理器"""
@@ -70,16 +83,61 @@ class MainWindow(QMainWindow):
         self.settings = self.settings_manager.load_settings()
         self.theme_manager = ThemeManager()
         theme_signals.theme_changed.connect(self.on_theme_changed)
-        self.command_manager = CommandManager()
+        self.job_manager = get_job_manager()
+        # 删除上次异常退出时遗留的列存储缓存
+        cleanup_stale_stores()
+        # 自动保存：按 user_preferences 中的设置定时保存有修改的数据表
+        autosave.cleanup_expired()
+        self.autosave_manager = autosave.AutosaveManager(self.open_containers, self)
+        self.autosave_manager.apply_settings(self.settings.get("user_preferences", {}))
+        container_signals.container_ready.connect(self.autosave_manager.track)
     
     def init_data_containers(self):
         """初始化数据容器"""
         self.data_containers = []
         self.current_container = None
 
+    def open_containers(self):
+        """当前打开的全部数据容器"""
+        table_tab = getattr(getattr(self, "plot_area", None), "parent_table_tab", None)
+        if not table_tab:
+            return []
+        return [info["container"] for info in table_tab.tab_map.values()]
+
+    def recover_autosaves(self):
+        """上次未正常退出时提示恢复自动保存的数据表"""
+        entries = autosave.list_recoverable()
+        if not entries:
+            return
+        names = "\n".join(entry.get("name", "数据组") for entry in entries[:10])
+        answer = QMessageBox.question(
+            self, "恢复数据",
+            f"程序上次未正常退出，检测到 {len(entries)} 个自动保存的数据表：\n{names}\n是否恢复？"
+        )
+        for entry in entries:
+            if answer != QMessageBox.StandardButton.Yes:
+                # 不恢复的记录保留为备份，过期后删除
+                autosave.mark_clean(Path(entry["directory"]))
+                continue
+            self.job_manager.submit(
+                f"恢复 {entry.get('name', '数据组')}",
+                self.restore_autosave, entry["directory"],
+                on_finished=container_signals.container_ready.emit,
+                on_failed=lambda message: QMessageBox.warning(self, "错误", f"恢复数据失败：{message}")
+            )
+
+    def restore_autosave(self, job, directory):
+        """在后台线程中恢复一个自动保存的数据表"""
+        job.report_progress(-1, "正在恢复...")
+        try:
+            return autosave.restore(Path(directory))
+        finally:
+            autosave.mark_clean(Path(directory))
+
     def update_all_components_with_settings(self, settings):
         """使用新设置更新所有组件"""
         self.settings = settings
+        self.autosave_manager.apply_settings(settings.get("user_preferences", {}))
         
         # 更新数据界面设置
         data_interface = settings.get("data_interface", {})
@@ -109,6 +167,22 @@ class MainWindow(QMainWindow):
                 # 右侧垂直分割器：上70%，下30%
                 child.setSizes([int(height * 0.7), int(height * 0.3)])
     
+    def dragEnterEvent(self, event):
+        """拖入本地文件或文件夹时接受拖放"""
+        if any(url.isLocalFile() for url in event.mimeData().urls()):
+            event.acceptProposedAction()
+        else:
+            super().dragEnterEvent(event)
+
+    def dropEvent(self, event):
+        """放下的文件和文件夹交给文件菜单一并打开"""
+        paths = [url.toLocalFile() for url in event.mimeData().urls() if url.isLocalFile()]
+        if not paths:
+            super().dropEvent(event)
+            return
+        event.acceptProposedAction()
+        container_signals.open_files_requested.emit(paths)
+
     def on_container_selected(self):
         """当选择数据容器时更新视图"""
         selected_row = self.left_overview.data_list.currentRow()
@@ -131,12 +205,20 @@ class MainWindow(QMainWindow):
         """获取当前活动的表格标签页"""
         return self.plot_area.get_current_table_tab()
 
-    def get_command_manager(self):
-        """获取命令管理器"""
-        return self.command_manager
+    def get_command_manager(self, container=None):
+        """获取命令管理器：指定容器时返回其标签页的撤销历史，否则返回当前标签页的"""
+        parent_table_tab = self.plot_area.parent_table_tab
+        if container is not None:
+            tab_info = parent_table_tab.tab_map.get(container.uuid)
+            tab = tab_info["widget"] if tab_info else None
+        else:
+            tab = parent_table_tab.currentWidget()
+        return getattr(tab, "command_manager", None)
 
     def handle_chart_window_request(self, container, chart_type, options):
         """处理图表窗口请求"""
+        # 记录图表选项，随项目文件保存
+        container.metadata.setdefault("chart_options", {})[chart_type] = dict(options)
         chart_window = ChartWindow(container, chart_type, self, options)
         chart_window.exec()
  
@@ -147,6 +229,15 @@ class MainWindow(QMainWindow):
     def closeEvent(self, event):
         """窗口关闭事件"""
         self.settings_manager.save_window_state_and_geometry(self)
+        # 取消仍在运行的后台任务并等待其结束
+        self.job_manager.cancel_all()
+        self.job_manager.wait_for_done(3000)
+        shutdown_process_pool()
+        # 正常退出，自动保存记录不再提示恢复
+        self.autosave_manager.finish_session()
+        # 删除本次打开的超出内存数据表的列存储缓存
+        for container in self.open_containers():
+            container.release_store()
         # 调用父类的关闭事件处理
         super().closeEvent(event)
 
@@ -3,7 +3,7 @@
 
 from PyQt6.QtWidgets import QMenu
 from PyQt6.QtGui import QKeySequence
-from src.core.signals import edit_signals
+from src.core.signals import edit_signals, tab_signals
 
 find_requested = edit_signals.find_requested
 replace_requested = edit_signals.replace_requested
@@ -44,29 +44,37 @@ class EditMenu(QMenu):
         replace_requested.connect(self.handle_replace)  
         replace_all_requested.connect(self.handle_replace_all)
 
-        # 连接命令管理器
-        if self.main_window and hasattr(self.main_window, "command_manager"):
-            self.main_window.command_manager.command_executed.connect(self.update_actions)
-            self.main_window.command_manager.command_undone.connect(self.update_actions)
-            self.main_window.command_manager.command_redone.connect(self.update_actions)
-        
-        # 连接信号
-        edit_signals.undo_available.connect(self.setEnabled)
-        edit_signals.redo_available.connect(self.setEnabled)
+        # 撤销历史按标签页区分：切换标签页或任一历史变化时刷新
+        edit_signals.history_changed.connect(self.on_history_changed)
+        tab_signals.current_table_tab_changed.connect(self.update_actions)
+        self.update_actions()
+
+    def active_command_manager(self):
+        """当前标签页的命令管理器"""
+        if self.main_window and hasattr(self.main_window, "plot_area"):
+            return self.main_window.get_command_manager()
+        return None
+
+    def on_history_changed(self, command_manager):
+        """只有当前标签页的历史变化才需要刷新"""
+        if command_manager is self.active_command_manager():
+            self.update_actions()
     
-    def update_actions(self):
+    def update_actions(self, *args):
         """更新撤销/重做动作状态"""
-        if self.main_window and hasattr(self.main_window, "command_manager"):
-            self.undo_action.setEnabled(self.main_window.command_manager.can_undo)
-            self.redo_action.setEnabled(self.main_window.command_manager.can_redo)
+        command_manager = self.active_command_manager()
+        self.undo_action.setEnabled(command_manager is not None and command_manager.can_undo)
+        self.redo_action.setEnabled(command_manager is not None and command_manager.can_redo)
 
     def undo(self):
-        if self.main_window and hasattr(self.main_window, "command_manager"):
-            self.main_window.command_manager.undo()
+        command_manager = self.active_command_manager()
+        if command_manager:
+            command_manager.undo()
 
     def redo(self):
-        if self.main_window and hasattr(self.main_window, "command_manager"):
-            self.main_window.command_manager.redo()
+        command_manager = self.active_command_manager()
+        if command_manager:
+            command_manager.redo()
 
     def cut(self):
         current_tab = self.main_window.get_current_tab() if self.main_window else None
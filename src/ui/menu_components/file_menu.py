@@ -2,14 +2,36 @@
 # 这个文件是用来实现文件菜单的，包括新建、打开、保存、另存为、打印、退出等功能。
 
 import os
-import json
-import pandas as pd
-import numpy as np
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Optional, List, Any
-from PyQt6.QtWidgets import QMenu, QFileDialog, QMessageBox, QWidget
+from PyQt6.QtWidgets import QMenu, QFileDialog, QMessageBox, QWidget, QInputDialog
 from PyQt6.QtGui import QKeySequence
+from PyQt6.QtCore import QTimer
+from src.core import autosave
 from src.core.data_container import DataContainer
+from src.core.file_follower import FileFollower
+from src.core.data_io import csv_loader, excel_loader, json_loader, columnar_io, project_io, table_writer, parse_cache, compression, csv_schema, sniffer, sqlite_io
 from src.core.signals import container_signals, tab_signals
+from src.core.job_runner import get_job_manager
+from src.ui.dialogs.sheet_picker_dialog import SheetPickerDialog
+from src.ui.dialogs.column_picker_dialog import ColumnPickerDialog
+from src.ui.dialogs.schema_dialog import SchemaDialog
+from src.ui.dialogs.sql_query_dialog import SqlQueryDialog
+
+# 可以打开的数据文件拓展名（项目文件另行处理）
+OPENABLE_EXTENSIONS = (".csv", ".xlsx", ".xls", ".json", ".ndjson", ".jsonl", ".parquet", ".feather", ".arrow")
+
+# 最近打开的文件列表的最大长度
+MAX_RECENT_FILES = 10
+
+# 启动后等待多久（毫秒）开始预读最近打开的文件，有后台任务在运行时顺延
+PREFETCH_DELAY_MS = 3000
+
+# 预读时整表保留在内存中的文件大小上限，更大的文件只预热导入缓存
+PREFETCH_KEEP_BYTES = 256 * 1024 * 1024
+
+# 预热缓存文件时每次读取的字节数
+PREFETCH_BLOCK_BYTES = 4 * 1024 * 1024
 
 class FileMenu(QMenu):
     def __init__(self, parent=None, main_window=None):
@@ -19,8 +41,23 @@ class FileMenu(QMenu):
         # 文件操作
         self.new_action = self.addAction("&新建...", QKeySequence("Ctrl+N"))
         self.open_action = self.addAction("&打开...", QKeySequence("Ctrl+O"))
+        self.recent_menu = self.addMenu("最近打开的文件")
+        self.import_schema_action = self.addAction("按结构导入CSV...")
+        self.open_sqlite_action = self.addAction("打开SQLite数据库...")
         self.save_action = self.addAction("&保存", QKeySequence("Ctrl+S"))
         self.save_as_action = self.addAction("另存为")
+        self.save_sqlite_action = self.addAction("保存到SQLite数据库...")
+        self.follow_action = self.addAction("跟踪文件更新")
+        self.follow_action.setCheckable(True)
+        self.addSeparator()
+        
+        # 项目操作
+        self.open_project_action = self.addAction("打开项目...")
+        self.save_project_action = self.addAction("保存项目...")
+        self.addSeparator()
+        
+        # 缓存操作
+        self.clear_cache_action = self.addAction("清除导入缓存")
         self.addSeparator()
         
         # 打印操作
@@ -33,10 +70,30 @@ class FileMenu(QMenu):
         # 连接信号
         self.new_action.triggered.connect(self.new_file)
         self.open_action.triggered.connect(self.open_file)
+        self.import_schema_action.triggered.connect(self.import_csv_with_schema)
+        self.open_sqlite_action.triggered.connect(lambda: self.open_sqlite())
         self.save_action.triggered.connect(self.save_file)
         self.save_as_action.triggered.connect(self.save_as)
+        self.save_sqlite_action.triggered.connect(self.save_to_sqlite)
+        self.follow_action.triggered.connect(self.toggle_follow)
+        self.aboutToShow.connect(self.update_follow_action)
+        tab_signals.table_tab_closed.connect(self.stop_follow)
+        self.open_project_action.triggered.connect(lambda: self.open_project())
+        self.save_project_action.triggered.connect(self.save_project)
+        self.clear_cache_action.triggered.connect(self.clear_cache)
         self.print_action.triggered.connect(self.print_file)
         self.exit_action.triggered.connect(self.exit_app)
+        self.recent_menu.setToolTipsVisible(True)
+        self.recent_menu.aboutToShow.connect(self.update_recent_menu)
+        container_signals.open_files_requested.connect(self.open_paths)
+        
+        # 跟踪来源文件更新的数据表 {容器UUID: FileFollower}
+        self.followers = {}
+        
+        # 最近打开的文件：启动后空闲时在后台预读第一个文件，点击时直接显示
+        self.recent_missing = set()
+        self.prefetched = None
+        QTimer.singleShot(PREFETCH_DELAY_MS, self.prefetch_recent)
 
     def new_file(self):
         if self.main_window:
@@ -46,118 +103,932 @@ class FileMenu(QMenu):
             QMessageBox.warning(self.main_window, "错误", "无法访问主窗口")
 
     def open_file(self):
-        """打开文件并进行操作"""
+        """选择一个或多个文件并打开"""
         try:
             file_dialog = QFileDialog(self, "打开文件")
-            file_path, _ = file_dialog.getOpenFileName(
+            file_paths, _ = file_dialog.getOpenFileNames(
                 parent=self, 
                 caption="打开文件", 
                 directory="", 
-                filter="所有支持的文件(*.csv *.xlsx *.xls *.json);;csv文件(*.csv);;xlsx文件(*.xlsx, *.xls);;json文件(*.json)"
+                filter="所有支持的文件(*.csv *.xlsx *.xls *.json *.ndjson *.jsonl *.parquet *.feather *.arrow *.vplot *.gz *.bz2 *.xz *.zst *.db *.sqlite *.sqlite3);;csv文件(*.csv);;xlsx文件(*.xlsx, *.xls);;json文件(*.json *.ndjson *.jsonl);;parquet文件(*.parquet);;feather文件(*.feather *.arrow);;压缩的csv/json文件(*.gz *.bz2 *.xz *.zst);;SQLite数据库(*.db *.sqlite *.sqlite3);;项目文件(*.vplot)"
             )
-            if not file_path:
+            if not file_paths:
                 return  # 用户取消操作
-            # 加载文件拓展名，并根据拓展名调用相应的加载函数
-            extension = os.path.splitext(file_path)[1].lower()
-            # 创建数据容器
-            container = DataContainer()
-            container.name = os.path.splitext(os.path.basename(file_path))[0]
-            container.source = file_path
-            container.data_type = extension.replace(".", "")
-            # 加载数据
-            if extension == ".csv":
-                self.load_csv(file_path, container)
-            elif extension in [".xlsx", ".xls"]:
-                self.load_excel(file_path, container)
-            elif extension == ".json":
-                self.load_json(file_path, container)
+        except Exception as e:
+            QMessageBox.warning(self.main_window, "错误", f"打开文件失败：{str(e)}")
+            return
+        self.open_paths(file_paths)
+
+    def open_paths(self, paths):
+        """
+        打开多个文件（文件夹展开为其中的数据文件）
+
+        只有一个文件时按 open_path 逐步打开（可选择工作表、列，大文件流式导入）；
+        多个文件在后台并发解析，每解析完一个即在新标签页中显示
+        """
+        file_paths = []
+        for path in paths:
+            if os.path.isdir(path):
+                file_paths.extend(sorted(
+                    entry.path for entry in os.scandir(path)
+                    if entry.is_file() and self.unsupported_reason(entry.path) is None
+                ))
+            else:
+                file_paths.append(path)
+        if not file_paths:
+            QMessageBox.warning(self.main_window, "错误", "没有可打开的文件")
+            return
+        if len(file_paths) == 1:
+            self.open_path(file_paths[0])
+            return
+        
+        batch = []
+        skipped = []
+        for file_path in file_paths:
+            extension = compression.data_extension(file_path)
+            reason = self.unsupported_reason(file_path)
+            if os.path.splitext(file_path)[1].lower() == project_io.PROJECT_EXTENSION:
+                self.open_project(file_path)
+            elif os.path.splitext(file_path)[1].lower() in sqlite_io.SQLITE_EXTENSIONS:
+                self.open_sqlite(file_path)
+            elif reason is not None:
+                skipped.append(f"{os.path.basename(file_path)}：{reason}")
+            elif extension == ".csv" and self.should_use_column_store(file_path):
+                self.open_csv_out_of_core(file_path)
             else:
-                QMessageBox.warning(self.main_window, "错误", "不支持的文件类型")
+                batch.append((file_path, self.cache_options(file_path)))
+        if skipped:
+            QMessageBox.warning(self.main_window, "错误", "以下文件无法打开：\n" + "\n".join(skipped[:10]))
+        if not batch:
+            return
+        
+        def on_finished(failures):
+            if failures:
+                more = f"\n……共 {len(failures)} 个文件" if len(failures) > 10 else ""
+                QMessageBox.warning(self.main_window, "错误", "以下文件打开失败：\n" + "\n".join(failures[:10]) + more)
+        
+        get_job_manager().submit(
+            f"打开 {len(batch)} 个文件",
+            self.read_files, batch,
+            on_partial=self.on_file_loaded,
+            on_finished=on_finished,
+            on_failed=lambda message: QMessageBox.warning(self.main_window, "错误", f"打开文件失败：{message}")
+        )
+
+    def open_path(self, file_path):
+        """按文件类型打开文件"""
+        try:
+            # 加载文件拓展名（压缩文件为被压缩的数据文件的拓展名），检查是否支持
+            if os.path.splitext(file_path)[1].lower() == project_io.PROJECT_EXTENSION:
+                self.open_project(file_path)
+                return
+            # SQLite数据库先选择表或输入查询
+            if os.path.splitext(file_path)[1].lower() in sqlite_io.SQLITE_EXTENSIONS:
+                self.open_sqlite(file_path)
+                return
+            reason = self.unsupported_reason(file_path)
+            if reason is not None:
+                QMessageBox.warning(self.main_window, "错误", reason)
                 return
+            extension = compression.data_extension(file_path)
             
-            # 检查数据有效性
-            if container.dataframe is None or container.dataframe.empty:
-                QMessageBox.warning(self.main_window, "警告", "文件内容为空或格式不正确")
+            # 超出内存的CSV文件写入磁盘列存储，以只读方式分页显示
+            if extension == ".csv" and self.should_use_column_store(file_path):
+                self.open_csv_out_of_core(file_path)
                 return
             
-            # 通知主窗口更新数据容器
-            container_signals.container_ready.emit(container)
-        except Exception as e:
-            QMessageBox.warning(self.main_window, "错误", f"打开文件失败：{str(e)}")
-
-    ## open选项下函数
-    def load_csv(self, file_path, container):
-        """加载CSV文件"""
-        try:
-            # 尝试读取第一行来判断是否为表头
-            first_row = pd.read_csv(file_path, nrows=1, header=None)
+            # 已在后台预读的最近文件直接显示
+            options = self.cache_options(file_path)
+            container = self.take_prefetched(file_path, options)
+            if container is not None:
+                self.on_file_loaded(container)
+                return
             
-            # 检查第一行是否主要为数值
-            if is_numeric_row(first_row.iloc[0]):
-                # 数值无表头
-                df = pd.read_csv(file_path, header=None)
-                headers = [f"列{i+1}" for i in range(df.shape[1])]  # 生成默认列名
-            else:
-                # 非数值，作为表头
-                df = pd.read_csv(file_path)
-                headers = df.columns.tolist()
+            # 有缓存的文件直接读取缓存，不重新解析
+            if options is not None and parse_cache.lookup(file_path, options):
+                get_job_manager().submit(
+                    f"打开 {os.path.basename(file_path)}",
+                    self.read_cached, file_path, options,
+                    on_finished=self.on_file_loaded,
+                    on_failed=lambda message: QMessageBox.warning(self.main_window, "错误", f"打开文件失败：{message}")
+                )
+                return
             
-            # 获取数据数组
-            data_array = df.to_numpy()
+            # 大型CSV文件以流式分块导入，先显示第一块
+            if extension == ".csv" and self.should_stream(file_path) and not self.should_read_parallel(file_path):
+                self.stream_csv(file_path)
+                return
             
-            # 获取数据
-            container.set_table_data(data_array, headers)
+            # Excel文件先列出工作表供选择，再读取选中的工作表
+            if extension in [".xlsx", ".xls"]:
+                self.open_excel(file_path)
+                return
             
+            # 列式文件先读取元数据，选择要加载的列后只解码这些列
+            if columnar_io.file_format(file_path):
+                self.open_columnar(file_path)
+                return
+            
+            # 在后台线程中解析文件，完成后在GUI线程中通知
+            get_job_manager().submit(
+                f"打开 {os.path.basename(file_path)}",
+                self.load_file, file_path,
+                on_finished=self.on_file_loaded,
+                on_failed=lambda message: QMessageBox.warning(self.main_window, "错误", f"打开文件失败：{message}")
+            )
         except Exception as e:
-            QMessageBox.warning(self.main_window, "错误", f"加载CSV文件时出错: {str(e)}")
+            QMessageBox.warning(self.main_window, "错误", f"打开文件失败：{str(e)}")
+
+    def import_csv_with_schema(self):
+        """选择CSV文件，在导入结构对话框中确认各列类型后导入"""
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "按结构导入CSV", "", "csv文件(*.csv *.csv.gz *.csv.bz2 *.csv.xz *.csv.zst)"
+        )
+        if not file_path:
+            return  # 用户取消操作
+        if compression.data_extension(file_path) != ".csv" or self.unsupported_reason(file_path) is not None:
+            QMessageBox.warning(self.main_window, "错误", "请选择CSV文件")
             return
-    def load_excel(self, file_path, container):
-        """加载Excel文件，智能识别第一行是否为表头"""
+
+        def on_sampled(result):
+            fmt, sample, schema = result
+            saved = fmt.schema is not None
+            dialog = SchemaDialog(
+                sample, [fmt.dtypes.get(i, "") for i in range(sample.shape[1])], schema,
+                os.path.basename(file_path), saved, self.main_window
+            )
+            if not dialog.exec():
+                return
+            schema = dialog.get_schema()
+            if dialog.should_remember() and not schema.is_empty():
+                if saved and fmt.schema.pattern != schema.pattern:
+                    csv_schema.forget_schema(fmt.schema.pattern)
+                csv_schema.remember_schema(schema)
+                # 保存的结构由嗅探自动附加，按常规流程打开（大文件同样流式导入或写入列存储）
+                self.open_path(file_path)
+                return
+            if saved:
+                csv_schema.forget_schema(fmt.schema.pattern)
+            fmt.schema = None if schema.is_empty() else schema
+            get_job_manager().submit(
+                f"打开 {os.path.basename(file_path)}",
+                self.load_csv_with_schema, file_path, fmt,
+                on_finished=self.on_file_loaded,
+                on_failed=lambda message: QMessageBox.warning(self.main_window, "错误", f"打开文件失败：{message}")
+            )
+
+        get_job_manager().submit(
+            f"读取样本 {os.path.basename(file_path)}",
+            self.read_schema_sample, file_path,
+            on_finished=on_sampled,
+            on_failed=lambda message: QMessageBox.warning(self.main_window, "错误", f"读取文件失败：{message}")
+        )
+
+    def read_schema_sample(self, job, file_path):
+        """在后台线程中嗅探文件并读取样本，返回 (格式, 样本, 初始结构)；没有保存的结构时从样本推断"""
+        job.report_progress(-1, "正在读取样本...")
+        fmt = sniffer.sniff_csv(file_path)
+        text = sniffer.read_sample(file_path).decode(fmt.encoding, errors="replace")
+        sample = csv_schema.sample_frame(text, sniffer.column_names(fmt), fmt.has_header, fmt.delimiter)
+        schema = fmt.schema or csv_schema.infer_schema(sample, csv_schema.default_pattern(file_path))
+        return fmt, sample, schema
+
+    def load_csv_with_schema(self, job, file_path, fmt):
+        """在后台线程中按单次指定（不保存）的导入结构解析文件"""
+        job.report_progress(-1, "正在解析...")
+        container = self.create_container(file_path)
         try:
-            # 首先尝试读取第一行来判断是否为表头
-            first_row = pd.read_excel(file_path, nrows=1, header=None)
-            
-            # 检查第一行是否主要为数值
-            if is_numeric_row(first_row.iloc[0]):
-                # 第一行是数值，没有表头
-                df = pd.read_excel(file_path, header=None)
-                headers = [f"列{i+1}" for i in range(df.shape[1])]  # 生成默认列名
-            else:
-                # 第一行不是数值，作为表头
-                df = pd.read_excel(file_path)
-                headers = df.columns.tolist()
-            
-            # 获取数据数组
-            data_array = df.to_numpy()
-            
-            # 获取数据
-            container.set_table_data(data_array, headers)
-            
+            csv_loader.load_csv(file_path, container, fmt, engine=self.io_settings().get("csv_engine", "auto"))
         except Exception as e:
-            QMessageBox.warning(self.main_window, "错误", f"加载Excel文件时出错: {str(e)}")
-            return
-
-    def load_json(self, file_path, container):
-        """ 加载json文件 """
-        with open(file_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
-        if isinstance(data, list) and all(isinstance(row, dict) for row in data):
-            # 列表中每个元素都是字典
-            headers = list(data[0].keys()) if data else []
-            rows = []
-            for row in data:
-                row.append([row.get(header, "") for header in headers])
-            data_array = np.array(rows)
-        elif isinstance(data, dict) and 'data' in data and 'columns' in data:
-            # 字典中包含data和columns两个键
-            headers = data.get('columns', [])
-            data_array = np.array(data.get('data', []))
+            raise ValueError(f"加载CSV文件时出错: {str(e)}") from e
+        job.check_cancelled()
+        # 记录使用的结构和解析方式，自动保存恢复时按同样的方式重新读取；这样的结果不写入导入缓存
+        container.set_origin(
+            file_path, **csv_loader.origin_options(fmt),
+            **({"schema": fmt.schema.to_dict()} if fmt.schema is not None else {})
+        )
+        return container
+
+    def open_sqlite(self, file_path=None):
+        """打开SQLite数据库：后台列出表，选择表或输入查询后在后台执行查询，结果按批次陆续显示"""
+        if file_path is None:
+            file_path, _ = QFileDialog.getOpenFileName(
+                self, "打开SQLite数据库", "", "SQLite数据库(*.db *.sqlite *.sqlite3);;所有文件(*)"
+            )
+            if not file_path:
+                return  # 用户取消操作
+
+        def on_listed(tables):
+            dialog = SqlQueryDialog(tables, os.path.basename(file_path), self.main_window)
+            if not dialog.exec():
+                return
+            query = dialog.get_query()
+            table_name = dialog.get_table_name()
+            container = self.create_container(file_path)
+            container.name = table_name or "查询结果"
+            container.data_type = "sqlite"
+            if table_name:
+                container.metadata["table"] = table_name
+            batch_rows = self.io_settings().get("stream_chunk_rows", 100000)
+            self.stream_into(
+                container, file_path, self.read_query_batches, file_path, query, batch_rows,
+                empty_message="查询结果为空", query=query
+            )
+
+        get_job_manager().submit(
+            f"读取数据库 {os.path.basename(file_path)}",
+            self.list_sqlite_tables, file_path,
+            on_finished=on_listed,
+            on_failed=lambda message: QMessageBox.warning(self.main_window, "错误", f"打开数据库失败：{message}")
+        )
+
+    def list_sqlite_tables(self, job, file_path):
+        """在后台线程中列出数据库中的表和视图"""
+        job.report_progress(-1, "正在读取表结构...")
+        return sqlite_io.list_tables(file_path)
+
+    def unsupported_reason(self, file_path):
+        """文件不能打开时返回原因，否则返回 None；压缩文件（如 .csv.gz）只支持CSV和JSON"""
+        codec = compression.compression_of(file_path)
+        extension = compression.data_extension(file_path)
+        if codec is None:
+            return None if extension in OPENABLE_EXTENSIONS else "不支持的文件类型"
+        if extension not in compression.COMPRESSIBLE_EXTENSIONS:
+            return "压缩文件只支持CSV和JSON"
+        if not compression.compression_available(codec):
+            return f"读取{codec}压缩文件需要安装zstandard或pyarrow"
+        return None
+
+    def open_project(self, file_path=None):
+        """打开项目文件：立即恢复全部数据表的标签页，各表的数据在首次显示时读取"""
+        if not file_path:
+            file_path, _ = QFileDialog.getOpenFileName(
+                parent=self,
+                caption="打开项目",
+                directory="",
+                filter="项目文件(*.vplot)"
+            )
+            if not file_path:
+                return  # 用户取消操作
+        
+        get_job_manager().submit(
+            f"打开项目 {os.path.basename(file_path)}",
+            self.read_project, file_path,
+            on_finished=lambda containers: self.on_project_opened(containers, file_path),
+            on_failed=lambda message: QMessageBox.warning(self.main_window, "错误", f"打开项目失败：{message}")
+        )
+
+    def read_project(self, job, file_path):
+        """在后台线程中读取项目清单"""
+        job.report_progress(-1, "正在读取项目...")
+        return project_io.open_project(file_path)
+
+    def on_project_opened(self, containers, file_path=None):
+        """项目清单读取完成（GUI线程）：创建各数据表的标签页并激活第一个"""
+        if not containers:
+            QMessageBox.warning(self.main_window, "警告", "项目中没有数据表")
+            return
+        for container in containers:
+            container_signals.container_ready.emit(container)
+        tab_signals.activate_table_tab.emit(containers[0].uuid)
+        if file_path:
+            self.add_recent_file(file_path, tables=len(containers))
+
+    def save_project(self):
+        """将全部数据表保存为项目文件"""
+        if not hasattr(self.main_window, 'plot_area'):
+            QMessageBox.warning(self.main_window, "错误", "\n无法访问绘图区域\t")
+            return
+        
+        table_tab = self.main_window.plot_area.parent_table_tab
+        tab_infos = sorted(table_tab.tab_map.values(), key=lambda info: info["index"])
+        if not tab_infos:
+            QMessageBox.warning(self.main_window, "错误", "当前没有可保存的数据表\t")
+            return
+        
+        file_path, _ = QFileDialog.getSaveFileName(
+            parent=self,
+            caption="保存项目",
+            directory="",
+            filter="项目文件(*.vplot)"
+        )
+        if not file_path:
+            return  # 用户取消操作
+        if os.path.splitext(file_path)[1].lower() != project_io.PROJECT_EXTENSION:
+            file_path += project_io.PROJECT_EXTENSION
+        
+        # 在后台线程中写入各数据表的快照
+        snapshots = [info["container"].snapshot() for info in tab_infos]
+        get_job_manager().submit(
+            f"保存项目 {os.path.basename(file_path)}",
+            self.write_project, file_path, snapshots,
+            on_finished=lambda _: QMessageBox.information(self.main_window, "提示", "项目已保存\t"),
+            on_failed=lambda message: QMessageBox.warning(self.main_window, "错误", f"保存项目失败：{message}\t")
+        )
+
+    def write_project(self, job, file_path, snapshots):
+        """在后台线程中写入项目文件"""
+        job.report_progress(0, "正在保存项目...")
+        project_io.save_project(
+            file_path, snapshots,
+            progress=lambda done, total: job.report_progress(done * 100 // total, f"已保存 {done}/{total} 个数据表"),
+            check_cancelled=job.check_cancelled
+        )
+        return file_path
+
+    def create_container(self, file_path):
+        """为要打开的文件创建空的数据容器"""
+        extension = compression.data_extension(file_path)
+        container = DataContainer()
+        container.name = os.path.splitext(os.path.basename(compression.strip_compression(file_path)))[0]
+        container.source = file_path
+        container.data_type = extension.replace(".", "")
+        return container
+
+    def load_file(self, job, file_path):
+        """在后台线程中加载文件到新的数据容器"""
+        extension = compression.data_extension(file_path)
+        # 创建数据容器
+        container = self.create_container(file_path)
+        # 加载数据
+        job.report_progress(-1, "正在解析...")
+        options = {}
+        if extension == ".csv":
+            options = self.load_csv(file_path, container, job)
+        elif extension in [".xlsx", ".xls"]:
+            self.load_excel(file_path, container)
+        elif extension in [".json", ".ndjson", ".jsonl"]:
+            self.load_json(file_path, container, job)
+        elif columnar_io.file_format(file_path):
+            self.load_columnar(file_path, container)
+        job.check_cancelled()
+        # 记录来源文件和实际使用的解析方式，自动保存以其为基准只保存之后的修改
+        container.set_origin(file_path, **options)
+        return container
+
+    def read_files(self, job, batch):
+        """
+        在后台线程中并发解析多个文件，每解析完一个交付GUI线程，返回打开失败的文件及原因
+
+        线程数不超过CPU数；CSV（pandas、pyarrow）和Parquet/Feather的解析在C代码中进行，会释放GIL，
+        多个文件可在线程中并行解析。每个文件只解析一次，不做字节范围的多进程切分
+        """
+        total = len(batch)
+        job.report_progress(0, f"已打开 0/{total}")
+        failures = []
+        with ThreadPoolExecutor(max_workers=min(total, os.cpu_count() or 1)) as executor:
+            futures = {executor.submit(self.read_file, file_path, options): file_path for file_path, options in batch}
+            try:
+                for done, future in enumerate(as_completed(futures), 1):
+                    job.check_cancelled()
+                    try:
+                        job.emit_partial(future.result())
+                    except Exception as e:
+                        failures.append(f"{os.path.basename(futures[future])}：{e}")
+                    job.report_progress(done * 100 // total, f"已打开 {done}/{total}")
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+        return failures
+
+    def read_file(self, file_path, options=None):
+        """
+        在工作线程中解析单个文件（有导入缓存时读取缓存），返回数据容器
+
+        Excel文件读取第一个工作表，列式文件读取全部列
+        """
+        container = self.create_container(file_path)
+        path = parse_cache.lookup(file_path, options) if options is not None else None
+        if path is not None:
+            try:
+                container.set_dataframe(parse_cache.read(path))
+                container.set_origin(file_path, **parse_cache.read_options(path))
+                return container
+            except Exception:
+                path.unlink(missing_ok=True)
+        extension = compression.data_extension(file_path)
+        options = {}
+        if extension == ".csv":
+            options = self.load_csv(file_path, container)
+        elif extension in [".xlsx", ".xls"]:
+            self.load_excel(file_path, container)
+        elif extension in [".json", ".ndjson", ".jsonl"]:
+            self.load_json(file_path, container)
+        else:
+            self.load_columnar(file_path, container)
+        if container.dataframe is None or container.dataframe.empty:
+            raise ValueError("文件内容为空或格式不正确")
+        container.set_origin(file_path, **options)
+        return container
+
+    def on_file_loaded(self, container):
+        """文件加载完成（GUI线程）"""
+        # 检查数据有效性
+        if container.is_out_of_core():
+            empty = container.row_count == 0
+        else:
+            empty = container.dataframe is None or container.dataframe.empty
+        if empty:
+            container.release_store()
+            QMessageBox.warning(self.main_window, "警告", "文件内容为空或格式不正确")
+            return
+        
+        # 通知主窗口更新数据容器
+        container_signals.container_ready.emit(container)
+        self.add_recent_file(container.source, container)
+        self.cache_container(container)
+
+    def recent_files(self):
+        """最近打开的文件列表，最近的在前"""
+        settings = getattr(self.main_window, "settings", None) or {}
+        return [entry for entry in settings.get("recent_files", []) if isinstance(entry, dict) and entry.get("path")]
+
+    def save_recent_files(self, recent):
+        settings = getattr(self.main_window, "settings", None)
+        if settings is None:
+            return
+        settings["recent_files"] = recent
+        self.main_window.settings_manager.save_recent_files(recent)
+
+    def add_recent_file(self, file_path, container=None, tables=None):
+        """将文件移到最近打开的文件列表最前面，并记录其行列数（或数据表数）供菜单显示"""
+        entry = {"path": os.path.abspath(file_path)}
+        if container is not None:
+            entry["rows"] = container.row_count
+            entry["columns"] = len(container.get_table_headers())
+        if tables is not None:
+            entry["tables"] = tables
+        self.recent_missing.discard(entry["path"])
+        recent = [item for item in self.recent_files() if item["path"] != entry["path"]]
+        self.save_recent_files([entry] + recent[:MAX_RECENT_FILES - 1])
+
+    def recent_label(self, entry):
+        """菜单项文字：文件名及上次打开时记录的行列数，不读取文件"""
+        name = os.path.basename(entry["path"]).replace("&", "&&")
+        if entry["path"] in self.recent_missing:
+            return f"{name}（文件不存在）"
+        if "tables" in entry:
+            return f"{name}  ({entry['tables']} 个数据表)"
+        if "rows" in entry:
+            return f"{name}  ({entry['rows']:,} 行 × {entry['columns']} 列)"
+        return name
+
+    def update_recent_menu(self):
+        """显示前重建最近打开的文件子菜单"""
+        self.recent_menu.clear()
+        recent = self.recent_files()
+        if not recent:
+            self.recent_menu.addAction("（无）").setEnabled(False)
+            return
+        for i, entry in enumerate(recent, 1):
+            action = self.recent_menu.addAction(f"&{i % 10} {self.recent_label(entry)}")
+            action.setToolTip(entry["path"])
+            action.triggered.connect(lambda checked=False, path=entry["path"]: self.open_recent(path))
+        self.recent_menu.addSeparator()
+        self.recent_menu.addAction("清除列表").triggered.connect(self.clear_recent_files)
+
+    def open_recent(self, file_path):
+        """打开最近打开的文件，文件已不存在时询问是否从列表中移除"""
+        if not os.path.exists(file_path):
+            self.recent_missing.add(file_path)
+            answer = QMessageBox.question(
+                self.main_window, "文件不存在",
+                f"{file_path}\n已不存在，是否从最近打开的文件中移除？"
+            )
+            if answer == QMessageBox.StandardButton.Yes:
+                self.save_recent_files([entry for entry in self.recent_files() if entry["path"] != file_path])
+            return
+        self.open_path(file_path)
+
+    def clear_recent_files(self):
+        self.save_recent_files([])
+        self.recent_missing = set()
+        self.prefetched = None
+
+    def prefetch_recent(self):
+        """启动后空闲时在后台检查最近打开的文件，并预读第一个文件"""
+        job_manager = get_job_manager()
+        if job_manager.running_jobs():
+            # 有后台任务（如恢复数据、打开文件）时顺延
+            QTimer.singleShot(PREFETCH_DELAY_MS, self.prefetch_recent)
+            return
+        recent = self.recent_files()
+        if not recent:
+            return
+        limit_bytes = self.io_settings().get("cache_limit_mb", 4096) * 1024 * 1024
+        job_manager.submit(
+            "预读最近打开的文件",
+            self.read_recent, [entry["path"] for entry in recent], limit_bytes,
+            on_finished=self.on_recent_prefetched
+        )
+
+    def read_recent(self, job, paths, limit_bytes):
+        """
+        在后台线程中检查最近打开的文件是否存在，并预读第一个文件，返回 (不存在的文件, 预读结果)
+
+        只预读有导入缓存的CSV/JSON文件：缓存不存在时解析并写入缓存；
+        不超过 PREFETCH_KEEP_BYTES 的文件整表保留在内存中，更大的文件只将缓存读入系统页缓存
+        """
+        job.report_progress(-1, "正在检查最近打开的文件...")
+        missing = {path for path in paths if not os.path.isfile(path)}
+        file_path = next((path for path in paths if path not in missing), None)
+        if file_path is None:
+            return missing, None
+        # Excel、列式文件打开时需要选择工作表或列，项目文件按需读取，均不预读
+        options = self.cache_options(file_path)
+        if options is None or self.should_use_column_store(file_path):
+            return missing, None
+        job.report_progress(-1, f"正在预读 {os.path.basename(file_path)}...")
+        keep = os.path.getsize(file_path) <= PREFETCH_KEEP_BYTES
+        path = parse_cache.lookup(file_path, options)
+        if path is not None and not keep:
+            self.warm_file(job, path)
+            return missing, None
+        if path is not None:
+            container = self.read_cached(job, file_path, options)
         else:
-            QMessageBox.warning(self.main_window, "错误", "不支持的json格式\t")
+            container = self.load_file(job, file_path)
+            origin = container.origin
+            if container.dataframe is not None and not container.dataframe.empty:
+                job.report_progress(-1, "正在写入缓存...")
+                parse_cache.store(
+                    origin["path"], origin["size"], origin["mtime"], options, container.dataframe, limit_bytes,
+                    container.origin_options()
+                )
+        return missing, ((options, container) if keep else None)
+
+    def warm_file(self, job, path):
+        """顺序读取文件使其进入系统页缓存，之后内存映射读取时无需等待磁盘"""
+        with open(path, "rb") as f:
+            while f.read(PREFETCH_BLOCK_BYTES):
+                job.check_cancelled()
+
+    def on_recent_prefetched(self, result):
+        """预读完成（GUI线程）：保存预读的数据容器，打开该文件时直接显示"""
+        self.recent_missing, prefetched = result
+        if prefetched is None:
+            return
+        _, container = prefetched
+        # 预读期间已打开了该文件时丢弃
+        open_containers = self.main_window.open_containers() if hasattr(self.main_window, "open_containers") else []
+        if any(opened.origin and opened.origin["path"] == container.origin["path"] for opened in open_containers):
+            return
+        self.prefetched = prefetched
+
+    def take_prefetched(self, file_path, options):
+        """取出该文件的预读结果；文件或解析选项在预读后发生变化时丢弃，返回 None"""
+        if self.prefetched is None:
+            return None
+        prefetched_options, container = self.prefetched
+        if container.origin["path"] != os.path.abspath(file_path):
+            return None
+        self.prefetched = None
+        if prefetched_options != options or not autosave.origin_unchanged(container.origin):
+            return None
+        return container
+
+    def io_settings(self):
+        """获取导入导出相关设置"""
+        settings = getattr(self.main_window, "settings", None) or {}
+        return settings.get("io", {})
+
+    def should_stream(self, file_path):
+        """文件超过设定大小时使用流式导入"""
+        threshold = self.io_settings().get("stream_threshold_mb", 64) * 1024 * 1024
+        return os.path.getsize(file_path) >= threshold
+
+    def cache_options(self, file_path):
+        """可缓存的文件返回其解析选项（作为缓存键的一部分），否则返回 None"""
+        io_settings = self.io_settings()
+        if not io_settings.get("cache_enabled", True) or not parse_cache.cache_available():
+            return None
+        extension = compression.data_extension(file_path)
+        if extension == ".csv":
+            options = {"loader": "csv", "engine": csv_loader.resolve_engine(io_settings.get("csv_engine", "auto"))}
+            # 文件名匹配已保存的导入结构时，结构也是缓存键的一部分，修改结构后缓存自然失效
+            schema = csv_schema.schema_for(file_path)
+            if schema is not None:
+                options["schema"] = schema.to_dict()
+            return options
+        if extension in [".json", ".ndjson", ".jsonl"]:
+            return {"loader": "json"}
+        return None
+
+    def read_cached(self, job, file_path, options):
+        """在后台线程中读取缓存的解析结果，缓存损坏时删除并重新解析"""
+        job.report_progress(-1, "正在读取缓存...")
+        path = parse_cache.lookup(file_path, options)
+        try:
+            dataframe = parse_cache.read(path)
+        except Exception:
+            path.unlink(missing_ok=True)
+            return self.load_file(job, file_path)
+        container = self.create_container(file_path)
+        container.set_dataframe(dataframe)
+        container.set_origin(file_path, **parse_cache.read_options(path))
+        return container
+
+    def cache_container(self, container):
+        """在后台将刚解析的文件写入导入缓存"""
+        origin = container.origin
+        if origin is None or container.is_out_of_core() or container.dataframe is None or "schema" in origin:
+            return
+        options = self.cache_options(origin["path"])
+        if options is None or parse_cache.cache_path(origin["path"], origin["size"], origin["mtime"], options).exists():
+            return
+        limit_bytes = self.io_settings().get("cache_limit_mb", 4096) * 1024 * 1024
+        get_job_manager().submit(
+            f"缓存 {container.name}",
+            self.write_cache, origin, options, container.snapshot(), limit_bytes
+        )
+
+    def write_cache(self, job, origin, options, snapshot, limit_bytes):
+        """在后台线程中写入导入缓存"""
+        job.report_progress(-1, "正在写入缓存...")
+        return parse_cache.store(
+            origin["path"], origin["size"], origin["mtime"], options, snapshot.dataframe, limit_bytes,
+            snapshot.origin_options()
+        )
+
+    def clear_cache(self):
+        """删除全部导入缓存"""
+        size = parse_cache.cache_size()
+        if size == 0:
+            QMessageBox.information(self.main_window, "提示", "导入缓存为空")
+            return
+        answer = QMessageBox.question(
+            self.main_window, "清除导入缓存",
+            f"导入缓存共占用 {size / 1024 / 1024:.1f} MB，确定要全部删除吗？"
+        )
+        if answer != QMessageBox.StandardButton.Yes:
+            return
+        freed = parse_cache.clear()
+        QMessageBox.information(self.main_window, "提示", f"已释放 {freed / 1024 / 1024:.1f} MB")
+
+    def should_use_column_store(self, file_path):
+        """文件超过设定大小时写入磁盘列存储，不整体读入内存"""
+        threshold = self.io_settings().get("out_of_core_threshold_mb", 2048) * 1024 * 1024
+        return os.path.getsize(file_path) >= threshold
+
+    def should_read_parallel(self, file_path):
+        """超过设定大小且使用pandas解析器时按字节范围多进程解析"""
+        io_settings = self.io_settings()
+        return csv_loader.should_read_parallel(
+            file_path, io_settings.get("parallel_threshold_mb", 1024), io_settings.get("csv_engine", "auto")
+        )
+
+    def stream_csv(self, file_path):
+        """流式导入CSV：第一块立即在新标签页中显示，其余数据在后台陆续追加"""
+        container = self.create_container(file_path)
+        chunk_rows = self.io_settings().get("stream_chunk_rows", 100000)
+        self.stream_into(container, file_path, self.read_csv_chunks, file_path, chunk_rows)
+
+    def stream_into(self, container, file_path, reader, *args, empty_message="文件内容为空或格式不正确", **origin_options):
+        """
+        流式导入到数据容器：reader(job, *args) 在后台线程中逐批交付数据，第一批立即在新标签页中显示，
+        其余数据陆续追加，返回 (总行数, 读取时确定的解析方式)；完成后以解析方式和 origin_options 记录来源文件
+        """
+        def on_partial(chunk):
+            if container.row_count == 0:
+                container.set_dataframe(chunk)
+                container_signals.container_ready.emit(container)
+            else:
+                container.append_rows(chunk)
+        
+        def on_finished(result):
+            if container.dataframe is None or container.dataframe.empty:
+                QMessageBox.warning(self.main_window, "警告", empty_message)
+                return
+            container.set_origin(file_path, **result[1], **origin_options)
+            self.add_recent_file(file_path, container)
+            self.cache_container(container)
+        
+        def on_cancelled():
+            if container.dataframe is not None:
+                QMessageBox.information(self.main_window, "提示", f"已取消导入，保留已读取的 {container.row_count} 行")
+        
+        get_job_manager().submit(
+            f"导入 {os.path.basename(file_path)}",
+            reader, *args,
+            on_partial=on_partial,
+            on_finished=on_finished,
+            on_cancelled=on_cancelled,
+            on_failed=lambda message: QMessageBox.warning(self.main_window, "错误", f"打开文件失败：{message}")
+        )
+
+    def open_csv_out_of_core(self, file_path):
+        """在后台将CSV分块写入列存储，完成后在新标签页中只读显示"""
+        get_job_manager().submit(
+            f"导入 {os.path.basename(file_path)}",
+            self.read_csv_out_of_core, file_path,
+            on_finished=self.on_file_loaded,
+            on_failed=lambda message: QMessageBox.warning(self.main_window, "错误", f"打开文件失败：{message}")
+        )
+
+    def read_csv_out_of_core(self, job, file_path):
+        """在后台线程中将CSV写入列存储，返回数据容器"""
+        container = self.create_container(file_path)
+        job.report_progress(0, "正在写入列存储...")
+        csv_loader.load_csv_out_of_core(
+            file_path, container,
+            progress=lambda read_bytes, total_bytes: job.report_progress(
+                read_bytes * 100 // max(total_bytes, 1), "正在写入列存储..."),
+            check_cancelled=job.check_cancelled
+        )
+        return container
+
+    def open_excel(self, file_path):
+        """打开Excel文件：后台列出工作表，多个工作表时弹出选择对话框，再后台读取选中的工作表"""
+        def on_listed(sheets):
+            if not sheets:
+                QMessageBox.warning(self.main_window, "警告", "工作簿中没有工作表")
+                return
+            if len(sheets) > 1:
+                dialog = SheetPickerDialog(sheets, os.path.basename(file_path), self.main_window)
+                if not dialog.exec():
+                    return
+                selected = dialog.get_selected_sheets()
+            else:
+                selected = sheets
+            self.load_excel_sheets(file_path, selected, single_sheet=len(sheets) == 1)
+        
+        get_job_manager().submit(
+            f"读取工作表 {os.path.basename(file_path)}",
+            self.list_excel_sheets, file_path,
+            on_finished=on_listed,
+            on_failed=lambda message: QMessageBox.warning(self.main_window, "错误", f"打开文件失败：{message}")
+        )
+
+    def load_excel_sheets(self, file_path, sheets, single_sheet=True):
+        """后台读取选中的工作表，每读完一个即在新标签页中显示"""
+        def on_partial(result):
+            sheet, df = result
+            container = self.create_container(file_path)
+            if not single_sheet:
+                # 多工作表的工作簿不能用单个表覆盖保存，保存时走另存为
+                container.name = f"{container.name} - {sheet['name']}"
+                container.source = "新建"
+                container.metadata["source_file"] = file_path
+            container.metadata["sheet"] = sheet["name"]
+            container.set_dataframe(df)
+            container.set_origin(file_path, sheet=sheet["name"])
+            if df.empty:
+                QMessageBox.warning(self.main_window, "警告", f"工作表 {sheet['name']} 内容为空")
+                return
+            container_signals.container_ready.emit(container)
+            if single_sheet:
+                self.add_recent_file(file_path, container)
+            else:
+                self.add_recent_file(file_path, tables=len(sheets))
+        
+        get_job_manager().submit(
+            f"打开 {os.path.basename(file_path)}",
+            self.read_excel_sheets, file_path, sheets,
+            on_partial=on_partial,
+            on_failed=lambda message: QMessageBox.warning(self.main_window, "错误", f"打开文件失败：{message}")
+        )
+
+    def open_columnar(self, file_path):
+        """打开Parquet/Feather文件：后台读取元数据，多列时弹出列选择对话框，再后台读取选中的列"""
+        if not columnar_io.columnar_available():
+            QMessageBox.warning(self.main_window, "错误", "打开Parquet/Feather文件需要安装pyarrow")
             return
+        
+        def on_schema(schema):
+            columns = None
+            if len(schema["columns"]) > 1:
+                dialog = ColumnPickerDialog(schema["columns"], schema["rows"], os.path.basename(file_path), self.main_window)
+                if not dialog.exec():
+                    return
+                selected = dialog.get_selected_columns()
+                # 全部选中时不做投影
+                if len(selected) < len(schema["columns"]):
+                    columns = selected
+            get_job_manager().submit(
+                f"打开 {os.path.basename(file_path)}",
+                self.read_columnar_file, file_path, columns,
+                on_finished=self.on_file_loaded,
+                on_failed=lambda message: QMessageBox.warning(self.main_window, "错误", f"打开文件失败：{message}")
+            )
+        
+        get_job_manager().submit(
+            f"读取列信息 {os.path.basename(file_path)}",
+            self.read_columnar_schema, file_path,
+            on_finished=on_schema,
+            on_failed=lambda message: QMessageBox.warning(self.main_window, "错误", f"打开文件失败：{message}")
+        )
+
+    def read_columnar_schema(self, job, file_path):
+        """在后台线程中读取列式文件的元数据"""
+        job.report_progress(-1, "正在读取列信息...")
+        return columnar_io.read_schema(file_path)
+
+    def read_columnar_file(self, job, file_path, columns):
+        """在后台线程中读取列式文件的选中列"""
+        container = self.create_container(file_path)
+        job.report_progress(-1, "正在读取...")
+        self.load_columnar(file_path, container, columns)
+        job.check_cancelled()
+        container.set_origin(file_path, columns=columns)
+        return container
+
+    def list_excel_sheets(self, job, file_path):
+        """在后台线程中列出工作表及其行列数"""
+        job.report_progress(-1, "正在读取工作表信息...")
+        return excel_loader.list_sheets(file_path)
+
+    def read_excel_sheets(self, job, file_path, sheets):
+        """在后台线程中读取工作表，每读完一个交付GUI线程"""
+        job.report_progress(0, "正在读取...")
+        excel_loader.read_sheets(
+            file_path, sheets,
+            on_sheet=lambda sheet, df: job.emit_partial((sheet, df)),
+            check_cancelled=job.check_cancelled,
+            progress=lambda fraction: job.report_progress(int(fraction * 100), f"正在读取 {len(sheets)} 个工作表")
+        )
+
+    def read_csv_chunks(self, job, file_path, chunk_rows):
+        """在后台线程中分块读取CSV，按批次交付GUI线程追加，返回 (总行数, 解析方式)"""
+        job.report_progress(0, "正在读取...")
+        fmt = sniffer.sniff_csv(file_path)
+        chunks = csv_loader.iter_csv_chunks(file_path, chunk_rows, fmt)
+        rows = self.emit_batches(job, (
+            (chunk, read_bytes * 100 // max(total_bytes, 1)) for chunk, read_bytes, total_bytes in chunks
+        ))
+        return rows, csv_loader.origin_options(fmt, chunk_rows=chunk_rows)
+
+    def read_query_batches(self, job, file_path, query, batch_rows):
+        """在后台线程中执行SQLite查询，按批次 fetchmany 结果并交付GUI线程追加，返回 (总行数, 解析方式)"""
+        job.report_progress(-1, "正在执行查询...")
+        batches = sqlite_io.iter_query(file_path, query, batch_rows=batch_rows, check_cancelled=job.check_cancelled)
+        return self.emit_batches(job, ((batch, -1) for batch in batches)), {}
+
+    def emit_batches(self, job, chunks):
+        """
+        将逐块读取的 (数据块, 进度百分比) 逐块交付GUI线程追加，返回总行数；进度未知时百分比为 -1
+
+        数据块按固定行数交付，不在后台合并：容器只保存追加的数据块，需要时一次性合并
+        """
+        delivered_rows = 0
+        for chunk, percent in chunks:
+            job.check_cancelled()
+            if not chunk.empty:
+                job.emit_partial(chunk)
+                delivered_rows += len(chunk)
+            job.report_progress(percent, f"已读取 {delivered_rows} 行")
+        return delivered_rows
+
+    ## open选项下函数
+    # 以下加载函数可能在后台线程中运行，出错时抛出异常而不直接弹窗
+    def load_csv(self, file_path, container, job=None):
+        """
+        加载CSV文件：嗅探样本后单次解析，超大文件按字节范围多进程解析
+
+        返回实际使用的解析方式（引擎、编码），作为来源文件的读取选项
+        """
+        try:
+            fmt = sniffer.sniff_csv(file_path)
+            if job is not None and self.should_read_parallel(file_path):
+                csv_loader.load_csv_parallel(
+                    file_path, container, fmt,
+                    check_cancelled=job.check_cancelled,
+                    progress=lambda done, total: job.report_progress(done * 100 // total, f"已解析 {done}/{total} 段")
+                )
+            else:
+                csv_loader.load_csv(file_path, container, fmt, engine=self.io_settings().get("csv_engine", "auto"))
+        except Exception as e:
+            raise ValueError(f"加载CSV文件时出错: {str(e)}") from e
+        return csv_loader.origin_options(fmt)
+
+    def load_excel(self, file_path, container):
+        """加载Excel文件的第一个工作表，智能识别第一行是否为表头"""
+        try:
+            excel_loader.load_excel(file_path, container)
+        except Exception as e:
+            raise ValueError(f"加载Excel文件时出错: {str(e)}") from e
 
-        container.set_table_data(data_array, headers)
+    def load_json(self, file_path, container, job=None):
+        """加载JSON文件：记录数组和NDJSON流式解码，嵌套对象展开为点号分隔的列"""
+        try:
+            if job is None:
+                json_loader.load_json(file_path, container)
+                return
+            json_loader.load_json(
+                file_path, container,
+                progress=lambda read_bytes, total_bytes: job.report_progress(
+                    read_bytes * 100 // max(total_bytes, 1), "正在解析..."),
+                check_cancelled=job.check_cancelled
+            )
+        except Exception as e:
+            raise ValueError(f"加载JSON文件时出错: {str(e)}") from e
+    
+    def load_columnar(self, file_path, container, columns=None):
+        """加载Parquet/Feather文件，columns 为要加载的列（None 表示全部）"""
+        try:
+            columnar_io.load_columnar(file_path, container, columns)
+        except Exception as e:
+            raise ValueError(f"加载{os.path.splitext(file_path)[1][1:]}文件时出错: {str(e)}") from e
     
     """ save选项下函数 """
     # 保存当前文件
@@ -182,23 +1053,22 @@ class FileMenu(QMenu):
             self.save_as()
             return
         
-        try:
-            # 获取当前数据
-            data = container.get_table_data_as_numpy()
-            headers = container.column_headers
-            # 根据文件拓展名调用相应的保存函数
-            extensions = os.path.splitext(container.source)[1].lower()
-            if extensions == ".csv":
-                self.save_csv(container.source, data, headers)
-            elif extensions == ".xlsx":
-                self.save_excel(container.source, data, headers)
-            elif extensions == ".json":
-                self.save_json(container.source, data, headers)
-            else:
-                QMessageBox.warning(self.main_window, "错误", "不支持的文件类型\t")
-                return
-        except Exception as e:
-            QMessageBox.warning(self.main_window, "错误", f"保存文件失败：{str(e)}\t")
+        # 从SQLite数据库导入的表写回数据库
+        if os.path.splitext(container.source)[1].lower() in sqlite_io.SQLITE_EXTENSIONS:
+            self.save_to_sqlite()
+            return
+        
+        # 根据文件拓展名检查是否支持保存
+        if not table_writer.is_writable(container.source):
+            QMessageBox.warning(self.main_window, "错误", "不支持的文件类型\t")
+            return
+        
+        # 在后台线程中写入数据快照
+        get_job_manager().submit(
+            f"保存 {os.path.basename(container.source)}",
+            self.write_file, container.source, container.snapshot(),
+            on_failed=lambda message: QMessageBox.warning(self.main_window, "错误", f"保存文件失败：{message}\t")
+        )
             
     # 另存为
     def save_as(self):
@@ -221,23 +1091,31 @@ class FileMenu(QMenu):
             parent = self, 
             caption = "另存为", 
             directory = container.source if container.source else "", 
-            filter = "csv文件(*.csv);;xlsx文件(*.xlsx);;json文件(*.json)"
+            filter = "csv文件(*.csv);;xlsx文件(*.xlsx);;json文件(*.json);;ndjson文件(*.ndjson *.jsonl);;parquet文件(*.parquet);;feather文件(*.feather);;gzip压缩的csv文件(*.csv.gz);;zstd压缩的csv文件(*.csv.zst)"
         )
         if not file_path:
             return  # 用户取消操作
         
-        try:
-            # 获取当前数据
-            data = container.get_table_data_as_numpy()
-            headers = container.column_headers
-            # 根据文件拓展名调用相应的保存函数
-            extensions = os.path.splitext(file_path)[1].lower()
-            if file_path.endswith('.csv') or selected_filter == "CSV文件(*.csv)":
-                self.save_csv(file_path, data, headers)
-            elif file_path.endswith('.xlsx') or selected_filter == "Excel文件(*.xlsx)":
-                self.save_excel(file_path, data, headers)
-            elif file_path.endswith('.json') or selected_filter == "JSON文件(*.json)":
-                self.save_json(file_path, data, headers)
+        # 根据选择的过滤器补全拓展名
+        if not os.path.splitext(file_path)[1]:
+            if selected_filter.startswith("xlsx"):
+                file_path += ".xlsx"
+            elif selected_filter.startswith("json"):
+                file_path += ".json"
+            elif selected_filter.startswith("ndjson"):
+                file_path += ".ndjson"
+            elif selected_filter.startswith("parquet"):
+                file_path += ".parquet"
+            elif selected_filter.startswith("feather"):
+                file_path += ".feather"
+            elif selected_filter.startswith("gzip"):
+                file_path += ".csv.gz"
+            elif selected_filter.startswith("zstd"):
+                file_path += ".csv.zst"
+            else:
+                file_path += ".csv"
+        
+        def on_saved(_):
             # 更新容器信息
             container.source = file_path
             container.name = os.path.split(file_path)[1]
@@ -249,30 +1127,141 @@ class FileMenu(QMenu):
                         if info['container'] == container:
                             self.set_tab_name(table_tab, info['index'], container.name)
             QMessageBox.information(self.main_window, "提示", "保存成功\t")
+        
+        # 在后台线程中写入数据快照
+        get_job_manager().submit(
+            f"保存 {os.path.basename(file_path)}",
+            self.write_file, file_path, container.snapshot(),
+            on_finished=on_saved,
+            on_failed=lambda message: QMessageBox.warning(self.main_window, "错误", f"保存文件失败：{message}\t")
+        )
+
+    def save_to_sqlite(self):
+        """将当前数据表写入SQLite数据库中的表（表已存在时选择替换或追加），在一个事务中批量插入"""
+        if not hasattr(self.main_window, 'plot_area'):
+            QMessageBox.warning(self.main_window, "错误", "\n无法访问绘图区域\t")
+            return
+        cur_tab = self.main_window.plot_area.get_current_table_tab()
+        if cur_tab is None:
+            QMessageBox.warning(self.main_window, "错误", "当前没有活动的表格视图\t")
+            return
+        container = cur_tab.container
+
+        # 从数据库导入的表默认写回原数据库和原表
+        from_sqlite = os.path.splitext(container.source or "")[1].lower() in sqlite_io.SQLITE_EXTENSIONS
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "保存到SQLite数据库", container.source if from_sqlite else "",
+            "SQLite数据库(*.db *.sqlite *.sqlite3)",
+            options=QFileDialog.Option.DontConfirmOverwrite
+        )
+        if not file_path:
+            return  # 用户取消操作
+        if not os.path.splitext(file_path)[1]:
+            file_path += ".db"
+        table_name, ok = QInputDialog.getText(
+            self.main_window, "保存到SQLite数据库", "表名:",
+            text=container.metadata.get("table") or container.name
+        )
+        table_name = table_name.strip()
+        if not ok or not table_name:
+            return
+
+        if_exists = "fail"
+        try:
+            exists = sqlite_io.table_exists(file_path, table_name)
+        except Exception as e:
+            QMessageBox.warning(self.main_window, "错误", f"无法打开数据库：{str(e)}\t")
+            return
+        if exists:
+            answer = QMessageBox.question(
+                self.main_window, "表已存在",
+                f"表 {table_name} 已存在。\n选择“是”清空表中的数据后写入，选择“否”将数据追加到表末尾。",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No | QMessageBox.StandardButton.Cancel
+            )
+            if answer == QMessageBox.StandardButton.Yes:
+                if_exists = "replace"
+            elif answer == QMessageBox.StandardButton.No:
+                if_exists = "append"
+            else:
+                return
+
+        # 在后台线程中写入数据快照
+        get_job_manager().submit(
+            f"保存 {table_name} 到 {os.path.basename(file_path)}",
+            self.write_sqlite, file_path, table_name, if_exists, container.snapshot(),
+            on_finished=lambda rows: QMessageBox.information(self.main_window, "提示", f"已写入 {rows} 行到表 {table_name}\t"),
+            on_failed=lambda message: QMessageBox.warning(self.main_window, "错误", f"保存到数据库失败：{message}\t")
+        )
+
+    def write_sqlite(self, job, file_path, table_name, if_exists, snapshot):
+        """在后台线程中将快照写入数据库中的表，返回写入的行数"""
+        job.report_progress(-1, "正在写入数据库...")
+        sqlite_io.write_table(
+            file_path, table_name, snapshot, if_exists,
+            progress=lambda written, total: job.report_progress(
+                written * 100 // max(total, 1), f"已写入 {written}/{total} 行"),
+            check_cancelled=job.check_cancelled
+        )
+        return snapshot.row_count
+
+    def write_file(self, job, file_path, snapshot):
+        """在后台线程中按拓展名写入文件：先写入临时文件，完成后替换目标文件"""
+        job.report_progress(-1, "正在写入...")
+        io_settings = self.io_settings()
+        precision = io_settings.get("json_precision", -1)
+        level = io_settings.get("compression_level", -1)
+        table_writer.write_table(
+            file_path, snapshot,
+            progress=lambda written, total: job.report_progress(
+                written * 100 // max(total, 1), f"已写入 {written}/{total} 行"),
+            check_cancelled=job.check_cancelled,
+            json_layout=io_settings.get("json_layout", "split"),
+            json_precision=precision if precision >= 0 else None,
+            compression_level=level if level >= 0 else None
+        )
+        return file_path
+
+    def update_follow_action(self):
+        """菜单显示前按当前数据表更新“跟踪文件更新”的状态：只有从CSV文件打开的内存中的表可以跟踪"""
+        tab = self.get_current_table_tab()
+        container = getattr(tab, "container", None)
+        origin = container.origin if container is not None else None
+        followable = (
+            origin is not None and not container.is_out_of_core()
+            and os.path.splitext(origin["path"])[1].lower() == ".csv"
+        )
+        self.follow_action.setEnabled(followable)
+        self.follow_action.setChecked(followable and container.uuid in self.followers)
+
+    def toggle_follow(self, checked):
+        """开始或停止跟踪当前数据表的来源文件，文件末尾追加的行自动追加到表中"""
+        tab = self.get_current_table_tab()
+        container = getattr(tab, "container", None)
+        if container is None:
+            return
+        if not checked:
+            self.stop_follow(container.uuid)
+            return
+        try:
+            follower = FileFollower(container, self)
         except Exception as e:
-            QMessageBox.warning(self.main_window, "错误", f"保存文件失败：{str(e)}\t")
-
-    # 保存csv文件
-    def save_csv(self, file_path, data, headers):
-        """ 保存csv文件 """
-        df = pd.DataFrame(data, columns=headers)
-        df.to_csv(file_path, index=False)
-
-    # 保存excel文件
-    def save_excel(self, file_path, data, headers):
-        """ 保存excel文件 """
-        df = pd.DataFrame(data, columns=headers)
-        df.to_excel(file_path, index=False)
-
-    # 保存json文件
-    def save_json(self, file_path, data, headers):
-        """ 保存json文件 """
-        data_dict = {
-            "columns": headers,
-            "data": data.tolist()
-        }
-        with open(file_path, "w", encoding="utf-8") as f:
-            json.dump(data_dict, f, ensure_ascii=False, indent=4)
+            self.follow_action.setChecked(False)
+            QMessageBox.warning(self.main_window, "错误", f"无法跟踪文件更新：{str(e)}")
+            return
+        follower.stopped.connect(lambda reason, uuid=container.uuid, name=container.name: self.on_follow_stopped(uuid, name, reason))
+        self.followers[container.uuid] = follower
+
+    def stop_follow(self, uuid):
+        follower = self.followers.get(uuid)
+        if follower is not None:
+            follower.stop()
+
+    def on_follow_stopped(self, uuid, name, reason):
+        follower = self.followers.pop(uuid, None)
+        if follower is not None:
+            follower.deleteLater()
+        if reason:
+            QMessageBox.warning(self.main_window, "提示", f"{name} 已停止跟踪文件更新：{reason}")
 
     # 获取当前活动的表格视图
     def get_current_table_tab(self):
@@ -302,37 +1291,3 @@ class FileMenu(QMenu):
             self.main_window.close()
         else:
             QMessageBox.warning(self.main_window, "错误", "无法访问主窗口\t")
-
-def is_numeric_row(row):
-    """
-    判断一行数据是否主要为数值类型
-    
-    参数:
-        row: 一行数据，可以是列表、Series或其他可迭代对象
-        
-    返回:
-        bool: 如果该行 >50% 的元素可以转换为数值，则返回True
-    """
-    numeric_count = 0
-    total_count = 0
-    
-    for item in row:
-        # 跳过空值
-        if pd.isna(item) or item == "":
-            continue
-            
-        total_count += 1
-        
-        # 尝试转换为数值
-        try:
-            float(item)
-            numeric_count += 1
-        except (ValueError, TypeError):
-            pass
-    
-    # 如果没有有效数据，默认返回False
-    if total_count == 0:
-        return False
-    
-    # 如果数值比例超过50%，则认为这是数值行
-    return (numeric_count / total_count) > 0.5
\ No newline at end of file
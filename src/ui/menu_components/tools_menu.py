@@ -3,7 +3,9 @@
 
 from PyQt6.QtWidgets import QMenu, QMessageBox
 from PyQt6.QtGui import QIcon, QAction
-from src.core.signals import plot_signals
+from src.core.signals import plot_signals, container_signals
+from src.core.job_runner import get_job_manager
+from src.core.command_manager import ReplaceColumnsCommand, ReorderRowsCommand
 from src.ui.chart_windows import ChartWindow
 from src.ui.dialogs.filter_dialog import FilterDialog
 from src.ui.dialogs.preferences_dialog import PreferencesDialog
@@ -107,7 +109,16 @@ class ToolsMenu(QMenu):
         current_container = self.main_window.plot_area.get_current_table_container()
         fitler_dialog = FilterDialog(current_container, self.main_window)
         if not fitler_dialog.hasError:
-            fitler_dialog.exec()  # 调用 exec() 方法显示对话框
+            if fitler_dialog.exec():  # 调用 exec() 方法显示对话框
+                # 在GUI线程中读取过滤条件，后台任务只使用条件和快照，不访问对话框
+                condition = fitler_dialog.get_filter_condition()
+                snapshot = current_container.snapshot()
+                get_job_manager().submit(
+                    f"过滤 {current_container.name}",
+                    lambda job: snapshot.prepare_filter(condition),
+                    on_finished=container_signals.container_ready.emit,
+                    on_failed=lambda message: QMessageBox.warning(self.main_window, "警告", f"过滤应用失败：{message}")
+                )
 
     def sort_data(self):
         """数据排序"""
@@ -117,13 +128,28 @@ class ToolsMenu(QMenu):
         if not sort_dialog.hasError:
             if sort_dialog.exec():  # 调用 exec() 方法显示对话框
                 column, ascenfing = sort_dialog.get_sort_options()
-                if current_container.sort_data(column, ascenfing):
-                    current_tab = self.main_window.plot_area.get_current_table_tab()
-                    if current_tab:
-                        current_tab.load_data()
-                        QMessageBox.information(self.main_window, "提示", "数据已排序！")
-                else:
-                    QMessageBox.warning(self.main_window, "警告", "排序失败！")
+                snapshot = current_container.snapshot()
+                
+                def on_finished(order):
+                    # 排列按快照计算，期间数据被修改（如增删行、流式追加）时已不适用，丢弃结果
+                    if current_container.version != snapshot.version or current_container.row_count != len(order):
+                        QMessageBox.warning(self.main_window, "警告", "排序期间数据已被修改，排序结果已丢弃，请重新排序")
+                        return
+                    # 撤销历史只保存行排列，撤销时按逆排列还原
+                    command = ReorderRowsCommand(current_container, order)
+                    command_manager = self.main_window.get_command_manager(current_container)
+                    if command_manager:
+                        command_manager.execute(command)
+                    else:
+                        command.execute()
+                    QMessageBox.information(self.main_window, "提示", "数据已排序！")
+                
+                get_job_manager().submit(
+                    f"排序 {current_container.name}",
+                    lambda job: snapshot.prepare_sort_order(column, ascenfing),
+                    on_finished=on_finished,
+                    on_failed=lambda message: QMessageBox.warning(self.main_window, "警告", f"排序失败！{message}")
+                )
 
     def clean_data(self):
         """数据清洗"""
@@ -132,13 +158,12 @@ class ToolsMenu(QMenu):
         if not data_clean_dialog.hasError:
             if data_clean_dialog.exec():  # 调用 exec() 方法显示对话框
                 column, sensitive, output_value = data_clean_dialog.get_clean_options() 
-                if current_container.clean_data(column, sensitive, output_value):  # 传递参数
-                    current_tab = self.main_window.plot_area.get_current_table_tab()
-                    if current_tab:
-                        current_tab.load_data()
-                        QMessageBox.information(self.main_window, "提示", "数据已清洗！")
-                else:
-                    QMessageBox.warning(self.main_window, "警告", "清洗失败！")
+                snapshot = current_container.snapshot()
+                self.submit_column_job(
+                    current_container, snapshot, f"清洗 {current_container.name}",
+                    lambda job: snapshot.prepare_clean_columns(column, sensitive, output_value),
+                    "数据已清洗！", "清洗失败！"
+                )
 
 
     def convert_data(self):
@@ -148,13 +173,58 @@ class ToolsMenu(QMenu):
         data_convert_dialog = DataConvertDialog(current_container, self.main_window)
         if not data_convert_dialog.hasError:
             if data_convert_dialog.exec():  # 调用 exec() 方法显示对话框
-                if current_container.convert_data(data_convert_dialog.get_conversion_options()):  # 传递参数
-                    current_tab = self.main_window.plot_area.get_current_table_tab()
-                    if current_tab:
-                        current_tab.load_data()
-                        QMessageBox.information(self.main_window, "提示", "数据已转换！")
-                else:
-                    QMessageBox.warning(self.main_window, "警告", "转换失败！")
+                options = data_convert_dialog.get_conversion_options()
+                snapshot = current_container.snapshot()
+                self.submit_column_job(
+                    current_container, snapshot, f"转换 {current_container.name}",
+                    lambda job: snapshot.prepare_convert_data(options),
+                    "数据已转换！", "转换失败！"
+                )
+
+    def submit_column_job(self, container, snapshot, name, fn, success_message, failure_message):
+        """在后台按快照计算批量列结果，完成后在GUI线程中一次性写回"""
+        def on_finished(result):
+            # 结果按快照计算，期间数据被修改（如编辑、流式追加）时写回会覆盖修改或行数不符，丢弃结果
+            if container.version != snapshot.version or container.row_count != snapshot.row_count:
+                QMessageBox.warning(self.main_window, "警告", "处理期间数据已被修改，结果已丢弃，请重新操作")
+                return
+            self.apply_column_changes(container, *result, success_message, failure_message)
+        
+        get_job_manager().submit(
+            name, fn,
+            on_finished=on_finished,
+            on_failed=lambda message: QMessageBox.warning(self.main_window, "警告", f"{failure_message}{message}")
+        )
+
+    def apply_column_changes(self, container, changes, errors, success_message, failure_message):
+        """将批量结果作为一条撤销记录写回容器，并汇总显示错误报告"""
+        if changes:
+            command = ReplaceColumnsCommand(container, changes)
+            command_manager = self.main_window.get_command_manager(container)
+            if command_manager:
+                command_manager.execute(command)
+            else:
+                command.execute()
+        
+        if not errors:
+            if changes:
+                QMessageBox.information(self.main_window, "提示", success_message)
+            else:
+                QMessageBox.information(self.main_window, "提示", "没有需要处理的数据")
+            return
+        
+        # 错误报告最多列出前20项
+        lines = [f"{column}: {reason}" for column, reason in list(errors.items())[:20]]
+        if len(errors) > 20:
+            lines.append(f"... 另有 {len(errors) - 20} 列出错")
+        report = "\n".join(lines)
+        if changes:
+            QMessageBox.warning(
+                self.main_window, "提示",
+                f"{success_message}\n已处理 {len(changes)} 列，以下 {len(errors)} 列未处理：\n{report}"
+            )
+        else:
+            QMessageBox.warning(self.main_window, "警告", f"{failure_message}\n{report}")
 
     # 偏好相关
     def open_preferences(self):
@@ -0,0 +1,111 @@
+# src/utils/excel_reader.py
+# Excel读取：xlsx 用 openpyxl 只读流式模式打开，逐行读取单元格值，不构建完整的工作簿对象模型；
+# xls 交给 pandas（xlrd）。
+# 注意：本模块会在工作进程中被导入，不能依赖 PyQt 或 src.core。
+
+import os
+from typing import Optional, List, Dict, Callable, Any
+import pandas as pd
+
+# 汇报进度的行间隔
+PROGRESS_EVERY_ROWS = 10000
+
+def _is_legacy(file_path: str) -> bool:
+    return os.path.splitext(file_path)[1].lower() == ".xls"
+
+def _open_workbook(file_path: str):
+    from openpyxl import load_workbook
+    return load_workbook(file_path, read_only=True, data_only=True)
+
+def list_sheets(file_path: str) -> List[Dict[str, Any]]:
+    """
+    列出工作表
+
+    返回 [{"name", "rows", "columns", "first_row"}]，行列数未知时为 None（xls 或缺少尺寸信息的 xlsx）
+    """
+    if _is_legacy(file_path):
+        sheets = []
+        with pd.ExcelFile(file_path) as excel:
+            for name in excel.sheet_names:
+                first = pd.read_excel(excel, sheet_name=name, nrows=1, header=None)
+                sheets.append({
+                    "name": name, "rows": None, "columns": first.shape[1],
+                    "first_row": first.iloc[0].tolist() if len(first) else []
+                })
+        return sheets
+
+    workbook = _open_workbook(file_path)
+    try:
+        sheets = []
+        for sheet in workbook.worksheets:
+            first_row = next(sheet.iter_rows(max_row=1, values_only=True), ())
+            sheets.append({
+                "name": sheet.title,
+                "rows": sheet.max_row,        # 来自工作表的尺寸记录，无需遍历
+                "columns": sheet.max_column,
+                "first_row": list(first_row),
+            })
+        return sheets
+    finally:
+        workbook.close()
+
+def _build_frame(rows: List[tuple], has_header: bool) -> pd.DataFrame:
+    """由单元格值构建DataFrame，去掉末尾的空行和空列"""
+    while rows and all(value is None for value in rows[-1]):
+        rows.pop()
+    width = max((len(row) for row in rows), default=0)
+    while width and all(len(row) < width or row[width - 1] is None for row in rows):
+        width -= 1
+    if any(len(row) != width for row in rows):
+        rows = [tuple(row[:width]) + (None,) * (width - len(row)) for row in rows]
+    
+    header_row = rows[0] if has_header and rows else ()
+    data = rows[1:] if has_header else rows
+    headers = [
+        str(header_row[i]) if i < len(header_row) and header_row[i] is not None else f"列{i+1}"
+        for i in range(width)
+    ]
+    # 重复的列名按 pandas 的规则加后缀（如 "a.1"）
+    seen = {}
+    for i, header in enumerate(headers):
+        if header in seen:
+            seen[header] += 1
+            headers[i] = f"{header}.{seen[header]}"
+        else:
+            seen[header] = 0
+    # from_records 按列推断类型，数值列得到numpy数值类型
+    return pd.DataFrame.from_records(data, columns=headers) if data else pd.DataFrame(columns=headers)
+
+def read_sheet(file_path: str, sheet_name: str, has_header: bool,
+               progress: Optional[Callable] = None,
+               check_cancelled: Optional[Callable] = None) -> pd.DataFrame:
+    """
+    读取单个工作表
+
+    progress(已读行数, 总行数或None) 用于汇报进度，check_cancelled() 用于协作式取消
+    """
+    if _is_legacy(file_path):
+        df = pd.read_excel(file_path, sheet_name=sheet_name, header=0 if has_header else None)
+        if not has_header:
+            df.columns = [f"列{i+1}" for i in range(df.shape[1])]
+        return df
+
+    workbook = _open_workbook(file_path)
+    try:
+        sheet = workbook[sheet_name]
+        total = sheet.max_row
+        rows = []
+        for row in sheet.iter_rows(values_only=True):
+            rows.append(row)
+            if len(rows) % PROGRESS_EVERY_ROWS == 0:
+                if check_cancelled:
+                    check_cancelled()
+                if progress:
+                    progress(len(rows), total)
+    finally:
+        workbook.close()
+    return _build_frame(rows, has_header)
+
+def _read_sheet_worker(file_path: str, sheet_name: str, has_header: bool) -> pd.DataFrame:
+    """进程池中读取单个工作表"""
+    return read_sheet(file_path, sheet_name, has_header)
@@ -0,0 +1,192 @@
+# src/utils/parallel.py
+# 多进程分块执行：将列按行切分为若干块，通过共享内存交给进程池中的工作进程处理，
+# 再按原顺序拼回结果。用于 pd.to_datetime、正则替换等受GIL限制的列变换。
+# 注意：本模块会在工作进程中被导入，不能依赖 PyQt，也不能放在会导入界面模块的 src.core 包中。
+
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context, shared_memory
+from typing import Optional, List, Callable, Tuple
+import numpy as np
+import pandas as pd
+
+# 行数低于该值时串行执行，进程间传输的开销不划算
+PARALLEL_MIN_ROWS = 200_000
+
+# 定宽字符串单元格的最大字符数，超过时不走共享内存（避免定宽数组过大）
+MAX_FIXED_WIDTH_CHARS = 256
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_workers = 0
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """获取全局进程池（使用spawn方式创建，避免fork带有Qt线程的进程）"""
+    global _process_pool, _process_pool_workers
+    if _process_pool is None:
+        _process_pool_workers = os.cpu_count() or 1
+        _process_pool = ProcessPoolExecutor(
+            max_workers=_process_pool_workers,
+            mp_context=get_context("spawn")
+        )
+    return _process_pool
+
+def process_pool_workers() -> int:
+    """全局进程池的工作进程数（创建进程池时记录），用于决定切分的块数"""
+    return _process_pool_workers or (os.cpu_count() or 1)
+
+def shutdown_process_pool():
+    """关闭全局进程池（程序退出时调用）"""
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+        _process_pool = None
+
+def should_parallelize(row_count: int) -> bool:
+    """判断是否值得使用进程池"""
+    return row_count >= PARALLEL_MIN_ROWS and (os.cpu_count() or 1) > 1
+
+def to_fixed_width_strings(series: pd.Series) -> Optional[np.ndarray]:
+    """
+    将列转换为numpy定宽字符串数组（可直接放入共享内存）
+
+    转换规则与 astype(str) 一致（NaN 变为 'nan'，None 变为 'None'），
+    单元格过长时返回 None，由调用方退回串行处理
+    """
+    dtype = series.dtype
+    if isinstance(dtype, np.dtype) and dtype.kind in "biufcOUS":
+        values = series.to_numpy(dtype=str)
+    else:
+        # numpy 按 ISO 格式（如 2020-01-01T00:00:00.000000000）转换日期时间，与 astype(str) 不同，
+        # 日期时间、时间差和扩展类型先按 pandas 的格式转换
+        values = series.astype(str).to_numpy(dtype=str)
+    if values.dtype.itemsize // 4 > MAX_FIXED_WIDTH_CHARS:
+        return None
+    return values
+
+# ---------------- 共享内存分块执行 ----------------
+
+def _chunk_bounds(row_count: int, workers: int) -> List[Tuple[int, int]]:
+    """按行切分，每个工作进程分到若干块以平衡负载"""
+    chunk_count = max(1, min(row_count, workers * 4))
+    edges = np.linspace(0, row_count, chunk_count + 1, dtype=np.int64)
+    return [(int(edges[i]), int(edges[i + 1])) for i in range(chunk_count) if edges[i] < edges[i + 1]]
+
+def _to_shared(values: np.ndarray) -> shared_memory.SharedMemory:
+    """将数组复制到新的共享内存块"""
+    shm = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+    view = np.ndarray(values.shape, dtype=values.dtype, buffer=shm.buf)
+    view[:] = values
+    del view
+    return shm
+
+def _run_chunked(values: np.ndarray, worker: Callable, args: tuple = (),
+                 out_dtype=None, executor: Optional[ProcessPoolExecutor] = None) -> list:
+    """
+    在进程池中按块执行 worker
+
+    worker(in_desc, out_desc, start, stop, *args) 读取共享内存中的输入块；
+    给定 out_dtype 时结果写入共享输出数组并返回该数组，否则返回各块结果列表
+    """
+    executor = executor or get_process_pool()
+    workers = process_pool_workers()
+    in_shm = _to_shared(values)
+    out_shm = None
+    try:
+        in_desc = (in_shm.name, values.shape, values.dtype.str)
+        out_desc = None
+        if out_dtype is not None:
+            out_dtype = np.dtype(out_dtype)
+            out_shm = shared_memory.SharedMemory(create=True, size=max(values.shape[0] * out_dtype.itemsize, 1))
+            out_desc = (out_shm.name, values.shape, out_dtype.str)
+
+        futures = [
+            executor.submit(worker, in_desc, out_desc, start, stop, *args)
+            for start, stop in _chunk_bounds(values.shape[0], workers)
+        ]
+        results = [future.result() for future in futures]
+
+        if out_shm is not None:
+            view = np.ndarray(values.shape, dtype=out_dtype, buffer=out_shm.buf)
+            output = view.copy()
+            del view
+            return output
+        return results
+    finally:
+        in_shm.close()
+        in_shm.unlink()
+        if out_shm is not None:
+            out_shm.close()
+            out_shm.unlink()
+
+def _attach(desc):
+    """在工作进程中挂载共享数组"""
+    name, shape, dtype = desc
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+
+# ---------------- 工作进程函数 ----------------
+
+def _datetime_worker(in_desc, out_desc, start, stop, format_str):
+    in_shm, values = _attach(in_desc)
+    out_shm, output = _attach(out_desc)
+    try:
+        parsed = pd.to_datetime(pd.Series(values[start:stop]), format=format_str, errors='coerce')
+        if not pd.api.types.is_datetime64_ns_dtype(parsed.dtype) or getattr(parsed.dt, 'tz', None) is not None:
+            raise ValueError("解析结果不是无时区的日期时间")
+        output[start:stop] = parsed.to_numpy(dtype='datetime64[ns]').view('int64')
+    finally:
+        del values, output
+        in_shm.close()
+        out_shm.close()
+
+def _isin_worker(in_desc, out_desc, start, stop, candidates):
+    in_shm, values = _attach(in_desc)
+    out_shm, output = _attach(out_desc)
+    try:
+        output[start:stop] = np.isin(values[start:stop], candidates)
+    finally:
+        del values, output
+        in_shm.close()
+        out_shm.close()
+
+def _regex_replace_worker(in_desc, out_desc, start, stop, pattern, repl, flags):
+    in_shm, values = _attach(in_desc)
+    try:
+        regex = re.compile(pattern, flags)
+        chunk = pd.Series(values[start:stop], dtype=object)
+        return chunk.str.replace(regex, repl, regex=True).to_numpy(dtype=object)
+    finally:
+        del values
+        in_shm.close()
+
+# ---------------- 对外接口 ----------------
+
+def guess_datetime_format(values: np.ndarray) -> Optional[str]:
+    """根据第一个非空值推断统一的日期格式，保证各块解析方式一致"""
+    try:
+        from pandas.tseries.api import guess_datetime_format as _guess
+    except ImportError:
+        return None
+    for value in values[:1000]:
+        if value not in ('', 'nan', 'None', 'NaT'):
+            return _guess(str(value))
+    return None
+
+def parallel_to_datetime(values: np.ndarray, format_str: Optional[str] = None,
+                         executor: Optional[ProcessPoolExecutor] = None) -> np.ndarray:
+    """多进程解析日期时间，返回 datetime64[ns] 数组"""
+    format_str = format_str or guess_datetime_format(values)
+    result = _run_chunked(values, _datetime_worker, (format_str,), out_dtype='int64', executor=executor)
+    return result.view('datetime64[ns]')
+
+def parallel_isin(values: np.ndarray, candidates, executor: Optional[ProcessPoolExecutor] = None) -> np.ndarray:
+    """多进程计算成员判断掩码"""
+    candidates = np.asarray(list(candidates), dtype=values.dtype)
+    return _run_chunked(values, _isin_worker, (candidates,), out_dtype=np.bool_, executor=executor)
+
+def parallel_regex_replace(values: np.ndarray, pattern: str, repl: str, flags: int = 0,
+                           executor: Optional[ProcessPoolExecutor] = None) -> np.ndarray:
+    """多进程正则替换，返回对象数组"""
+    parts = _run_chunked(values, _regex_replace_worker, (pattern, repl, flags), executor=executor)
+    return np.concatenate(parts) if parts else np.empty(0, dtype=object)
@@ -0,0 +1,271 @@
+# src/utils/parallel_csv.py
+# 按字节范围多进程解析CSV：先统计各块的引号数，用引号奇偶性的前缀和找到不在引号内的换行作为切分点，
+# 再由进程池中的工作进程各自读取并解析一段字节范围。数值列直接写入主进程分配的共享内存，
+# 其余列序列化传回，最后按原顺序拼接。
+# 注意：本模块会在工作进程中被导入，不能依赖 PyQt 或 src.core。
+
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Optional, List, Dict, Callable, Tuple
+import numpy as np
+import pandas as pd
+from src.utils.parallel import get_process_pool, process_pool_workers, _attach
+
+# 每段字节范围的目标大小
+TARGET_RANGE_BYTES = 64 * 1024 * 1024
+
+# 扫描和查找切分点时每次读取的字节数
+SCAN_BLOCK_BYTES = 16 * 1024 * 1024
+SEEK_WINDOW_BYTES = 1024 * 1024
+
+# 可以按字节查找引号和换行的编码（多字节字符的各字节都不会与 '"' 或 '\n' 冲突）
+BYTE_SCANNABLE_ENCODINGS = {"utf-8", "utf-8-sig", "gb18030", "gbk", "gb2312", "ascii", "latin-1", "cp1252"}
+
+QUOTE = ord('"')
+NEWLINE = ord('\n')
+
+def can_split_encoding(encoding: str) -> bool:
+    return encoding.lower() in BYTE_SCANNABLE_ENCODINGS
+
+# ---------------- 切分点 ----------------
+
+def _scan_worker(path: str, start: int, stop: int) -> Tuple[int, int]:
+    """统计字节范围内的引号数和换行数"""
+    quotes = 0
+    newlines = 0
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = stop - start
+        while remaining > 0:
+            block = f.read(min(SCAN_BLOCK_BYTES, remaining))
+            if not block:
+                break
+            quotes += block.count(b'"')
+            newlines += block.count(b'\n')
+            remaining -= len(block)
+    return quotes, newlines
+
+def record_ends(data: bytes, in_quotes: bool = False) -> np.ndarray:
+    """字节串中不在引号内的换行的位置，in_quotes 为开头处是否位于引号内"""
+    values = np.frombuffer(data, dtype=np.uint8)
+    quote_parity = (np.cumsum(values == QUOTE) + int(in_quotes)) & 1
+    return np.flatnonzero((values == NEWLINE) & (quote_parity == 0))
+
+def next_record_start(f, offset: int, in_quotes: bool, limit: int) -> Tuple[int, int]:
+    """
+    从 offset 开始查找第一个不在引号内的换行，返回 (下一条记录的起始位置, 跳过的换行数)
+
+    in_quotes 为 offset 处是否位于引号内（由之前所有引号数的奇偶性决定）
+    """
+    f.seek(offset)
+    parity = int(in_quotes)
+    skipped_newlines = 0
+    position = offset
+    while position < limit:
+        window = f.read(min(SEEK_WINDOW_BYTES, limit - position))
+        if not window:
+            break
+        values = np.frombuffer(window, dtype=np.uint8)
+        # 每个位置之前（含）的引号数奇偶性，换行本身不是引号，因此即为该换行处是否在引号内
+        quote_parity = (np.cumsum(values == QUOTE) + parity) & 1
+        newline_mask = values == NEWLINE
+        candidates = np.flatnonzero(newline_mask & (quote_parity == 0))
+        if len(candidates):
+            index = int(candidates[0])
+            skipped_newlines += int(np.count_nonzero(newline_mask[:index + 1]))
+            return position + index + 1, skipped_newlines
+        skipped_newlines += int(np.count_nonzero(newline_mask))
+        parity = int(quote_parity[-1])
+        position += len(window)
+    return limit, skipped_newlines
+
+def complete_length(path: str, size: int) -> int:
+    """
+    文件开头 size 字节中完整记录的长度（到最后一个不在引号内的换行为止），写入方尚未写完的末尾记录不计入
+
+    末尾窗口中没有引号时（引号内的内容不会跨越整个窗口）其中的换行都是行尾，不必统计之前的引号数；
+    否则按之前全部引号数的奇偶性判断
+    """
+    start = max(0, size - SEEK_WINDOW_BYTES)
+    with open(path, "rb") as f:
+        f.seek(start)
+        tail = f.read(size - start)
+    if b'"' not in tail and b'\n' in tail:
+        return start + tail.rfind(b'\n') + 1
+    quotes = _scan_worker(path, 0, start)[0]
+    while True:
+        ends = record_ends(tail, bool(quotes & 1))
+        if len(ends) or start == 0:
+            return start + int(ends[-1]) + 1 if len(ends) else 0
+        # 末尾记录比窗口更长，向前扩大窗口
+        previous = max(0, start - len(tail))
+        with open(path, "rb") as f:
+            f.seek(previous)
+            head = f.read(start - previous)
+        quotes -= head.count(b'"')
+        tail = head + tail
+        start = previous
+
+def find_split_points(path: str, data_start: int, range_count: int,
+                      executor: ProcessPoolExecutor, size: Optional[int] = None) -> Tuple[List[Tuple[int, int]], List[int]]:
+    """
+    将 [data_start, size) 切分为按记录对齐的字节范围，size 缺省为文件大小
+
+    返回 (字节范围列表, 各范围行数上限)
+    """
+    if size is None:
+        size = os.path.getsize(path)
+    edges = np.linspace(data_start, size, range_count + 1, dtype=np.int64)
+    tentative = [(int(edges[i]), int(edges[i + 1])) for i in range(range_count) if edges[i] < edges[i + 1]]
+    counts = list(executor.map(_scan_worker, [path] * len(tentative),
+                               [start for start, _ in tentative], [stop for _, stop in tentative]))
+
+    # 引号数的前缀和给出每个初始边界处是否位于引号内
+    quote_prefix = np.concatenate([[0], np.cumsum([quotes for quotes, _ in counts])])
+    starts = [data_start]
+    extra_newlines = [0]
+    with open(path, "rb") as f:
+        for i in range(1, len(tentative)):
+            start, skipped = next_record_start(f, tentative[i][0], bool(quote_prefix[i] & 1), size)
+            starts.append(max(start, starts[-1]))
+            extra_newlines.append(skipped)
+    starts.append(size)
+
+    ranges = []
+    row_bounds = []
+    for i in range(len(tentative)):
+        if starts[i] >= starts[i + 1]:
+            continue
+        ranges.append((starts[i], starts[i + 1]))
+        # 实际范围比初始范围多出下一边界后被跳过的部分，换行数加1作为行数上限
+        following = extra_newlines[i + 1] if i + 1 < len(extra_newlines) else 0
+        row_bounds.append(counts[i][1] + following + 1)
+    return ranges, row_bounds
+
+def header_end(path: str) -> int:
+    """表头记录之后的字节位置"""
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        return next_record_start(f, 0, False, size)[0]
+
+# ---------------- 解析 ----------------
+
+def _parse_range_worker(path: str, start: int, stop: int, options: dict,
+                        shared_columns: Dict[str, tuple], row_offset: int, row_bound: int):
+    """
+    解析一段字节范围
+
+    shared_columns 为 {列名: 共享数组描述}，解析结果类型相符的数值列直接写入其中
+    [row_offset, row_offset + 行数) 的位置；返回 (行数, {列名: 其余列的数组})
+    """
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(stop - start)
+    df = pd.read_csv(io.BytesIO(data), **options)
+    row_count = len(df)
+    if row_count > row_bound:
+        raise ValueError("行数超过预估上限")
+
+    others = {}
+    for column in df.columns:
+        values = df[column].to_numpy()
+        desc = shared_columns.get(column)
+        if desc is not None:
+            target = np.dtype(desc[2])
+            # int64 缓冲只接收整数，float64 缓冲接收整数和浮点数；否则（如出现文本）单独传回
+            if values.dtype.kind == 'i' or (values.dtype.kind == 'f' and target.kind == 'f'):
+                shm, output = _attach(desc)
+                try:
+                    output[row_offset:row_offset + row_count] = values
+                finally:
+                    del output
+                    shm.close()
+                continue
+        others[column] = values
+    return row_count, others
+
+def parallel_read_csv(path: str, headers: List[str], delimiter: str, encoding: str, has_header: bool,
+                      sample_dtypes: Dict[int, str],
+                      executor: Optional[ProcessPoolExecutor] = None,
+                      check_cancelled: Optional[Callable] = None,
+                      progress: Optional[Callable] = None,
+                      size: Optional[int] = None) -> pd.DataFrame:
+    """
+    多进程解析CSV文件的开头 size 字节（缺省为整个文件）
+
+    headers 为最终列名；sample_dtypes 为样本中推断的 {列位置: 类型}，样本中为数值的列经共享内存汇总，
+    样本中为文本的列按字符串解析，以与整文件解析的结果保持一致。
+    check_cancelled() 用于协作式取消（应抛出异常），progress(已完成, 总数) 用于汇报进度。
+    """
+    executor = executor or get_process_pool()
+    data_start = header_end(path) if has_header else 0
+    if size is None:
+        size = os.path.getsize(path)
+    range_count = max(process_pool_workers(), -(-(size - data_start) // TARGET_RANGE_BYTES))
+    ranges, row_bounds = find_split_points(path, data_start, range_count, executor, size)
+    if not ranges:
+        return pd.DataFrame(columns=headers)
+
+    offsets = np.concatenate([[0], np.cumsum(row_bounds)])
+    total_bound = int(offsets[-1])
+
+    options = {
+        "sep": delimiter,
+        "encoding": encoding,
+        "header": None,
+        "names": headers,
+        "index_col": False,  # 字段数多于列名时不把首列当作索引
+    }
+    str_columns = {headers[i]: str for i, dtype in sample_dtypes.items() if dtype == "object" and i < len(headers)}
+    if str_columns:
+        options["dtype"] = str_columns
+
+    segments = {}
+    try:
+        shared_columns = {}
+        for i, dtype in sample_dtypes.items():
+            if i >= len(headers) or dtype not in ("int64", "float64"):
+                continue
+            shm = shared_memory.SharedMemory(create=True, size=max(total_bound * 8, 1))
+            segments[headers[i]] = shm
+            shared_columns[headers[i]] = (shm.name, (total_bound,), np.dtype(dtype).str)
+
+        futures = [
+            executor.submit(_parse_range_worker, path, start, stop, options,
+                            shared_columns, int(offsets[i]), int(row_bounds[i]))
+            for i, (start, stop) in enumerate(ranges)
+        ]
+        try:
+            results = []
+            for done, future in enumerate(futures, 1):
+                if check_cancelled:
+                    check_cancelled()
+                results.append(future.result())
+                if progress:
+                    progress(done, len(futures))
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+
+        # 按原顺序拼接各段结果
+        columns = {}
+        for column in headers:
+            desc = shared_columns.get(column)
+            view = np.ndarray(desc[1], dtype=np.dtype(desc[2]), buffer=segments[column].buf) if desc else None
+            parts = []
+            for i, (row_count, others) in enumerate(results):
+                if column in others:
+                    parts.append(others[column])
+                else:
+                    parts.append(view[offsets[i]:offsets[i] + row_count])
+            # 拼接时会复制出共享内存，类型不一致时按 numpy 规则提升
+            columns[column] = np.concatenate(parts) if parts else np.array([])
+            del view, parts
+        return pd.DataFrame(columns, columns=headers)
+    finally:
+        for shm in segments.values():
+            shm.close()
+            shm.unlink()
@@ -0,0 +1,10 @@
+# test/conftest.py
+import pytest
+
+@pytest.fixture(autouse=True)
+def isolated_home(tmp_path, monkeypatch):
+    """编码缓存、导入结构、自动保存等写入 ~/.vplotter 的文件放在临时目录中"""
+    home = tmp_path / "home"
+    home.mkdir()
+    monkeypatch.setenv("HOME", str(home))
+    return home
@@ -0,0 +1,73 @@
+# test/test_autosave.py
+import numpy as np
+import pandas as pd
+from src.core import autosave
+from src.core.data_container import DataContainer
+from src.core.data_io import csv_loader, encoding, sniffer
+
+def stream_csv(path, chunk_rows):
+    """模拟流式导入：逐块追加到容器，记录来源文件和实际使用的解析方式"""
+    container = DataContainer()
+    fmt = sniffer.sniff_csv(str(path))
+    for chunk, _, _ in csv_loader.iter_csv_chunks(str(path), chunk_rows, fmt):
+        if container.row_count == 0:
+            container.set_dataframe(chunk)
+        else:
+            container.append_rows(chunk)
+    container.set_origin(str(path), **csv_loader.origin_options(fmt, chunk_rows=chunk_rows))
+    return container
+
+def save_edits(container, edit):
+    """以来源文件为基准，编辑后写入增量，返回自动保存目录"""
+    meta = {"generations": [autosave.origin_generation(container.origin)]}
+    version = container.version
+    edit(container)
+    autosave.save(container.snapshot(), container.changes_since(version), meta, keep=2)
+    return autosave.autosave_root() / container.uuid
+
+def test_delta_records_only_edited_cells(tmp_path):
+    path = tmp_path / "data.csv"
+    pd.DataFrame({"a": np.arange(100), "b": np.arange(100) * 0.5}).to_csv(path, index=False)
+    container = DataContainer()
+    fmt = sniffer.sniff_csv(str(path))
+    csv_loader.load_csv(str(path), container, fmt)
+    container.set_origin(str(path), **csv_loader.origin_options(fmt))
+
+    directory = save_edits(container, lambda c: (c.set_cell(3, 0, 30), c.set_cell(7, 1, 1.25)))
+    meta = pd.read_json(directory / autosave.META_NAME, typ="series")
+    delta = pd.read_pickle(directory / meta["generations"][-1]["deltas"][0]["file"])
+    assert delta["columns"]["a"]["rows"].tolist() == [3]
+    assert delta["columns"]["b"]["rows"].tolist() == [7]
+
+    restored = autosave.restore(directory)
+    pd.testing.assert_frame_equal(restored.dataframe, container.dataframe)
+
+def test_restore_replays_streamed_chunks(tmp_path):
+    """流式导入时各块分别推断类型，恢复时按相同的分块重新读取，增量应用在相同的基准上"""
+    path = tmp_path / "stream.csv"
+    path.write_text("id,value\n" + "".join(f"{i},{i}\n" for i in range(6)) + "6,n/a?\n7,8\n", encoding="utf-8")
+    container = stream_csv(path, chunk_rows=3)
+    assert container.origin["csv"]["engine"] == "chunks"
+
+    directory = save_edits(container, lambda c: c.set_cell(7, 0, 70))
+    restored = autosave.restore(directory)
+    assert restored.dataframe["value"].tolist() == container.dataframe["value"].tolist()
+    pd.testing.assert_frame_equal(restored.dataframe, container.dataframe)
+
+def test_restore_replays_engine_and_encoding(tmp_path):
+    """按 pandas 解析器读取的日期列为文本，恢复时不能改用默认的 pyarrow 解析为日期时间"""
+    path = tmp_path / "dates.csv"
+    path.write_bytes("day,name\n2024-01-01,été\n2024-01-02,b\n".encode("latin-1"))
+    container = DataContainer()
+    fmt = sniffer.sniff_csv(str(path))
+    csv_loader.load_csv(str(path), container, fmt, engine="pandas")
+    container.set_origin(str(path), **csv_loader.origin_options(fmt))
+    assert container.origin["csv"]["engine"] == "pandas"
+    assert container.origin["csv"]["encoding"] == fmt.encoding
+
+    directory = save_edits(container, lambda c: c.set_cell(1, 1, "c"))
+    # 恢复时编码记忆已丢失（如在另一台机器上）
+    encoding._cache_file().unlink(missing_ok=True)
+    restored = autosave.restore(directory)
+    assert restored.dataframe["name"].tolist() == ["été", "c"]
+    pd.testing.assert_frame_equal(restored.dataframe, container.dataframe)
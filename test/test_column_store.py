@@ -0,0 +1,55 @@
+# test/test_column_store.py
+import numpy as np
+import pandas as pd
+from src.core.column_store import ColumnStoreWriter, ColumnStore, INTEGER, NUMERIC, STRING
+
+def write_store(tmp_path, chunks):
+    writer = ColumnStoreWriter(tmp_path / "store")
+    for chunk in chunks:
+        writer.append(chunk)
+    return writer.finish()
+
+def test_numeric_column_promoted_when_text_appears_later(tmp_path):
+    """第一块为数值、之后出现文本的列改为字符串列，已写入的数值和文本都不丢失"""
+    store = write_store(tmp_path, [
+        pd.DataFrame({"id": [1, 2], "value": [10, 11], "ratio": [0.5, np.nan]}),
+        pd.DataFrame({"id": [3, 4], "value": pd.Series(["12", "error"], dtype=object), "ratio": ["-", "0.25"]}),
+        pd.DataFrame({"id": [5, 6], "value": [1.5, 2.0], "ratio": [1.0, 2.0]}),
+    ])
+    assert store.kind(0) == INTEGER
+    assert store.kind(1) == STRING
+    assert store.kind(2) == STRING
+    assert store.read(0, 6)["value"].tolist() == ["10", "11", "12", "error", "1.5", "2.0"]
+    assert store.read(0, 6)["ratio"].tolist() == ["0.5", None, "-", "0.25", "1.0", "2.0"]
+    assert store.read(0, 6)["id"].tolist() == [1, 2, 3, 4, 5, 6]
+    assert not (tmp_path / "store" / "1.npy").exists()
+
+def test_numeric_text_chunk_stays_numeric(tmp_path):
+    """之后的块按文本解析、但内容都是数值时仍为数值列"""
+    store = write_store(tmp_path, [
+        pd.DataFrame({"value": [1.5, 2.5]}),
+        pd.DataFrame({"value": pd.Series(["3", None], dtype=object)}),
+    ])
+    assert store.kind(0) == NUMERIC
+    np.testing.assert_array_equal(store.read(0, 4)["value"].to_numpy(), [1.5, 2.5, 3.0, np.nan])
+
+def test_integer_columns_keep_exact_values(tmp_path):
+    """超过 2**53 的整数（如ID、纳秒时间戳）按 int64 保存，不经过浮点而丢失精度；类型记录在清单中"""
+    big = 2 ** 53 + 1
+    store = write_store(tmp_path, [
+        pd.DataFrame({"id": [big, big + 2], "n": [1, 2], "text": [big, 7]}),
+        pd.DataFrame({"id": pd.Series([str(big + 4), "9"], dtype=object), "n": [3.0, 4.0], "text": ["x", None]}),
+        pd.DataFrame({"id": [big + 6, 1], "n": [np.nan, 5.5], "text": [big, 8]}),
+    ])
+    assert store.kind(0) == INTEGER
+    assert store.read(0, 6)["id"].tolist() == [big, big + 2, big + 4, 9, big + 6, 1]
+    assert store.read(0, 6)["id"].dtype == np.int64
+    # 出现缺失值和小数时才改为浮点列
+    assert store.kind(1) == NUMERIC
+    np.testing.assert_array_equal(store.read(0, 6)["n"].to_numpy(), [1.0, 2.0, 3.0, 4.0, np.nan, 5.5])
+    # 整数列改为字符串列时按原值格式化
+    assert store.read(0, 6)["text"].tolist() == [str(big), "7", "x", None, str(big), "8"]
+
+    reopened = ColumnStore(tmp_path / "store")
+    assert [reopened.kind(i) for i in range(3)] == [INTEGER, NUMERIC, STRING]
+    assert next(reopened.iter_chunks(4))["id"].tolist() == [big, big + 2, big + 4, 9]
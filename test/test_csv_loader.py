@@ -0,0 +1,92 @@
+# test/test_csv_loader.py
+import numpy as np
+import pandas as pd
+import pytest
+from src.core.data_io import csv_loader
+
+pytestmark = pytest.mark.skipif(not csv_loader.pyarrow_available(), reason="需要 pyarrow")
+
+def test_pyarrow_types_match_pandas_conventions(tmp_path):
+    """日期、时间戳为 datetime64[ns]，时间为文本，文本缺失值为 NaN"""
+    path = tmp_path / "types.csv"
+    path.write_text(
+        "day,time,stamp,text\n"
+        "2020-01-01,12:30:00,2020-01-01 10:00:00,abc\n"
+        "2021-02-03,13:00:01,2021-01-01 00:00:01,\n",
+        encoding="utf-8"
+    )
+    df = csv_loader.read_csv(str(path), engine="pyarrow")
+    assert df["day"].dtype == "datetime64[ns]"
+    assert df["stamp"].dtype == "datetime64[ns]"
+    assert df["time"].tolist() == ["12:30:00", "13:00:01"]
+    assert df["text"].dtype == object
+    assert isinstance(df["text"].iloc[1], float) and np.isnan(df["text"].iloc[1])
+
+def write_with_unprobed_latin1(path, rows=200000):
+    """写入UTF-8文件，在编码检测不会采样的位置（约四分之一处）插入一行 latin-1 编码的内容"""
+    lines = [f"row{i},{i}".encode("ascii") for i in range(rows)]
+    lines[rows // 4] = "été,1".encode("latin-1")
+    path.write_bytes(b"name,value\n" + b"\n".join(lines) + b"\n")
+
+def test_pyarrow_invalid_utf8_is_not_read_as_bytes(tmp_path):
+    """样本之外出现非UTF-8字节时不产生 bytes 列"""
+    path = tmp_path / "mixed.csv"
+    write_with_unprobed_latin1(path)
+    df = csv_loader.read_csv(str(path), engine="pyarrow")
+    assert len(df) == 200000
+    assert df["name"].iloc[50000] == "été"
+    assert all(isinstance(value, str) for value in df["name"])
+    assert df["value"].dtype == np.int64
+
+def test_pyarrow_retries_fallback_encoding(tmp_path, monkeypatch):
+    """pyarrow 路径自行换用后备编码，不退回 pandas 解析器，并记住新的编码"""
+    path = tmp_path / "mixed.csv"
+    write_with_unprobed_latin1(path)
+    monkeypatch.setattr(csv_loader, "read_csv_pandas", lambda *args: pytest.fail("不应退回 pandas"))
+    fmt = csv_loader.sniff_csv(str(path))
+    assert fmt.encoding == "utf-8"
+    df = csv_loader.read_csv(str(path), fmt, engine="pyarrow")
+    assert df["name"].iloc[50000] == "été"
+    assert fmt.encoding == "latin-1"
+    assert csv_loader.sniff_csv(str(path)).encoding == "latin-1"
+
+def test_pyarrow_gbk_outside_probes(tmp_path):
+    """检测为 GB18030 的文件在样本之外出现无法解码的字节时换用后备编码，结果与 pandas 路径一致"""
+    path = tmp_path / "gbk.csv"
+    lines = [f"名称{i},{i}".encode("gbk") for i in range(200000)]
+    lines[50000] = b"\x80\xff,1"
+    path.write_bytes("名称,数值\n".encode("gbk") + b"\n".join(lines) + b"\n")
+    fmt = csv_loader.sniff_csv(str(path))
+    assert fmt.encoding == "gb18030"
+    df = csv_loader.read_csv(str(path), fmt, engine="pyarrow")
+    assert fmt.encoding == "latin-1"
+    assert len(df) == 200000
+    assert all(isinstance(value, str) for value in df.iloc[:, 0])
+    pd.testing.assert_frame_equal(df, csv_loader.read_csv(str(path), engine="pandas"))
+
+@pytest.mark.parametrize("engine", ["pyarrow", "pandas", "chunks"])
+def test_parse_is_bounded_to_size_before_parsing(tmp_path, monkeypatch, engine):
+    """解析期间追加的行和正在写入的末尾记录不被解析，之后从记录的位置读取追加的行"""
+    path = tmp_path / "growing.csv"
+    path.write_bytes(b"id,value\n1,10\n2,20\n3,3")
+    measure = csv_loader.measure_source
+
+    def measure_then_grow(file_path, fmt):
+        measure(file_path, fmt)
+        with open(file_path, "ab") as f:
+            f.write(b"0\n4,40\n")
+    monkeypatch.setattr(csv_loader, "measure_source", measure_then_grow)
+
+    fmt = csv_loader.sniff_csv(str(path))
+    if engine == "chunks":
+        df = pd.concat([chunk for chunk, _, _ in csv_loader.iter_csv_chunks(str(path), 1, fmt)], ignore_index=True)
+    else:
+        df = csv_loader.read_csv(str(path), fmt, engine)
+    assert df["id"].tolist() == [1, 2]
+    options = csv_loader.origin_options(fmt)
+    assert options["size"] == len(b"id,value\n1,10\n2,20\n")
+
+    appended, offset = csv_loader.read_appended(str(path), options["size"], fmt, ["id", "value"])
+    assert appended["id"].tolist() == [3, 4]
+    assert appended["value"].tolist() == [30, 40]
+    assert offset == path.stat().st_size
@@ -0,0 +1,94 @@
+# test/test_csv_schema.py
+import numpy as np
+import pandas as pd
+import pytest
+from src.core.data_io import csv_loader, csv_schema, sniffer
+
+SAMPLE = (
+    "id,reading,stamp,label\n"
+    "1,1.5,2024-01-02 10:00:00,a\n"
+    "2,-,2024-01-03 11:30:00,b\n"
+    "3,2.5,2024-01-04 12:00:00,c\n"
+    "4,3.5,2024-01-05 13:15:00,d\n"
+    "5,4.5,2024-01-06 14:00:00,e\n"
+    "6,5.5,2024-01-07 15:00:00,f\n"
+    "7,6.5,2024-01-08 16:00:00,g\n"
+    "8,7.5,2024-01-09 17:00:00,h\n"
+    "9,8.5,2024-01-10 18:00:00,i\n"
+    "10,9.5,2024-01-11 19:00:00,j\n"
+)
+
+def test_infer_schema_marks_numeric_columns_with_tokens():
+    """主要为数值、夹杂少量标记的列指定为浮点数并收集缺失值标记，统一格式的日期列指定格式"""
+    sample = csv_schema.sample_frame(SAMPLE, ["id", "reading", "stamp", "label"], True, ",")
+    schema = csv_schema.infer_schema(sample, "log_*.csv")
+    assert schema.types == {"reading": "float64", "stamp": "datetime"}
+    assert schema.na_values == ["-"]
+    assert schema.datetime_formats["stamp"] == "%Y-%m-%d %H:%M:%S"
+
+def test_infer_schema_leaves_text_columns_alone():
+    sample = pd.DataFrame({"mostly_text": ["a", "b", "1", "c"], "mixed_dates": ["2024-01-01", "x", "y", "z"]})
+    assert csv_schema.infer_schema(sample).types == {}
+
+def test_coerce_only_converts_mismatched_columns():
+    schema = csv_schema.CsvSchema(types={
+        "f": "float64", "i": "Int64", "b": "boolean", "c": "category", "d": "datetime"
+    }, datetime_formats={"d": "%d/%m/%Y"})
+    df = pd.DataFrame({
+        "f": ["1.5", "bad", None],
+        "i": ["1", "2.5", "3"],
+        "b": ["Yes", "0", "maybe"],
+        "c": ["x", "y", "x"],
+        "d": ["02/01/2024", "31/12/2023", "2024-01-01"],
+        "other": [1, 2, 3],
+    })
+    result = schema.coerce(df)
+    assert result["f"].dtype == np.float64 and np.isnan(result["f"].iloc[1])
+    assert result["i"].tolist()[0] == 1 and result["i"].isna().tolist() == [False, True, False]
+    assert result["b"].tolist()[:2] == [True, False] and pd.isna(result["b"].iloc[2])
+    assert isinstance(result["c"].dtype, pd.CategoricalDtype)
+    assert result["d"].tolist()[:2] == [pd.Timestamp("2024-01-02"), pd.Timestamp("2023-12-31")]
+    assert pd.isna(result["d"].iloc[2])
+    assert result["other"].tolist() == [1, 2, 3]
+
+    # 类型已符合时不做转换
+    float_column = result["f"]
+    assert schema.coerce(result)["f"] is float_column
+
+def test_schema_round_trip_and_pattern():
+    schema = csv_schema.CsvSchema("Log_*.CSV", {"a": "datetime", "b": "auto", "c": "str"}, {"a": "%Y", "c": "%Y"}, ["-"])
+    restored = csv_schema.CsvSchema.from_dict(schema.to_dict())
+    assert restored.types == {"a": "datetime", "c": "str"}
+    assert restored.datetime_formats == {"a": "%Y"}
+    assert restored.matches("/data/log_20240105.csv")
+    assert not restored.matches("/data/other.csv")
+    assert csv_schema.default_pattern("log_20240105.csv") == "log_*.csv"
+
+def test_remembered_schema_applies_to_matching_files(tmp_path):
+    csv_schema.remember_schema(csv_schema.CsvSchema("log_*.csv", {"reading": "float64"}, na_values=["-"]))
+    csv_schema.remember_schema(csv_schema.CsvSchema("log_*.csv", {"reading": "float64"}, na_values=["-", "err"]))
+    assert len(csv_schema.load_schemas()) == 1
+    path = tmp_path / "log_1.csv"
+    path.write_text("id,reading\n1,1.5\n2,-\n3,err\n", encoding="utf-8")
+    assert csv_schema.schema_for(str(path)).na_values == ["-", "err"]
+    assert csv_schema.schema_for(str(tmp_path / "data.csv")) is None
+    csv_schema.forget_schema("log_*.csv")
+    assert csv_schema.load_schemas() == []
+
+@pytest.mark.parametrize("engine", ["pandas", "pyarrow"])
+def test_schema_types_come_from_the_parser(tmp_path, engine):
+    if engine == "pyarrow" and not csv_loader.pyarrow_available():
+        pytest.skip("需要 pyarrow")
+    path = tmp_path / "log_1.csv"
+    path.write_text(SAMPLE + "11,error,2024-01-12 20:00:00,k\n", encoding="utf-8")
+    fmt = sniffer.sniff_csv(str(path))
+    fmt.schema = csv_schema.CsvSchema(
+        types={"reading": "float64", "stamp": "datetime", "id": "Int64", "label": "category"},
+        datetime_formats={"stamp": "%Y-%m-%d %H:%M:%S"}, na_values=["-", "error"]
+    )
+    df = csv_loader.read_csv(str(path), fmt, engine)
+    assert df["reading"].dtype == np.float64
+    assert df["reading"].isna().tolist() == [False, True] + [False] * 8 + [True]
+    assert df["stamp"].dtype == "datetime64[ns]"
+    assert isinstance(df["id"].dtype, pd.Int64Dtype)
+    assert isinstance(df["label"].dtype, pd.CategoricalDtype)
@@ -0,0 +1,105 @@
+# test/test_data_container.py
+import numpy as np
+import pandas as pd
+from src.core.data_container import DataContainer
+from src.core.command_manager import ReplaceColumnsCommand, ReorderRowsCommand
+
+def make_container(values):
+    container = DataContainer()
+    container.set_dataframe(pd.DataFrame({"v": values}))
+    return container
+
+def edit_cell(container, row, col, value):
+    """模拟表格编辑：TableModel 发出整表对象数组，容器以新的 DataFrame 替换（索引被重置）"""
+    data = container.dataframe.to_numpy().astype(object)
+    data[row, col] = value
+    container.set_table_data(data, container.get_table_headers())
+
+def test_undo_after_clean_sort_edit_restores_values():
+    """清洗 -> 排序 -> 编辑 -> 撤销 -> 撤销 后恢复清洗前的数据"""
+    container = make_container([3.0, 1.0, 4.0, 2.0])
+    clean = ReplaceColumnsCommand(container, {"v": pd.Series([30.0, 10.0, 40.0, 20.0], name="v")})
+    clean.execute()
+    sort = ReorderRowsCommand(container, container.prepare_sort_order("v"))
+    sort.execute()
+    edit_cell(container, 0, 0, 11.0)
+
+    sort.undo()
+    clean.undo()
+    values = container.dataframe["v"].astype(float).tolist()
+    assert values == [3.0, 1.0, 4.0, 2.0]
+
+def test_apply_row_order_resets_index():
+    container = make_container([3, 1, 2])
+    container.apply_row_order(np.array([1, 2, 0]))
+    assert container.dataframe.index.equals(pd.RangeIndex(3))
+    assert container.dataframe["v"].tolist() == [1, 2, 3]
+
+def test_replace_columns_assigns_by_position():
+    container = make_container([1, 2, 3])
+    old = container.replace_columns({"v": pd.Series([7, 8, 9], index=[2, 1, 0])})
+    assert container.dataframe["v"].tolist() == [7, 8, 9]
+    assert old["v"].tolist() == [1, 2, 3]
+
+def test_append_rows_merges_chunks_once():
+    """追加的数据块按块保存，读取尚未合并的行时不合并整表，读取 dataframe 时一次性合并"""
+    container = DataContainer()
+    for start in range(0, 10, 2):
+        container.append_rows(pd.DataFrame({"v": [start, start + 1], "c": pd.Categorical([f"k{start}"] * 2)}))
+    assert container.row_count == 10
+    assert container.get_rows(4, 7)["v"].tolist() == [4, 5, 6]
+    assert container._pending_chunks
+    frame = container.dataframe
+    assert not container._pending_chunks
+    assert frame["v"].tolist() == list(range(10))
+    assert frame.index.equals(pd.RangeIndex(10))
+    assert isinstance(frame["c"].dtype, pd.CategoricalDtype)
+    assert frame["c"].tolist()[-1] == "k8"
+
+def test_set_cell_records_only_the_edited_cell():
+    container = make_container([1, 2, 3])
+    container.dataframe["t"] = ["a", "b", "c"]
+    version = container.version
+    snapshot = container.snapshot()
+    container.set_cell(1, 0, 5)
+    container.set_cell(2, 0, 1.5)
+    container.set_cell(0, 1, "z")
+    changes = container.changes_since(version)
+    assert changes["v"].tolist() == [1, 2]
+    assert changes["t"].tolist() == [0]
+    assert container.dataframe["v"].tolist() == [1.0, 5.0, 1.5]
+    assert container.dataframe["v"].dtype == np.float64
+    # 快照共享修改前的数据，不受影响
+    assert snapshot.dataframe["v"].tolist() == [1, 2, 3]
+    assert snapshot.dataframe["t"].tolist() == ["a", "b", "c"]
+
+def test_change_log_merges_rows_and_resets_on_structure_change(monkeypatch):
+    container = make_container([1, 2, 3, 4])
+    start = container.version
+    container.mark_changed(["v"], {"v": np.array([2])})
+    middle = container.version
+    container.mark_changed(["v"], {"v": np.array([0, 2])})
+    container.mark_changed(["w"])
+    changes = container.changes_since(start)
+    assert changes["v"].tolist() == [0, 2]
+    assert changes["w"] is None
+    assert container.changes_since(middle)["v"].tolist() == [0, 2]
+    assert container.changes_since(container.version) == {}
+
+    # 整列修改覆盖部分行的修改
+    container.mark_changed(["v"])
+    assert container.changes_since(start)["v"] is None
+
+    # 已清理的记录和行列结构变化之前的版本无法给出增量
+    container.trim_changes(middle)
+    assert container.changes_since(start) is None
+    assert container.changes_since(middle) is not None
+    version = container.version
+    container.mark_changed()
+    assert container.changes_since(version) is None
+
+    # 记录超出上限时视为结构变化
+    monkeypatch.setattr("src.core.data_container.CHANGE_LOG_LIMIT", 3)
+    version = container.version
+    container.mark_changed(["a", "b", "c", "d"])
+    assert container.changes_since(version) is None
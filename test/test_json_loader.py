@@ -0,0 +1,47 @@
+# test/test_json_loader.py
+import json
+import numpy as np
+import pytest
+from src.core.data_io import json_loader
+
+RECORDS = [
+    {"id": 1, "name": "a, [b]", "value": 12345.5, "nested": {"x": 1, "y": [1, 2]}},
+    {"id": 2, "name": "引号\"与\\转义", "value": 7, "nested": {"x": None, "y": []}},
+    {"id": 3, "name": None, "value": -1e-3, "flag": True, "nested": {"x": 3, "y": {}}},
+]
+
+@pytest.mark.parametrize("block_bytes", [1, 7, 64, 1024 * 1024])
+def test_array_records_across_block_boundaries(tmp_path, monkeypatch, block_bytes):
+    """元素、字符串和数字跨越读取块的边界时与整体解码的结果一致"""
+    monkeypatch.setattr(json_loader, "READ_BLOCK_BYTES", block_bytes)
+    path = tmp_path / "records.json"
+    path.write_text(json.dumps(RECORDS + [42, 1.25], ensure_ascii=False, indent=1), encoding="utf-8-sig")
+    values = [value for value, _ in json_loader.iter_array_records(str(path))]
+    assert values == RECORDS + [42, 1.25]
+
+def test_incomplete_array_raises(tmp_path):
+    path = tmp_path / "broken.json"
+    path.write_text('[{"a": 1}, {"a": 2}', encoding="utf-8")
+    with pytest.raises(ValueError):
+        list(json_loader.iter_array_records(str(path)))
+
+def test_read_json_types_and_late_columns(tmp_path, monkeypatch):
+    """样本之后出现的新列补缺失值，不符合样本类型的值提升列类型"""
+    monkeypatch.setattr(json_loader, "SCHEMA_SAMPLE_ROWS", 2)
+    monkeypatch.setattr(json_loader, "BATCH_ROWS", 2)
+    path = tmp_path / "records.ndjson"
+    path.write_text("\n".join(json.dumps(record, ensure_ascii=False) for record in RECORDS) + "\n", encoding="utf-8")
+    df = json_loader.read_json(str(path))
+    assert list(df.columns) == ["id", "name", "value", "nested.x", "nested.y", "flag"]
+    assert df["id"].dtype == np.int64
+    assert df["value"].tolist() == [12345.5, 7.0, -1e-3]
+    assert df["nested.x"].dtype == np.float64 and np.isnan(df["nested.x"].iloc[1])
+    assert df["nested.y"].tolist() == ["[1, 2]", "[]", "{}"]
+    assert df["flag"].tolist() == [None, None, True]
+    assert df["name"].iloc[1] == "引号\"与\\转义"
+
+def test_ndjson_reports_bad_line(tmp_path):
+    path = tmp_path / "bad.jsonl"
+    path.write_text('{"a": 1}\n\n{"a": \n', encoding="utf-8")
+    with pytest.raises(ValueError, match="第 3 行"):
+        json_loader.read_json(str(path))
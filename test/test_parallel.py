@@ -0,0 +1,20 @@
+# test/test_parallel.py
+import numpy as np
+import pandas as pd
+import pytest
+from src.utils.parallel import to_fixed_width_strings
+
+@pytest.mark.parametrize("series", [
+    pd.Series([1.5, np.nan, 1e20]),
+    pd.Series(["a", None, np.nan, 3.5], dtype=object),
+    pd.Series(pd.to_datetime(["2020-01-01 00:00:00", "2020-01-02 03:04:05", None])),
+    pd.Series(pd.to_timedelta(["1D", "2h"])),
+    pd.Series([1, None], dtype="Int64"),
+    pd.Series(["x", "y"], dtype="category"),
+])
+def test_fixed_width_strings_match_astype_str(series):
+    """并行路径的字符串转换与串行路径的 astype(str) 一致"""
+    assert to_fixed_width_strings(series).tolist() == series.astype(str).tolist()
+
+def test_fixed_width_strings_reject_long_cells():
+    assert to_fixed_width_strings(pd.Series(["x" * 1000])) is None
@@ -0,0 +1,64 @@
+# test/test_parallel_csv.py
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+from src.utils import parallel_csv
+
+def test_record_ends_skip_newlines_inside_quotes():
+    data = b'a,"x\ny"\nb,c\n"\n'
+    assert parallel_csv.record_ends(data).tolist() == [7, 11]
+    # 开头位于引号内时奇偶性相反
+    assert parallel_csv.record_ends(b'x"\ny\n', in_quotes=True).tolist() == [2, 4]
+
+def test_next_record_start_from_inside_quotes(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_bytes(b'1,"a\nb\nc"\n2,d\n')
+    with open(path, "rb") as f:
+        # 偏移 5 位于引号内的 "b" 处，跳过引号内的两个换行
+        assert parallel_csv.next_record_start(f, 5, True, path.stat().st_size) == (10, 2)
+        assert parallel_csv.next_record_start(f, 0, False, path.stat().st_size) == (10, 3)
+
+def test_split_points_align_to_records(tmp_path, monkeypatch):
+    """切分点落在多行引号字段内时移动到该记录之后，各段拼接后与整体解析一致"""
+    rows = [f'{i},"line {i}\nmore {i}",{i}' for i in range(500)]
+    path = tmp_path / "data.csv"
+    path.write_text("id,text,n\n" + "\n".join(rows) + "\n", encoding="utf-8")
+    data = path.read_bytes()
+    data_start = parallel_csv.header_end(str(path))
+    assert data_start == len(b"id,text,n\n")
+
+    with ThreadPoolExecutor(2) as executor:
+        ranges, row_bounds = parallel_csv.find_split_points(str(path), data_start, 7, executor)
+    assert ranges[0][0] == data_start and ranges[-1][1] == len(data)
+    parts = []
+    for (start, stop), bound in zip(ranges, row_bounds):
+        assert data[start - 1:start] == b"\n"
+        part = pd.read_csv(pd.io.common.BytesIO(data[start:stop]), header=None, names=["id", "text", "n"])
+        assert len(part) <= bound
+        parts.append(part)
+    combined = pd.concat(parts, ignore_index=True)
+    pd.testing.assert_frame_equal(combined, pd.read_csv(path))
+
+def test_parallel_read_matches_single_parse(tmp_path, monkeypatch):
+    """多行引号字段、含逗号和转义引号的文本跨越切分点时，各段拼接的结果与整体解析一致"""
+    monkeypatch.setattr(parallel_csv, "process_pool_workers", lambda: 4)
+    rows = [f'{i},"a ""q"", b\n{i}",{i * 0.5}' if i % 3 else f"{i},plain,{i * 0.5}" for i in range(300)]
+    path = tmp_path / "data.csv"
+    path.write_text("id,text,x\n" + "\n".join(rows) + "\n", encoding="utf-8")
+    with ThreadPoolExecutor(2) as executor:
+        df = parallel_csv.parallel_read_csv(
+            str(path), ["id", "text", "x"], ",", "utf-8", True, {0: "int64", 1: "object", 2: "float64"}, executor
+        )
+    pd.testing.assert_frame_equal(df, pd.read_csv(path))
+
+def test_complete_length_excludes_unfinished_record(tmp_path, monkeypatch):
+    path = tmp_path / "data.csv"
+    path.write_bytes(b'a,b\n1,"x\ny"\n2,"unfinished\n')
+    size = path.stat().st_size
+    # 末尾记录的引号尚未闭合，引号内的换行不是行尾
+    assert parallel_csv.complete_length(str(path), size) == 12
+    path.write_bytes(b"a,b\n1,2\n3,")
+    assert parallel_csv.complete_length(str(path), path.stat().st_size) == 8
+    # 末尾记录比查找窗口更长时向前扩大窗口
+    monkeypatch.setattr(parallel_csv, "SEEK_WINDOW_BYTES", 4)
+    path.write_bytes(b'a,b\n1,"' + b"x" * 20)
+    assert parallel_csv.complete_length(str(path), path.stat().st_size) == 4
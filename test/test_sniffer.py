@@ -0,0 +1,53 @@
+# test/test_sniffer.py
+import pandas as pd
+import pytest
+from src.core.data_io import sniffer, csv_loader
+
+def write_multiline_csv(path, rows, sample_size):
+    """写入含多行引号字段的CSV，使样本边界落在某个多行字段内"""
+    lines = ["id,note,value"]
+    for i in range(rows):
+        lines.append(f'{i},"first line {i}\nsecond line {i}",{i * 0.5}')
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    data = path.read_bytes()
+    # 确认样本边界前最后一个换行位于引号内，即旧的按换行截断会截出半个字段
+    last_newline = data.rfind(b"\n", 0, sample_size)
+    assert data[:last_newline].count(b'"') % 2 == 1
+
+def test_read_sample_keeps_quoted_newlines_whole(tmp_path):
+    path = tmp_path / "notes.csv"
+    write_multiline_csv(path, 200, 1000)
+    sample = sniffer.read_sample(str(path), 1000)
+    assert sample.endswith(b"\n")
+    assert sample.count(b'"') % 2 == 0
+    assert len(pd.read_csv(pd.io.common.BytesIO(sample))) > 0
+
+@pytest.mark.parametrize("engine", ["pandas", "pyarrow"])
+def test_sniff_and_read_multiline_fields(tmp_path, engine):
+    path = tmp_path / "notes.csv"
+    write_multiline_csv(path, 200, 1000)
+    fmt = sniffer.sniff_csv(str(path), 1000)
+    assert fmt.headers == ["id", "note", "value"]
+    assert fmt.dtypes[0] == "int64"
+    df = csv_loader.read_csv(str(path), fmt, engine)
+    assert len(df) == 200
+    assert df["note"].iloc[-1] == "first line 199\nsecond line 199"
+
+def test_sniff_falls_back_to_header_when_sample_unparsable(tmp_path):
+    """样本中字段数不一致时只从第一个记录取列名，不提供类型提示"""
+    path = tmp_path / "ragged.csv"
+    path.write_text('a,"b\nb",c\n1,2,3\n4,5,6,7,8\n', encoding="utf-8")
+    fmt = sniffer.sniff_csv(str(path))
+    assert fmt.headers == ["a", "b\nb", "c"]
+    assert fmt.column_count == 3
+    assert fmt.dtypes == {}
+
+def test_first_record_spans_quoted_newlines():
+    assert sniffer.first_record('x,"y\nz"\n1,2\n', ",") == 'x,"y\nz"\n'
+
+def test_headerless_column_names(tmp_path):
+    path = tmp_path / "numbers.csv"
+    path.write_text("1,2\n3,4\n", encoding="utf-8")
+    fmt = sniffer.sniff_csv(str(path))
+    assert not fmt.has_header
+    assert sniffer.column_names(fmt) == ["列1", "列2"]
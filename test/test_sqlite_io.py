@@ -0,0 +1,56 @@
+# test/test_sqlite_io.py
+import sqlite3
+import pandas as pd
+import pytest
+from src.core.data_container import DataContainer
+from src.core.data_io import sqlite_io
+
+def make_container(df):
+    container = DataContainer()
+    container.set_dataframe(df)
+    return container
+
+def create_database(path):
+    connection = sqlite3.connect(path)
+    connection.executescript(
+        'CREATE TABLE t (id INTEGER PRIMARY KEY, name TEXT NOT NULL, extra TEXT DEFAULT "x");'
+        'CREATE INDEX t_name ON t (name);'
+        'CREATE VIEW v AS SELECT name FROM t;'
+        "INSERT INTO t (id, name) VALUES (1, 'old'), (2, 'older');"
+    )
+    connection.close()
+
+def test_replace_keeps_table_definition(tmp_path):
+    """替换时清空原有数据，保留表的约束、索引和引用该表的视图"""
+    path = str(tmp_path / "data.db")
+    create_database(path)
+    container = make_container(pd.DataFrame({"name": ["a", "b", "c"], "ID": [10, 20, 30]}))
+    sqlite_io.write_table(path, "t", container, "replace", batch_rows=2)
+
+    connection = sqlite3.connect(path)
+    try:
+        assert connection.execute("SELECT id, name, extra FROM t ORDER BY id").fetchall() == [
+            (10, "a", "x"), (20, "b", "x"), (30, "c", "x")
+        ]
+        assert connection.execute("SELECT name FROM sqlite_master WHERE type = 'index'").fetchall() == [("t_name",)]
+        assert connection.execute("SELECT count(*) FROM v").fetchone() == (3,)
+    finally:
+        connection.close()
+
+def test_append_and_create(tmp_path):
+    path = str(tmp_path / "data.db")
+    create_database(path)
+    sqlite_io.write_table(path, "t", make_container(pd.DataFrame({"id": [3], "name": ["new"]})), "append")
+    assert sqlite_io.read_query(path, "SELECT name FROM t ORDER BY id")["name"].tolist() == ["old", "older", "new"]
+    sqlite_io.write_table(path, "u", make_container(pd.DataFrame({"v": [1.5, None]})))
+    assert sqlite_io.read_query(path, "SELECT typeof(v) AS kind FROM u")["kind"].tolist() == ["real", "null"]
+
+def test_missing_column_rolls_back(tmp_path):
+    path = str(tmp_path / "data.db")
+    create_database(path)
+    container = make_container(pd.DataFrame({"name": ["a"], "unknown": [1]}))
+    with pytest.raises(ValueError, match="unknown"):
+        sqlite_io.write_table(path, "t", container, "replace")
+    with pytest.raises(ValueError, match="已存在"):
+        sqlite_io.write_table(path, "t", container)
+    assert sqlite_io.read_query(path, "SELECT name FROM t ORDER BY id")["name"].tolist() == ["old", "older"]